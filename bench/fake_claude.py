@@ -0,0 +1,213 @@
+"""claude.ai API 로컬 대역 서버 (벤치마크 / 오프라인 재현용)
+
+  GET /                                    빈 페이지 (챌린지 통과용 탐색 대상)
+  GET /api/organizations                   조직 목록
+  GET /api/organizations/{id}/usage        사용량
+
+응답 지연, 페이로드 변형, 401/403/429, Cloudflare 챌린지 페이지를 비율로 섞을 수 있다.
+
+    python -m bench.fake_claude --port 8790 --latency 80 --jitter 20 --rate-429 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+ORG_ID = "00000000-0000-4000-8000-000000000000"
+PAYLOAD_VARIANTS = ("full", "no_sonnet", "session_only", "bulky")
+
+CHALLENGE_PAGE = (
+    b'<!DOCTYPE html><html><head><title>Just a moment...</title></head>'
+    b'<body><div id="challenge-platform"></div>'
+    b'<script>window._cf_chl_opt={cvId: "3"};</script></body></html>'
+)
+
+
+class FakeConfig:
+    """서버 동작 설정 (실행 중에도 바꿀 수 있음)"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, variant: str = "full",
+                 rate_401: float = 0, rate_403: float = 0, rate_429: float = 0,
+                 rate_challenge: float = 0, retry_after: int = 30, seed: Optional[int] = None):
+        if variant not in PAYLOAD_VARIANTS:
+            raise ValueError(f"알 수 없는 페이로드: {variant}")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.variant = variant
+        self.rate_401 = rate_401
+        self.rate_403 = rate_403
+        self.rate_429 = rate_429
+        self.rate_challenge = rate_challenge
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+
+def usage_payload(variant: str, now: Optional[datetime] = None) -> Dict:
+    """/usage 응답 본문 (실제 API 와 같은 필드 이름)"""
+    now = now or datetime.now(timezone.utc)
+    minute = now.minute
+
+    def bucket(utilization: float, hours: float) -> Dict:
+        return {
+            'utilization': utilization,
+            'resets_at': (now + timedelta(hours=hours)).isoformat(),
+        }
+
+    payload = {
+        'five_hour': bucket(float(minute % 60) * 1.5, 3.5),
+        'seven_day': bucket(42.0, 80),
+        'seven_day_sonnet': bucket(17.0, 80),
+        'seven_day_opus': None,
+    }
+    if variant == "no_sonnet":
+        payload['seven_day_sonnet'] = None
+    elif variant == "session_only":
+        payload['seven_day'] = None
+        payload['seven_day_sonnet'] = None
+    elif variant == "bulky":
+        # 알 수 없는 필드가 많이 붙은 큰 응답
+        payload['extra'] = [{'id': i, 'label': f"item-{i}", 'values': list(range(20))} for i in range(200)]
+    return payload
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 헤더/본문 분리 전송으로 생기는 Nagle 지연(~40ms)이 측정값을 덮지 않도록
+    disable_nagle_algorithm = True
+
+    @property
+    def config(self) -> FakeConfig:
+        return self.server.config
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        config = self.config
+        self.server.count()
+        if config.latency_ms or config.jitter_ms:
+            delay = config.latency_ms + config.random.uniform(-config.jitter_ms, config.jitter_ms)
+            time.sleep(max(delay, 0) / 1000)
+
+        path = self.path.split('?', 1)[0]
+        if path == '/':
+            self._send(200, b'<!DOCTYPE html><html><body>ok</body></html>', 'text/html')
+            return
+        if not path.startswith('/api/'):
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        roll = config.random.random()
+        for rate, respond in (
+            (config.rate_challenge, self._send_challenge),
+            (config.rate_401, lambda: self._send_json(401, {'error': 'unauthorized'})),
+            (config.rate_403, lambda: self._send_json(403, {'error': 'forbidden'})),
+            (config.rate_429, self._send_rate_limited),
+        ):
+            if roll < rate:
+                respond()
+                return
+            roll -= rate
+
+        if path == '/api/organizations':
+            self._send_json(200, [{'uuid': ORG_ID, 'name': "Fake Org"}])
+        elif path == f'/api/organizations/{ORG_ID}/usage':
+            self._send_json(200, usage_payload(config.variant))
+        elif path.startswith('/api/organizations/') and path.endswith('/usage'):
+            self._send_json(404, {'error': 'organization not found'})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def _send_challenge(self):
+        self._send(403, CHALLENGE_PAGE, 'text/html; charset=UTF-8', {'cf-mitigated': 'challenge'})
+
+    def _send_rate_limited(self):
+        self._send_json(429, {'error': 'rate limited'}, {'Retry-After': str(self.config.retry_after)})
+
+    def _send_json(self, status: int, body, headers: Optional[Dict] = None):
+        self._send(status, json.dumps(body).encode('utf-8'), 'application/json', headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeClaudeServer(ThreadingHTTPServer):
+    """백그라운드 스레드에서 도는 가짜 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, config: Optional[FakeConfig] = None, port: int = 0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.config = config or FakeConfig()
+        self.requests = 0
+        self._count_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self):
+        with self._count_lock:
+            self.requests += 1
+
+    def start(self) -> "FakeClaudeServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-claude", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """FakeConfig 옵션 (서버 단독 실행 / 벤치마크 공용)"""
+    parser.add_argument("--latency", type=float, default=0, help="응답 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="지연 편차 ± (ms)")
+    parser.add_argument("--variant", choices=PAYLOAD_VARIANTS, default="full", help="사용량 응답 형태")
+    parser.add_argument("--rate-401", type=float, default=0, help="401 응답 비율 (0~1)")
+    parser.add_argument("--rate-403", type=float, default=0, help="403 응답 비율 (0~1)")
+    parser.add_argument("--rate-429", type=float, default=0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--rate-challenge", type=float, default=0, help="챌린지 페이지 비율 (0~1)")
+    parser.add_argument("--retry-after", type=int, default=30, help="429 의 Retry-After (초)")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드 (재현용)")
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    return FakeConfig(
+        latency_ms=args.latency, jitter_ms=args.jitter, variant=args.variant,
+        rate_401=args.rate_401, rate_403=args.rate_403, rate_429=args.rate_429,
+        rate_challenge=args.rate_challenge, retry_after=args.retry_after, seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="claude.ai API 로컬 대역 서버")
+    parser.add_argument("--port", type=int, default=8790)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeClaudeServer(config_from_args(args), args.port)
+    print(f"✓ 가짜 서버: {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
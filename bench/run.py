@@ -0,0 +1,244 @@
+"""조회 경로 벤치마크 (로컬 가짜 서버 상대)
+
+백엔드마다 별도 프로세스에서 측정한다 (import 비용 / 메모리가 서로 섞이지 않도록).
+  cold start   프로세스 안에서 스크래퍼 import 부터 첫 사용량 수신까지
+  p50 / p99    이후 연속 조회 fetch_usage_data() 한 번의 지연
+  polls/min    대기 없이 연속 조회할 때 처리량
+  peak RSS     이 프로세스 + Playwright 드라이버 / Chromium 트리 최대 RSS
+
+    python -m bench.run
+    python -m bench.run --backends http --engine async --polls 500 --latency 50 --jitter 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from bench.fake_claude import FakeClaudeServer, add_config_arguments, config_from_args
+from logs import setup_logging
+
+
+BACKENDS = ("http", "playwright")
+ENGINES = ("sync", "async")
+SAMPLE_INTERVAL = 0.02  # RSS 측정 간격 (초)
+
+
+def _self_rss() -> int:
+    """현재 프로세스 RSS (바이트)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class RssSampler:
+    """백그라운드 스레드로 프로세스 트리 최대 RSS 추적"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _sample(self):
+        from scraper.browser import process_tree_usage
+        tree = process_tree_usage(os.getpid())  # 이 프로세스 포함
+        self.peak = max(self.peak, tree[0] if tree else _self_rss())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "RssSampler":
+        self._sample()
+        self._thread.start()
+        return self
+
+    def stop(self) -> int:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return self.peak
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return float('nan')
+    index = min(max(int(round(q / 100 * len(sorted_values) + 0.5)) - 1, 0), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _summarize(backend: str, engine: str, cold_start: Optional[float], cold_attempts: int,
+               latencies: List[float], failures: int, elapsed: float, peak_rss: int) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        'backend': backend,
+        'engine': engine,
+        'cold_start_ms': cold_start * 1000 if cold_start is not None else None,
+        'cold_attempts': cold_attempts,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'polls_per_min': len(latencies) / elapsed * 60 if elapsed > 0 else 0.0,
+        'failures': failures,
+        'polls': len(latencies),
+        'peak_rss_mb': peak_rss / 1024 / 1024,
+    }
+
+
+# ── 측정 프로세스 ──
+
+BENCH_COOKIES = {'sessionKey': 'bench-session'}
+# 첫 조회가 실패해도 (429 / 챌린지 주입) 측정을 멈추지 않음 - 이만큼 바로 재시도하고, 그래도 실패면
+# cold start 는 비워 두고 정상 상태 조회를 그대로 측정 (재시도 정책의 대기 시간은 측정 대상이 아님)
+COLD_ATTEMPTS = 5
+
+
+def _worker_sync(backend: str, base_url: str, polls: int, t0: float, sampler: RssSampler) -> Dict:
+    from scraper.usage_playwright import ClaudeUsageScraperPlaywright
+
+    scraper = ClaudeUsageScraperPlaywright(dict(BENCH_COOKIES), backend=backend, base_url=base_url)
+    try:
+        scraper.start()
+        cold_start, cold_attempts = None, 0
+        while cold_start is None and cold_attempts < COLD_ATTEMPTS:
+            cold_attempts += 1
+            if scraper.fetch_usage_data() is not None:
+                cold_start = time.perf_counter() - t0
+
+        latencies, failures = [], 0
+        loop_start = time.perf_counter()
+        for _ in range(polls):
+            started = time.perf_counter()
+            if scraper.fetch_usage_data() is None:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - loop_start
+    finally:
+        scraper.stop()
+    return _summarize(backend, "sync", cold_start, cold_attempts, latencies, failures, elapsed,
+                      sampler.stop())
+
+
+async def _worker_async(backend: str, base_url: str, polls: int, t0: float, sampler: RssSampler) -> Dict:
+    from scraper.usage_async import AsyncClaudeUsageScraper
+
+    scraper = AsyncClaudeUsageScraper(dict(BENCH_COOKIES), backend=backend, base_url=base_url)
+    async with scraper:
+        cold_start, cold_attempts = None, 0
+        while cold_start is None and cold_attempts < COLD_ATTEMPTS:
+            cold_attempts += 1
+            if await scraper.fetch_usage_data() is not None:
+                cold_start = time.perf_counter() - t0
+
+        latencies, failures = [], 0
+        loop_start = time.perf_counter()
+        for _ in range(polls):
+            started = time.perf_counter()
+            if await scraper.fetch_usage_data() is None:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+        elapsed = time.perf_counter() - loop_start
+    return _summarize(backend, "async", cold_start, cold_attempts, latencies, failures, elapsed,
+                      sampler.stop())
+
+
+def run_worker(backend: str, engine: str, base_url: str, polls: int) -> Dict:
+    """이 프로세스에서 백엔드 하나 측정 (로그는 stderr, stdout 은 결과 JSON 전용)"""
+    setup_logging("WARNING", stream=sys.stderr)
+    t0 = time.perf_counter()
+    sampler = RssSampler().start()
+    if engine == "async":
+        from scraper.browser_manager import BROWSERS
+        return BROWSERS.run(_worker_async(backend, base_url, polls, t0, sampler))
+    return _worker_sync(backend, base_url, polls, t0, sampler)
+
+
+# ── 실행기 ──
+
+def _spawn(backend: str, engine: str, base_url: str, polls: int, verbose: bool) -> Dict:
+    command = [sys.executable, "-m", "bench.run", "--worker", backend,
+               "--engine", engine, "--base-url", base_url, "--polls", str(polls)]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        command, cwd=root, stdout=subprocess.PIPE,
+        stderr=None if verbose else subprocess.PIPE, text=True
+    )
+    if proc.returncode != 0 or not proc.stdout.strip():
+        detail = (proc.stderr or "").strip().splitlines()
+        return {'backend': backend, 'engine': engine,
+                'error': detail[-1] if detail else f"exit {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def format_table(results: List[Dict]) -> str:
+    header = f"{'backend':<11} {'engine':<6} {'cold ms':>9} {'p50 ms':>8} {'p99 ms':>8} " \
+             f"{'polls/min':>10} {'fail':>5} {'peak MB':>8}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if 'error' in r:
+            lines.append(f"{r['backend']:<11} {r['engine']:<6} error: {r['error']}")
+            continue
+        cold = f"{r['cold_start_ms']:.1f}" if r['cold_start_ms'] is not None else "-"
+        if r['cold_attempts'] > 1:
+            cold += f"/{r['cold_attempts']}"  # 첫 성공까지 시도 횟수
+        lines.append(
+            f"{r['backend']:<11} {r['engine']:<6} {cold:>9} {r['p50_ms']:>8.2f} "
+            f"{r['p99_ms']:>8.2f} {r['polls_per_min']:>10.0f} {r['failures']:>5} {r['peak_rss_mb']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="조회 경로 벤치마크 (로컬 가짜 서버)")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="측정할 백엔드 (쉼표 구분, 기본: http,playwright)")
+    parser.add_argument("--engine", choices=ENGINES, default="sync",
+                        help="sync: 동기 스크래퍼 / async: 모니터링 루프가 쓰는 asyncio 엔진")
+    parser.add_argument("--polls", type=int, default=200, help="정상 상태 조회 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    parser.add_argument("--output", metavar="FILE", help="결과 표를 파일에도 저장")
+    parser.add_argument("--verbose", action="store_true", help="측정 프로세스 로그 표시")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    add_config_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.engine, args.base_url, args.polls)))
+        return 0
+
+    server = FakeClaudeServer(config_from_args(args)).start()
+    try:
+        results = [
+            _spawn(backend.strip(), args.engine, server.base_url, args.polls, args.verbose)
+            for backend in args.backends.split(",") if backend.strip()
+        ]
+    finally:
+        server.stop()
+
+    text = json.dumps(results, indent=2) if args.json else format_table(results)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    return 0 if all('error' not in r for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""명령줄 모드 (Tk 없음) - 한 번 조회 / JSON 출력 / 변경 감시
+
+cron, CI, 디스플레이 없는 서버용. customtkinter / tkinter 를 import 하지 않는다.
+"""
+import json
+import logging
+import sys
+import time
+from typing import Dict, Optional
+
+from daemon import build_snapshot, parse_snapshot
+from scraper.alerts import AlertEngine
+from scraper.auth import ClaudeAuth
+from scraper.browser_profile import BrowserProfile
+from scraper.forecast import UsageForecaster
+from scraper.history import UsageHistory
+from scraper.leader import FOLLOW_INTERVAL, Leadership
+from scraper.retry import AUTH_FAILURE_LIMIT, FetchPolicy
+from scraper.scheduler import AdaptiveScheduler
+from scraper.snapshot_cache import SnapshotCache, session_fingerprint
+from scraper.usage_playwright import ClaudeUsageScraperPlaywright, UsageData, bucket_spec, format_reset_time
+
+logger = logging.getLogger(__name__)
+
+
+# 종료 코드
+EXIT_OK = 0
+EXIT_FETCH_FAILED = 1
+EXIT_NO_SESSION = 2
+
+def format_line(usage_data: UsageData, forecasts: Dict) -> str:
+    """사람이 읽는 한 줄 요약"""
+    parts = []
+    for key, (percent, reset) in usage_data.buckets.items():
+        text = f"{bucket_spec(key).label} {percent:.0f}%"
+        details = []
+        if reset:
+            details.append(format_reset_time(reset))
+        forecast = forecasts.get(key)
+        if forecast and forecast.describe():
+            details.append(forecast.describe())
+        if details:
+            text += f" ({', '.join(details)})"
+        parts.append(text)
+    stamp = usage_data.last_updated.strftime('%H:%M:%S') if usage_data.last_updated else "--:--:--"
+    return f"[{stamp}] " + " | ".join(parts)
+
+
+def _emit(out, usage_data: UsageData, forecasts: Dict, as_json: bool):
+    if as_json:
+        line = json.dumps(build_snapshot(usage_data, forecasts), ensure_ascii=False)
+    else:
+        line = format_line(usage_data, forecasts)
+    out.write(line + "\n")
+    out.flush()
+
+
+def run_cli(watch: bool = False, as_json: bool = False,
+            profile: Optional[BrowserProfile] = None, alerts: Optional[AlertEngine] = None) -> int:
+    """한 번 조회(기본) 또는 변경될 때마다 한 줄씩 출력 (--watch)"""
+    auth = ClaudeAuth(profile=profile)
+    if not (auth.load_session() and auth.get_cookies()):
+        logger.error("저장된 세션이 없습니다. 먼저 `python main.py` 로 로그인하세요.")
+        return EXIT_NO_SESSION
+
+    # 다른 인스턴스가 조회 중이면 Chromium 없이 그 스냅샷 사용
+    leadership = Leadership()
+    if not leadership.acquire():
+        try:
+            code = _follow(leadership, sys.stdout, watch, as_json)
+        except KeyboardInterrupt:
+            return EXIT_OK
+        if code is not None:
+            return code
+        auth.load_session()  # 리더가 갱신해 저장한 쿠키로 이어받음
+
+    cache = SnapshotCache(session=session_fingerprint(auth.get_cookies()))
+    forecaster = UsageForecaster()
+    try:
+        forecaster.seed(UsageHistory().query(time.time() - 6 * 60 * 60))
+    except OSError:
+        pass
+
+    scraper = ClaudeUsageScraperPlaywright(
+        auth.get_cookies(), on_cookies_updated=auth.save_session, cache=cache,
+        profile=auth.profile
+    )
+    scheduler = AdaptiveScheduler()
+
+    # 진행 메시지는 로거(stderr), stdout 은 결과 전용
+    try:
+        return _poll(scraper, cache, scheduler, forecaster, leadership, alerts, sys.stdout, watch, as_json)
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        scraper.stop()
+        leadership.release()
+        if alerts:
+            alerts.close()
+
+
+def _follow(leadership: Leadership, out, watch: bool, as_json: bool) -> Optional[int]:
+    """팔로워: 리더가 게시한 스냅샷 출력. 리더 잠금을 얻으면 None (직접 조회로 전환)"""
+    logger.info("다른 인스턴스(PID %s)가 조회 중 - 게시된 스냅샷을 사용합니다",
+                leadership.leader_pid() or "?")
+    last_key = None
+    while True:
+        snapshot = leadership.read_snapshot()
+        try:
+            parsed = parse_snapshot(snapshot) if snapshot else None
+        except (KeyError, TypeError, ValueError):
+            parsed = None
+        if parsed:
+            usage_data, forecasts = parsed
+            key = list(usage_data.buckets.items())
+            if key != last_key:
+                last_key = key
+                _emit(out, usage_data, forecasts, as_json)
+            if not watch:
+                return EXIT_OK
+        time.sleep(FOLLOW_INTERVAL)
+        if leadership.acquire():
+            logger.info("조회 중이던 인스턴스가 종료되어 조회를 이어받습니다")
+            return None
+
+
+def _poll(scraper, cache, scheduler, forecaster, leadership, alerts, out, watch: bool, as_json: bool) -> int:
+    """조회 루프 (--watch 가 아니면 첫 결과 후 종료)"""
+    last_key = None
+    policy = FetchPolicy()
+    scraper.start()
+    while True:
+        usage_data = scraper.fetch_usage_data()
+        if usage_data is None:
+            if not watch:
+                logger.error("✗ 사용량 데이터 조회 실패")
+                return EXIT_FETCH_FAILED
+            policy.record_failure(scraper.last_status, scraper.retry_after)
+            if policy.auth_failures >= AUTH_FAILURE_LIMIT:
+                logger.error("세션이 만료되었습니다. `python main.py` 로 다시 로그인하세요.")
+                return EXIT_NO_SESSION
+            logger.warning("✗ 사용량 데이터 조회 실패")
+        else:
+            policy.record_success()
+            cache.save_usage(usage_data.to_dict())
+            scheduler.record(usage_data)
+            forecasts = forecaster.update(usage_data)
+            if alerts:
+                alerts.evaluate(usage_data, forecasts)
+            leadership.publish(build_snapshot(usage_data, forecasts))
+            # 값이 바뀌었을 때만 출력 (조회 시각은 비교에서 제외)
+            key = list(usage_data.buckets.items())
+            if key != last_key:
+                last_key = key
+                _emit(out, usage_data, forecasts, as_json)
+            if not watch:
+                return EXIT_OK
+        delay = policy.next_delay(scheduler.next_delay())
+        if usage_data is None:
+            logger.info("%.0f초 후 재시도", delay)
+        time.sleep(delay)
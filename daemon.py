@@ -0,0 +1,229 @@
+"""헤드리스 데몬 - 최신 스냅샷을 로컬 HTTP / Unix 소켓으로 제공
+
+엔드포인트
+  GET /usage   최신 스냅샷 JSON (메모리에 미리 인코딩된 바이트를 그대로 전송)
+  GET /events  변경 스트림 (server-sent events)
+  GET /health  상태 확인
+  GET /metrics OpenMetrics(Prometheus) 지표
+"""
+import json
+import logging
+import os
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from scraper import metrics
+
+if TYPE_CHECKING:
+    from scraper.usage_playwright import UsageData
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PORT = 8765
+SSE_KEEPALIVE = 15  # 초
+
+
+class SnapshotHub:
+    """조회 스레드 1개 → 다수 리더로 최신 스냅샷 전달"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.version = 0
+        self.payload = b'{"version": 0, "usage": null}'
+        self.closed = False
+
+    def publish(self, snapshot: Dict):
+        """새 스냅샷 게시 (직렬화는 여기서 한 번만)"""
+        with self._cond:
+            self.version += 1
+            snapshot = dict(snapshot, version=self.version)
+            self.payload = json.dumps(snapshot, ensure_ascii=False).encode('utf-8')
+            self._cond.notify_all()
+
+    def publish_usage(self, usage_data, forecasts: Dict, stale: bool = False,
+                      error: Optional[str] = None):
+        """사용량 + 예측을 스냅샷으로 게시"""
+        self.publish(build_snapshot(usage_data, forecasts, stale, error))
+
+    def latest(self) -> Tuple[int, bytes]:
+        with self._cond:
+            return self.version, self.payload
+
+    def wait_for_change(self, version: int, timeout: float) -> Tuple[int, bytes]:
+        """version 이후 스냅샷이 나오거나 timeout까지 대기"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != version or self.closed, timeout)
+            return self.version, self.payload
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """API 요청 처리"""
+
+    server_version = "oh-my-claudeusage"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def hub(self) -> SnapshotHub:
+        return self.server.hub
+
+    def address_string(self):
+        # Unix 소켓은 client_address가 비어 있음
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 출력하지 않음
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/usage':
+            _, payload = self.hub.latest()
+            self._send(200, payload)
+        elif path == '/events':
+            self._stream_events()
+        elif path == '/health':
+            version, _ = self.hub.latest()
+            self._send(200, json.dumps({'ok': True, 'version': version}).encode('utf-8'))
+        elif path == '/metrics':
+            self._send(200, metrics.REGISTRY.render(), metrics.CONTENT_TYPE)
+        else:
+            self._send(404, b'{"error": "not found"}')
+
+    def _send(self, status: int, body: bytes, content_type: str = 'application/json; charset=utf-8'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self):
+        """SSE: 연결 직후 현재 스냅샷, 이후 변경될 때마다 전송"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        version, payload = self.hub.latest()
+        try:
+            self._write_event(version, payload)
+            while not self.hub.closed:
+                new_version, payload = self.hub.wait_for_change(version, SSE_KEEPALIVE)
+                if new_version != version:
+                    version = new_version
+                    self._write_event(version, payload)
+                else:
+                    self.wfile.write(b': keepalive\n\n')
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _write_event(self, version: int, payload: bytes):
+        self.wfile.write(b'id: %d\nevent: usage\ndata: ' % version + payload + b'\n\n')
+        self.wfile.flush()
+
+
+class _TcpHandler(_Handler):
+    # 헤더/본문이 따로 전송되므로 Nagle + delayed ACK 지연(~40ms) 방지
+    disable_nagle_algorithm = True
+
+
+class _TcpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class ApiServer:
+    """localhost HTTP + (선택) Unix 소켓 서버"""
+
+    def __init__(self, hub: SnapshotHub, port: Optional[int] = DEFAULT_PORT,
+                 socket_path: Optional[str] = None):
+        self.hub = hub
+        self.port = port
+        self.socket_path = socket_path
+        self._servers = []
+
+    def start(self):
+        metrics.REGISTRY.enabled = True  # 수집할 곳이 생겼으므로 지표 기록 시작
+        if self.port is not None:
+            server = _TcpServer(('127.0.0.1', self.port), _TcpHandler)
+            self._serve(server)
+            logger.info("✓ API 서버: http://127.0.0.1:%d/usage", server.server_address[1])
+        if self.socket_path:
+            if _UnixServer is None:
+                logger.warning("이 플랫폼은 Unix 소켓을 지원하지 않습니다")
+            else:
+                if os.path.exists(self.socket_path):
+                    os.unlink(self.socket_path)
+                server = _UnixServer(self.socket_path, _Handler)
+                os.chmod(self.socket_path, 0o600)
+                self._serve(server)
+                logger.info("✓ API 소켓: %s", self.socket_path)
+
+    def _serve(self, server):
+        server.hub = self.hub
+        thread = threading.Thread(target=server.serve_forever, name="api-server", daemon=True)
+        thread.start()
+        self._servers.append(server)
+
+    def stop(self):
+        self.hub.close()
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+        if self.socket_path and _UnixServer is not None and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def build_snapshot(usage_data, forecasts: Dict, stale: bool = False,
+                   error: Optional[str] = None) -> Dict:
+    """API 응답용 스냅샷 구성"""
+    usage = usage_data.to_dict() if usage_data else None
+    return {
+        'updated_at': time.time(),
+        'stale': stale,
+        'error': error,
+        'usage': usage,
+        'buckets': usage['buckets'] if usage else {},
+        'forecasts': {key: f.to_dict() for key, f in (forecasts or {}).items()},
+    }
+
+
+def parse_snapshot(snapshot: Dict) -> Optional[Tuple["UsageData", Dict]]:
+    """build_snapshot() 의 역변환 - (UsageData, 예측). 사용량이 없으면 None"""
+    from scraper.forecast import Forecast
+    from scraper.usage_playwright import UsageData
+
+    if not snapshot.get('usage'):
+        return None
+    usage_data = UsageData.from_dict(snapshot['usage'])
+    # 캐시 값이면 stale 표시 (조회 실패로 인한 stale 은 error 로 따로 표시)
+    usage_data.stale = bool(snapshot.get('stale')) and not snapshot.get('error')
+    forecasts = {key: Forecast.from_dict(f) for key, f in (snapshot.get('forecasts') or {}).items()}
+    return usage_data, forecasts
+
+
+def default_socket_path() -> Optional[str]:
+    """플랫폼 기본 Unix 소켓 경로 (Windows는 없음)"""
+    if sys.platform == 'win32':
+        return None
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    return os.path.join(runtime_dir, f"oh-my-claudeusage-{os.getuid()}.sock")
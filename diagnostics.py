@@ -0,0 +1,283 @@
+"""실행 진단 도구 (시작 시간 추적, 프로파일링)"""
+import collections
+import contextlib
+import cProfile
+import logging
+import os
+import shutil
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_PROCESS_T0 = time.perf_counter()
+
+
+# 시작 ~ 첫 데이터 표시까지 목표 시간
+STARTUP_BUDGET_MS = 3000
+
+
+class StartupTrace:
+    """시작 단계별 소요 시간 기록 (--startup-trace)"""
+
+    def __init__(self, enabled: bool = False, t0: float = None):
+        self.enabled = enabled
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.marks = []
+        self._lock = threading.Lock()
+        self._reported = False
+
+    def mark(self, name: str):
+        """단계 완료 시점 기록 (비활성 시 no-op)"""
+        if not self.enabled or self._reported:
+            return
+        elapsed = (time.perf_counter() - self.t0) * 1000
+        with self._lock:
+            self.marks.append((name, elapsed, threading.current_thread().name))
+
+    def report(self):
+        """단계별 소요 시간 출력 (한 번만)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._reported:
+                return
+            self._reported = True
+            marks = sorted(self.marks, key=lambda m: m[1])
+
+        lines = ["── startup trace ──"]
+        prev = 0.0
+        for name, elapsed, thread in marks:
+            lines.append(f"  {elapsed:8.1f} ms  (+{elapsed - prev:7.1f})  {name}  [{thread}]")
+            prev = elapsed
+
+        first_data = next((elapsed for name, elapsed, _ in marks if name == "first data"), None)
+        if first_data is not None:
+            status = "OK" if first_data <= STARTUP_BUDGET_MS else "⚠ 예산 초과"
+            lines.append(f"  time-to-first-data: {first_data:.0f} ms (budget {STARTUP_BUDGET_MS} ms) {status}")
+        logger.info("\n".join(lines))
+
+
+# ── 프로파일링 (--profile) ──
+
+PROFILE_DIR = Path("config/profile")
+PROFILE_EVERY = 30      # 이만큼 조회할 때마다 결과 파일 기록 + 메모리 스냅샷 비교
+PROFILE_RUNS = 5        # 보관할 실행 디렉터리 수 (오래된 것부터 삭제)
+PROFILE_FILES = 20      # 실행 디렉터리 하나에 종류별로 보관할 파일 수
+TRACE_FRAMES = 8        # tracemalloc 호출 스택 깊이
+TOP_ALLOCATIONS = 25
+LAG_PROBE_MS = 1000     # Tk 이벤트 루프 지연 측정 주기
+LAG_SAMPLES = 4096
+STALL_MS = 250          # 이보다 늦게 실행된 콜백은 경고 로그
+
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class _Capture:
+    """같은 종류의 구간을 한 cProfile 에 누적 (기록할 때마다 새로 시작)"""
+
+    __slots__ = ('profile', 'count', 'total', 'worst', 'skipped', 'active')
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.skipped = 0  # 다른 프로파일러가 실행 중이라 건너뜀 (3.12+ 는 프로세스당 하나)
+        self.active = False  # 측정 중이면 기록을 다음으로 미룸 (dump_stats 가 disable 을 부르므로)
+
+
+class Profiler:
+    """조회 루프 / Tk 콜백 cProfile + tracemalloc 비교 + Tk 이벤트 루프 지연 (--profile)
+
+    꺼져 있으면 capture() 는 공용 nullcontext, 나머지는 첫 줄에서 반환한다.
+    결과는 <DIR>/<시작 시각>-<PID>/ 에 PROFILE_EVERY 번 조회마다 기록한다.
+    - <종류>-NNNN.prof  구간 누적 cProfile (python -m pstats / snakeviz 로 열기)
+    - memory-NNNN.txt   직전 / 첫 스냅샷 대비 할당 증가 상위 (장시간 누수 확인)
+    - summary.txt       구간 시간, Tk 콜백 지연 백분위, 메모리 (매번 덮어씀)
+    """
+
+    def __init__(self, enabled: bool = False, directory: Path = PROFILE_DIR, every: int = PROFILE_EVERY):
+        self.enabled = enabled
+        self.every = max(1, every)
+        self.directory = directory
+        self.run_dir: Optional[Path] = None
+        self.polls = 0
+        self.checkpoints = 0
+        self.lags: "collections.deque[float]" = collections.deque(maxlen=LAG_SAMPLES)
+        self.worst_lag = 0.0
+        self._captures: Dict[str, _Capture] = {}
+        self._totals: Dict[str, List[float]] = {}  # 종류 → [횟수, 합계, 최대, 건너뜀] (실행 전체)
+        self._lock = threading.Lock()
+        self._baseline = None
+        self._previous = None
+        self._widget = None
+        self._null = contextlib.nullcontext()
+
+    def start(self):
+        """실행 디렉터리 준비 + tracemalloc 시작 (비활성 시 no-op)"""
+        if not self.enabled or self.run_dir is not None:
+            return
+        run_dir = self.directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        try:
+            run_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning("프로파일 디렉터리를 만들 수 없어 프로파일링을 끕니다: %s", e)
+            self.enabled = False
+            return
+        self.run_dir = run_dir
+        self._rotate_runs()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        self._baseline = self._previous = self._snapshot()
+        logger.info("프로파일링 켜짐 → %s (%d회 조회마다 기록)", self.run_dir, self.every)
+
+    def _rotate_runs(self):
+        runs = sorted(p for p in self.directory.iterdir() if p.is_dir())
+        for old in runs[:-PROFILE_RUNS]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    # ── cProfile 구간 ──
+
+    def capture(self, kind: str):
+        """with profiler.capture("poll"): ... - 구간을 kind 별 cProfile 에 누적 (비활성 시 nullcontext)"""
+        if not self.enabled:
+            return self._null
+        return self._capture(kind)
+
+    @contextlib.contextmanager
+    def _capture(self, kind: str):
+        with self._lock:
+            capture = self._captures.setdefault(kind, _Capture())
+            busy = capture.active  # 같은 종류가 겹치면 (다른 스레드) 바깥 구간만 측정
+            capture.active = True
+        if busy:
+            yield
+            return
+        try:
+            capture.profile.enable()
+        except ValueError:
+            capture.skipped += 1
+            capture.active = False
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            capture.profile.disable()
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                capture.count += 1
+                capture.total += elapsed
+                capture.worst = max(capture.worst, elapsed)
+                capture.active = False
+
+    def poll_done(self) -> bool:
+        """조회 한 번 끝 - PROFILE_EVERY 번째면 True (checkpoint() 는 이벤트 루프 밖에서 호출)"""
+        if not self.enabled:
+            return False
+        self.polls += 1
+        return self.polls % self.every == 0
+
+    # ── Tk 이벤트 루프 지연 ──
+
+    def attach(self, widget):
+        """Tk 위젯에 지연 측정 시작 (메인 스레드에서 호출, 비활성 시 no-op)"""
+        if not self.enabled:
+            return
+        self._widget = widget
+        widget.after(LAG_PROBE_MS, self._probe)
+
+    def _probe(self):
+        # after(0) 콜백이 실제로 실행되기까지 걸린 시간 = 앞에 밀린 이벤트 / 콜백 처리 시간
+        queued = time.perf_counter()
+        self._widget.after(0, lambda: self._on_probe(queued))
+
+    def _on_probe(self, queued: float):
+        lag = time.perf_counter() - queued
+        self.lags.append(lag)
+        self.worst_lag = max(self.worst_lag, lag)
+        if lag * 1000 >= STALL_MS:
+            logger.warning("Tk 이벤트 루프 지연: %.0f ms", lag * 1000)
+        self._widget.after(LAG_PROBE_MS, self._probe)
+
+    # ── 기록 ──
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+
+    def checkpoint(self):
+        """cProfile 누적분 / 메모리 비교 / 요약 기록 (비활성 시 no-op)"""
+        if not self.enabled or self.run_dir is None:
+            return
+        with self._lock:
+            self.checkpoints += 1
+            number = self.checkpoints
+            captures = {k: c for k, c in self._captures.items() if not c.active}
+            self._captures = {k: c for k, c in self._captures.items() if c.active}
+        for kind, capture in captures.items():
+            totals = self._totals.setdefault(kind, [0, 0.0, 0.0, 0])
+            totals[0] += capture.count
+            totals[1] += capture.total
+            totals[2] = max(totals[2], capture.worst)
+            totals[3] += capture.skipped
+        try:
+            for kind, capture in captures.items():
+                if capture.count:
+                    capture.profile.dump_stats(str(self.run_dir / f"{kind}-{number:04d}.prof"))
+                    self._prune(f"{kind}-*.prof")
+            snapshot = self._snapshot()
+            self._write_memory(number, snapshot)
+            self._previous = snapshot
+            self._write_summary()
+        except OSError as e:
+            logger.warning("프로파일 기록 실패: %s", e)
+
+    def _prune(self, pattern: str):
+        for old in sorted(self.run_dir.glob(pattern))[:-PROFILE_FILES]:
+            old.unlink(missing_ok=True)
+
+    def _write_memory(self, number: int, snapshot):
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"polls {self.polls}  traced {current / 1024:.0f} KiB  peak {peak / 1024:.0f} KiB", ""]
+        for title, base in (("── 직전 기록 대비 ──", self._previous), ("── 시작 대비 ──", self._baseline)):
+            lines.append(title)
+            for stat in snapshot.compare_to(base, 'lineno')[:TOP_ALLOCATIONS]:
+                lines.append(str(stat))
+            lines.append("")
+        (self.run_dir / f"memory-{number:04d}.txt").write_text("\n".join(lines), encoding='utf-8')
+        self._prune("memory-*.txt")
+
+    def _write_summary(self):
+        lines = [f"polls {self.polls}  checkpoint {self.checkpoints}  "
+                 f"uptime {time.perf_counter() - _PROCESS_T0:.0f} s", ""]
+        for kind, (count, total, worst, skipped) in sorted(self._totals.items()):
+            mean = total / count * 1000 if count else 0.0
+            lines.append(f"{kind:6s} {count:5d}회  평균 {mean:8.1f} ms  최대 {worst * 1000:8.1f} ms"
+                         + (f"  건너뜀 {skipped}" if skipped else ""))
+        lags = sorted(self.lags)
+        if lags:
+            def pct(q):
+                return lags[min(len(lags) - 1, int(q * len(lags)))] * 1000
+            lines.append(f"tk 지연 {len(lags)}개  p50 {pct(0.5):.1f} ms  p95 {pct(0.95):.1f} ms  "
+                         f"p99 {pct(0.99):.1f} ms  최대 {self.worst_lag * 1000:.1f} ms")
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(f"메모리 {current / 1024:.0f} KiB (peak {peak / 1024:.0f} KiB)")
+        (self.run_dir / "summary.txt").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+    def stop(self):
+        """남은 결과 기록 + tracemalloc 종료 (비활성 시 no-op)"""
+        if not self.enabled or self.run_dir is None:
+            return
+        self.checkpoint()
+        tracemalloc.stop()
+        self.enabled = False
+        logger.info("프로파일 결과: %s", self.run_dir)
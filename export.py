@@ -0,0 +1,284 @@
+"""사용량 기록 내보내기 (Tk / Chromium 없음) - CSV / JSON Lines / Parquet / Arrow
+
+기록 파일을 청크 단위로 읽어 바로 쓰므로 기간이 길어도 메모리는 CHUNK_ROWS 행 정도만 쓴다.
+행 하나 = (시각, 구간, 사용률, 재설정 시각). 7일보다 오래된 구간은 시간 단위 롤업(최대값)이다.
+
+--export-resume 이면 마지막으로 내보낸 시각을 <FILE>.cursor 에 남기고 다음 실행은 그 이후만 내보낸다.
+CSV / JSON Lines 는 기존 파일에 이어 쓰고 (청크마다 커서 갱신 - 중간에 끊겨도 이어서),
+Parquet / Arrow 는 이어 쓸 수 없으므로 실행마다 <이름>-<첫 시각>.<확장자> 파일을 하나씩 추가한다.
+"""
+import csv
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from scraper.history import UsageHistory
+from scraper.usage_playwright import bucket_name, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+FORMATS = ("csv", "jsonl", "parquet", "arrow")
+SUFFIX_FORMATS = {'.csv': "csv", '.jsonl': "jsonl", '.ndjson': "jsonl", '.parquet': "parquet",
+                  '.arrow': "arrow", '.feather': "arrow"}
+COLUMNS = ("timestamp", "bucket", "percent", "resets_at")
+CHUNK_ROWS = 8192
+
+# 종료 코드 (cli 와 같은 의미)
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+Row = Tuple[float, str, float, Optional[float]]  # (epoch, 구간, 사용률 %, 재설정 epoch)
+
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)([mhdw])$')
+_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+
+def parse_time(text: str, now: Optional[float] = None) -> float:
+    """'30d' / '12h' 같은 상대 기간(지금부터 이전) 또는 ISO-8601 시각 → epoch"""
+    match = _DURATION.match(text.strip())
+    if match:
+        return (now if now is not None else time.time()) - float(match[1]) * _UNITS[match[2]]
+    return parse_timestamp(text.strip()).timestamp()  # 시간대가 없으면 로컬 시각
+
+
+def _iso(epoch: Optional[float]) -> str:
+    if epoch is None:
+        return ""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def iter_rows(history: UsageHistory, start: float, end: float,
+              buckets: Optional[Sequence[str]] = None) -> Iterator[Row]:
+    """기록 → 행 (시간순, 스트리밍)"""
+    wanted = set(buckets) if buckets else None
+    for sample in history.query(start, end):
+        for key, (percent, reset) in sample.buckets.items():
+            if wanted is None or key in wanted:
+                yield sample.timestamp, key, percent, reset
+
+
+def _chunks(rows: Iterator[Row], size: int = CHUNK_ROWS) -> Iterator[List[Row]]:
+    """size 행 안팎의 청크 - 샘플 경계에서만 자름 (청크마다 저장하는 커서가 샘플 중간을 가리키지 않도록)"""
+    chunk = []
+    for row in rows:
+        if len(chunk) >= size and row[0] != chunk[-1][0]:
+            yield chunk
+            chunk = []
+        chunk.append(row)
+    if chunk:
+        yield chunk
+
+
+# ── 형식별 writer (write(chunk) 반복 후 close()) ──
+
+class _CsvWriter:
+    appendable = True
+
+    def __init__(self, stream, header: bool):
+        self.stream = stream
+        self.writer = csv.writer(stream, lineterminator="\n")
+        if header:
+            self.writer.writerow(COLUMNS)
+
+    def write(self, chunk: List[Row]):
+        self.writer.writerows((_iso(t), key, f"{percent:g}", _iso(reset)) for t, key, percent, reset in chunk)
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class _JsonlWriter:
+    appendable = True
+
+    def __init__(self, stream, header: bool):
+        self.stream = stream
+
+    def write(self, chunk: List[Row]):
+        self.stream.write("".join(
+            json.dumps({'timestamp': _iso(t), 'bucket': key, 'percent': percent,
+                        'resets_at': _iso(reset) or None}) + "\n"
+            for t, key, percent, reset in chunk
+        ))
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ('timestamp', pa.timestamp('s', tz='UTC')),
+        ('bucket', pa.dictionary(pa.int16(), pa.string())),
+        ('percent', pa.float64()),
+        ('resets_at', pa.timestamp('s', tz='UTC')),
+    ])
+
+
+def _arrow_batch(pa, schema, chunk: List[Row]):
+    timestamps, keys, percents, resets = zip(*chunk)
+    return pa.record_batch([
+        pa.array([int(t) for t in timestamps], schema.field('timestamp').type),
+        pa.array(keys, pa.string()).dictionary_encode().cast(schema.field('bucket').type),
+        pa.array(percents, pa.float64()),
+        pa.array([int(r) if r else None for r in resets], schema.field('resets_at').type),
+    ], schema=schema)
+
+
+class _ParquetWriter:
+    """청크마다 row group 하나"""
+    appendable = False
+
+    def __init__(self, path: Path):
+        import pyarrow as pa  # 지연 import (선택 의존성)
+        import pyarrow.parquet as pq
+        self.pa = pa
+        self.schema = _arrow_schema(pa)
+        self.writer = pq.ParquetWriter(str(path), self.schema, compression='zstd')
+
+    def write(self, chunk: List[Row]):
+        self.writer.write_table(self.pa.Table.from_batches([_arrow_batch(self.pa, self.schema, chunk)]))
+
+    def close(self):
+        self.writer.close()
+
+
+class _ArrowWriter:
+    """Arrow IPC 파일 (Feather v2) - 청크마다 record batch 하나"""
+    appendable = False
+
+    def __init__(self, path: Path):
+        import pyarrow as pa  # 지연 import (선택 의존성)
+        self.pa = pa
+        self.schema = _arrow_schema(pa)
+        self.sink = pa.OSFile(str(path), 'wb')
+        self.writer = pa.ipc.new_file(self.sink, self.schema)
+
+    def write(self, chunk: List[Row]):
+        self.writer.write_batch(_arrow_batch(self.pa, self.schema, chunk))
+
+    def close(self):
+        self.writer.close()
+        self.sink.close()
+
+
+# ── 커서 (이어서 내보내기) ──
+
+def _cursor_path(output: Path) -> Path:
+    return output.with_name(output.name + ".cursor")
+
+
+def load_cursor(output: Path) -> Optional[float]:
+    """마지막으로 내보낸 샘플 시각 (없으면 None)"""
+    try:
+        with open(_cursor_path(output), 'r', encoding='utf-8') as f:
+            return float(json.load(f)['last_timestamp'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_cursor(output: Path, timestamp: float):
+    path = _cursor_path(output)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'last_timestamp': timestamp, 'exported_at': time.time()}, f)
+    os.replace(tmp, path)
+
+
+def detect_format(output: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return SUFFIX_FORMATS.get(Path(output).suffix.lower(), "csv")
+
+
+def run_export(output: str, fmt: Optional[str] = None, since: Optional[str] = None,
+               until: Optional[str] = None, buckets: Optional[str] = None, resume: bool = False,
+               history_dir: Path = Path("config")) -> int:
+    """기록 내보내기 (output '-' = stdout)"""
+    fmt = detect_format(output, fmt)
+    to_stdout = output == "-"
+    if to_stdout and fmt not in ("csv", "jsonl"):
+        logger.error("%s 형식은 파일로만 내보낼 수 있습니다", fmt)
+        return EXIT_FAILED
+    if to_stdout and resume:
+        logger.error("--export-resume 은 파일로 내보낼 때만 쓸 수 있습니다")
+        return EXIT_FAILED
+    try:
+        now = time.time()
+        start = parse_time(since, now) if since else 0.0
+        end = parse_time(until, now) if until else now + 1
+    except ValueError as e:
+        logger.error("시각을 해석할 수 없습니다: %s", e)
+        return EXIT_FAILED
+    keys = [bucket_name(k.strip()) for k in buckets.split(",") if k.strip()] if buckets else None
+
+    path = Path(output)
+    target = path
+    cursor = load_cursor(path) if resume else None
+    if cursor is not None:
+        start = max(start, cursor + 1)  # 기록 시각은 초 단위
+    if not history_dir.joinpath("history.bin").exists():
+        logger.error("기록 파일이 없습니다: %s", history_dir / "history.bin")
+        return EXIT_FAILED
+    history = UsageHistory(history_dir)
+    chunks = _chunks(iter_rows(history, start, end, keys))
+    first = next(chunks, None)
+    if first is None:
+        logger.info("내보낼 새 기록이 없습니다")
+        return EXIT_OK
+
+    if fmt in ("parquet", "arrow"):
+        if cursor is not None:
+            stamp = datetime.fromtimestamp(first[0][0], timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+            target = path.with_name(f"{path.stem}-{stamp}{path.suffix}")
+        tmp = target.with_name(target.name + ".tmp")
+        try:
+            writer = _ParquetWriter(tmp) if fmt == "parquet" else _ArrowWriter(tmp)
+        except ImportError:
+            logger.error("%s 형식에는 pyarrow 가 필요합니다: pip install pyarrow", fmt)
+            return EXIT_FAILED
+        stream = None
+    else:
+        append = resume and path.exists() and path.stat().st_size > 0
+        stream = sys.stdout if to_stdout else open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+        writer = (_CsvWriter if fmt == "csv" else _JsonlWriter)(stream, header=not append)
+
+    rows = 0
+    last = None
+    try:
+        for chunk in itertools.chain([first], chunks):
+            writer.write(chunk)
+            rows += len(chunk)
+            last = chunk[-1][0]
+            if resume and writer.appendable:
+                save_cursor(path, last)  # 이미 쓴 샘플까지는 다음 실행에서 건너뜀 (청크 = 샘플 단위)
+        writer.close()
+    except BrokenPipeError:
+        if not to_stdout:
+            raise
+        # `| head` 등으로 읽는 쪽이 먼저 닫힘 - 정상 종료 (종료 시 flush 오류 방지)
+        sys.stdout = open(os.devnull, 'w')
+        return EXIT_OK
+    except BaseException:
+        if not writer.appendable:
+            tmp.unlink(missing_ok=True)  # 반쯤 쓴 Parquet / Arrow 는 읽을 수 없음
+        raise
+    finally:
+        if stream is not None and not to_stdout:
+            stream.close()
+    if not writer.appendable:
+        os.replace(tmp, target)
+        if resume:
+            save_cursor(path, last)
+
+    logger.info("✓ %d행 내보냄 → %s (%s, %s ~ %s)", rows, "stdout" if to_stdout else target, fmt,
+                _iso(first[0][0]), _iso(last))
+    return EXIT_OK
@@ -0,0 +1,336 @@
+"""Fleet 모드 - 여러 계정을 한 프로세스에서 감시 (Tk 없음)
+
+config/sessions/<이름>.json (session.json 과 같은 형식) 하나가 계정 하나다.
+- 계정마다 쿠키 / 조직 ID / 캐시 / 기록 / 스케줄러 / 재시도 정책을 따로 유지 (config/fleet/<이름>/)
+- 요청은 계정별 keep-alive HTTP, 챌린지 폴백은 공유 브라우저의 컨텍스트 풀 (동시 수 제한)
+- 첫 조회를 기본 간격 전체에 흩뿌리고 매 대기에 지터를 더해 요청이 한꺼번에 몰리지 않게 함
+- 계정별 스냅샷 + 전체 요약을 로컬 API(/usage, /events)로 제공
+
+    python main.py --fleet-login alice      # 계정 추가 (브라우저 로그인)
+    python main.py --fleet --port 8765
+"""
+import asyncio
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from daemon import ApiServer, SnapshotHub, build_snapshot
+from scraper.alerts import AlertEngine
+from scraper.auth import ClaudeAuth
+from scraper.browser_manager import BROWSERS
+from scraper.browser_profile import BrowserProfile
+from scraper.context_pool import DEFAULT_POOL_SIZE, BrowserContextPool, PooledUsageScraper
+from scraper.forecast import UsageForecaster
+from scraper.history import UsageHistory
+from scraper.leader import Leadership
+from scraper.retry import AUTH_FAILURE_LIMIT, FetchPolicy
+from scraper.scheduler import NEAR_LIMIT, AdaptiveScheduler
+from scraper.snapshot_cache import SnapshotCache, session_fingerprint
+from scraper.usage_playwright import UsageData
+
+logger = logging.getLogger(__name__)
+
+
+SESSIONS_DIR = Path("config/sessions")
+STATE_DIR = Path("config/fleet")
+
+BASE_INTERVAL = 60          # 계정별 기본 조회 간격 (초) - 실제 간격은 계정별 스케줄러가 조정
+JITTER = 0.1                # 매 대기 시간 ± 비율
+MAX_CONCURRENT_POLLS = 8    # 동시에 진행 중인 조회 수 상한
+POLL_DEADLINE = 60.0        # 조회 한 번 제한 시간 (초)
+PUBLISH_INTERVAL = 1.0      # 요약 재구성 최소 간격 (초) - 여러 계정 갱신을 묶어서 한 번에 게시
+SUMMARY_LOG_INTERVAL = 5 * 60
+
+# 종료 코드 (cli 와 같은 의미)
+EXIT_OK = 0
+EXIT_NO_SESSION = 2
+EXIT_ALREADY_RUNNING = 3
+
+
+class Account:
+    """계정 하나의 격리된 조회 상태"""
+
+    def __init__(self, name: str, session_file: Path, state_dir: Path = STATE_DIR,
+                 alerts: Optional[AlertEngine] = None):
+        self.name = name
+        self.auth = ClaudeAuth(profile=BrowserProfile(), session_file=session_file)
+        self.state_dir = state_dir / name
+        self.scraper: Optional[PooledUsageScraper] = None
+        self.cache: Optional[SnapshotCache] = None
+        self.scheduler = AdaptiveScheduler(base_interval=BASE_INTERVAL)
+        self.policy = FetchPolicy()
+        self.forecaster = UsageForecaster()
+        self.history = UsageHistory(self.state_dir)
+        self.usage: Optional[UsageData] = None
+        self.forecasts: Dict = {}
+        self.error: Optional[str] = None
+        self.expired = False
+        self.polls = 0
+        self.failures = 0
+        self.next_poll_at: Optional[float] = None
+        self.snapshot: Dict = {}
+        self.alerts = alerts
+
+    def load(self, pool: BrowserContextPool) -> bool:
+        """세션 파일 로드 + 스크래퍼 준비 (세션이 없으면 False)"""
+        if not (self.auth.load_session() and self.auth.get_cookies()):
+            return False
+        cookies = self.auth.get_cookies()
+        self.cache = SnapshotCache(self.state_dir / "cache.json", session=session_fingerprint(cookies))
+        self.scraper = PooledUsageScraper(
+            cookies, pool, on_cookies_updated=self.auth.save_session, cache=self.cache
+        )
+        cached = self.cache.load_usage()
+        if cached:
+            try:
+                self.usage = UsageData.from_dict(cached)
+                self.usage.stale = True
+            except (TypeError, ValueError, KeyError):
+                self.usage = None
+        try:
+            self.forecaster.seed(self.history.query(time.time() - 6 * 60 * 60))
+        except OSError as e:
+            logger.warning("[%s] 기록 읽기 실패: %s", self.name, e)
+        self._build_snapshot()
+        return True
+
+    def record(self, usage_data: Optional[UsageData]):
+        """조회 결과 반영 (세션 만료 판정 포함)"""
+        scraper = self.scraper
+        self.polls += 1
+        if usage_data:
+            self.policy.record_success()
+            self.scheduler.record(usage_data)
+            self.cache.save_usage(usage_data.to_dict())
+            try:
+                self.history.append(usage_data)
+            except OSError as e:
+                logger.warning("[%s] 기록 저장 실패: %s", self.name, e)
+            self.forecasts = self.forecaster.update(usage_data)
+            if self.alerts:
+                self.alerts.evaluate(usage_data, self.forecasts, account=self.name)
+            self.usage = usage_data
+            self.error = None
+        else:
+            self.failures += 1
+            self.policy.record_failure(scraper.last_status, scraper.retry_after)
+            if scraper.last_status in (401, 403) and self.policy.auth_failures >= AUTH_FAILURE_LIMIT:
+                self.expired = True
+                self.error = "세션 만료 - 다시 로그인 필요"
+            else:
+                self.error = f"조회 실패 (응답 {scraper.last_status or '없음'})"
+        self._build_snapshot()
+
+    def _build_snapshot(self):
+        # 요약은 계정 스냅샷을 그대로 모으기만 하도록 갱신 시점에 한 번 구성
+        snapshot = build_snapshot(self.usage, self.forecasts,
+                                  stale=bool(self.error) or bool(self.usage and self.usage.stale),
+                                  error=self.error)
+        snapshot.update(
+            account=self.name,
+            expired=self.expired,
+            last_status=self.scraper.last_status if self.scraper else None,
+            polls=self.polls,
+            failures=self.failures,
+            next_poll_at=self.next_poll_at,
+        )
+        self.snapshot = snapshot
+
+    def near_limit(self) -> bool:
+        """한도 근접 또는 재설정 전 소진 예상"""
+        if self.usage and any(b.percent >= NEAR_LIMIT for b in self.usage.buckets.values()):
+            return True
+        return any(f.hits_before_reset for f in self.forecasts.values())
+
+
+class Fleet:
+    """계정 N개 조회 + 요약 게시"""
+
+    def __init__(self, sessions_dir: Path = SESSIONS_DIR, pool_size: int = DEFAULT_POOL_SIZE,
+                 state_dir: Path = STATE_DIR, hub: Optional[SnapshotHub] = None,
+                 alerts: Optional[AlertEngine] = None):
+        self.pool = BrowserContextPool(pool_size)
+        self.hub = hub
+        self.accounts: List[Account] = []
+        for session_file in sorted(sessions_dir.glob("*.json")):
+            account = Account(session_file.stem, session_file, state_dir, alerts)
+            if account.load(self.pool):
+                self.accounts.append(account)
+            else:
+                logger.warning("[%s] 세션을 읽을 수 없어 건너뜁니다: %s", session_file.stem, session_file)
+        self._polls: Optional[asyncio.Semaphore] = None
+        self._changed: Optional[asyncio.Event] = None
+
+    async def run(self):
+        """모든 계정 조회 (취소될 때까지)"""
+        self._polls = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        self._changed = asyncio.Event()
+        spacing = BASE_INTERVAL / max(len(self.accounts), 1)
+        tasks = [
+            asyncio.create_task(self._run_account(account, i * spacing + random.uniform(0, spacing)),
+                                name=f"fleet-{account.name}")
+            for i, account in enumerate(self.accounts)
+        ]
+        publisher = asyncio.create_task(self._publish_loop(), name="fleet-publisher")
+        logger.info("✓ Fleet: 계정 %d개, 브라우저 컨텍스트 최대 %d개", len(self.accounts), self.pool.size)
+        try:
+            await asyncio.gather(*tasks)
+            # 모든 계정이 멈춤 (세션 만료 등) - 마지막 상태만 게시하고 종료
+            self.publish()
+        finally:
+            publisher.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(publisher, *tasks, return_exceptions=True)
+            for account in self.accounts:
+                await account.scraper.stop()
+            await BROWSERS.close()
+
+    async def _run_account(self, account: Account, offset: float):
+        """계정 하나의 조회 루프 (첫 조회는 offset 초 뒤)"""
+        account.next_poll_at = time.time() + offset
+        await asyncio.sleep(offset)
+        while True:
+            try:
+                if not await self._poll_account(account):
+                    return
+            except Exception as e:
+                # 한 계정의 오류(캐시 / 기록 / 알림 등)가 gather 를 깨고 다른 계정까지 멈추지 않도록
+                logger.exception("[%s] 조회 루프 오류: %s", account.name, e)
+                account.failures += 1
+                account.policy.record_failure()
+                account.error = f"내부 오류: {e}"
+                account._build_snapshot()
+
+            delay = account.policy.next_delay(account.scheduler.next_delay())
+            delay *= random.uniform(1 - JITTER, 1 + JITTER)
+            account.next_poll_at = time.time() + delay
+            account.snapshot['next_poll_at'] = account.next_poll_at
+            self._changed.set()
+            logger.debug("[%s] 다음 조회: %.0f초 후", account.name, delay)
+            await asyncio.sleep(delay)
+
+    async def _poll_account(self, account: Account) -> bool:
+        """조회 한 번 + 반영. 세션 만료로 이 계정을 멈추면 False"""
+        scraper = account.scraper
+        await scraper.start()  # 이미 시작했으면 no-op
+        async with self._polls:
+            try:
+                usage_data = await asyncio.wait_for(scraper.fetch_usage_data(), POLL_DEADLINE)
+            except asyncio.TimeoutError:
+                logger.warning("[%s] 조회 시간 초과 (%.0f초)", account.name, POLL_DEADLINE)
+                usage_data = None
+            except Exception as e:
+                logger.warning("[%s] 조회 오류: %s", account.name, e)
+                usage_data = None
+
+        if usage_data is None:
+            logger.warning("[%s] ✗ 사용량 조회 실패 (%s)", account.name, scraper.last_status)
+        account.next_poll_at = None
+        account.record(usage_data)
+        if account.expired:
+            logger.warning("[%s] 세션이 만료되어 이 계정의 조회를 멈춥니다", account.name)
+            self._changed.set()
+            return False
+        return True
+
+    async def _publish_loop(self):
+        """변경이 있으면 최대 PUBLISH_INTERVAL 마다 한 번 요약 게시"""
+        last_log = time.monotonic()
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            self.publish()
+            if time.monotonic() - last_log >= SUMMARY_LOG_INTERVAL:
+                last_log = time.monotonic()
+                self._log_summary()
+            await asyncio.sleep(PUBLISH_INTERVAL)
+
+    def publish(self):
+        if self.hub:
+            self.hub.publish(self.summary())
+
+    def summary(self) -> Dict:
+        """전체 요약 + 계정별 스냅샷"""
+        highest: Dict[str, Dict] = {}
+        ok = failing = expired = 0
+        near_limit = []
+        for account in self.accounts:
+            if account.expired:
+                expired += 1
+            elif account.error:
+                failing += 1
+            elif account.usage and not account.usage.stale:
+                ok += 1
+            if account.near_limit():
+                near_limit.append(account.name)
+            if account.usage:
+                for key, bucket in account.usage.buckets.items():
+                    top = highest.get(key)
+                    if top is None or bucket.percent > top['percent']:
+                        highest[key] = {'account': account.name, 'percent': bucket.percent}
+        return {
+            'updated_at': time.time(),
+            'fleet': {
+                'accounts': len(self.accounts),
+                'ok': ok,
+                'pending': len(self.accounts) - ok - failing - expired,  # 아직 실시간 조회 전
+                'failing': failing,
+                'expired': expired,
+                'near_limit': near_limit,
+                'highest': highest,
+                'browser': self.pool.stats(),
+            },
+            'accounts': {account.name: account.snapshot for account in self.accounts},
+        }
+
+    def _log_summary(self):
+        fleet = self.summary()['fleet']
+        logger.info(
+            "Fleet: 정상 %d / 실패 %d / 만료 %d (총 %d) · 한도 근접 %s · 브라우저 %s",
+            fleet['ok'], fleet['failing'], fleet['expired'], fleet['accounts'],
+            ", ".join(fleet['near_limit']) or "없음",
+            f"컨텍스트 {fleet['browser']['active']}/{fleet['browser']['size']}" if fleet['browser']['running'] else "꺼짐",
+        )
+
+
+def run_fleet(sessions_dir: Path = SESSIONS_DIR, pool_size: int = DEFAULT_POOL_SIZE,
+              port: Optional[int] = None, socket_path: Optional[str] = None,
+              alerts: Optional[AlertEngine] = None) -> int:
+    """fleet 실행 (Ctrl+C 로 종료)"""
+    # 같은 상태 디렉터리를 두 fleet 프로세스가 동시에 조회하지 않도록
+    lock = Leadership(STATE_DIR)
+    if not lock.acquire():
+        logger.error("다른 fleet 프로세스(PID %s)가 이미 실행 중입니다", lock.leader_pid() or "?")
+        return EXIT_ALREADY_RUNNING
+
+    hub = SnapshotHub()
+    fleet = Fleet(sessions_dir, pool_size, hub=hub, alerts=alerts)
+    if not fleet.accounts:
+        logger.error("계정 세션이 없습니다: %s/*.json (`python main.py --fleet-login 이름` 으로 추가)", sessions_dir)
+        lock.release()
+        return EXIT_NO_SESSION
+
+    server = ApiServer(hub, port, socket_path)
+    server.start()
+    fleet.publish()
+    try:
+        BROWSERS.run(fleet.run())
+    except KeyboardInterrupt:
+        logger.info("Fleet 종료")
+    finally:
+        server.stop()
+        lock.release()
+        if alerts:
+            alerts.close()
+    return EXIT_OK
+
+
+def login_account(name: str, sessions_dir: Path = SESSIONS_DIR) -> bool:
+    """브라우저 로그인으로 계정 세션 추가 (config/sessions/<이름>.json)"""
+    if not name or Path(name).name != name or name.startswith('.'):
+        raise ValueError(f"계정 이름으로 쓸 수 없습니다: {name!r}")
+    auth = ClaudeAuth(profile=BrowserProfile(), session_file=sessions_dir / f"{name}.json")
+    return auth.login_with_browser_manual()
@@ -0,0 +1,41 @@
+"""백그라운드 스레드 → Tk 메인 스레드 콜백 전달 채널"""
+import logging
+import queue
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+PUMP_MS = 50  # Tk 쪽에서 큐를 비우는 주기
+
+
+class UiChannel:
+    """스레드 안전 큐 + Tk after() 펌프
+
+    어느 스레드에서든 post() 할 수 있고, 콜백은 Tk 메인 스레드에서만 실행된다.
+    위젯이 붙기 전에 들어온 콜백은 큐에 쌓였다가 attach() 후 실행된다.
+    """
+
+    def __init__(self):
+        self._queue: "queue.SimpleQueue[Callable]" = queue.SimpleQueue()
+        self._widget = None
+
+    def post(self, callback: Callable):
+        self._queue.put(callback)
+
+    def attach(self, widget):
+        """Tk 위젯에 연결하고 펌프 시작 (메인 스레드에서 호출)"""
+        self._widget = widget
+        self._pump()
+
+    def _pump(self):
+        while True:
+            try:
+                callback = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback()
+            except Exception as e:
+                logger.exception("UI 콜백 오류: %s", e)
+        self._widget.after(PUMP_MS, self._pump)
@@ -1,8 +1,12 @@
 """메인 대시보드"""
+import logging
 import customtkinter as ctk
-from datetime import datetime, timedelta
-from typing import Optional
-from scraper.usage_playwright import UsageData
+from datetime import datetime
+from typing import Dict, List, Optional
+from logs import RING
+from gui.sparkline import Point, Sparkline, window_for
+from scraper.forecast import Forecast
+from scraper.usage_playwright import BUCKET_KEYS, UsageData, bucket_spec, format_reset_time
 
 
 # 뷰 모드 상수
@@ -16,12 +20,32 @@ VIEW_LABELS = {
     VIEW_MID: "Mid",
 }
 
-VIEW_SIZES = {
-    VIEW_MAX: (380, 480),
-    VIEW_MIN: (380, 190),
-    VIEW_MID: (380, 340),
+# 재설정 카운트다운 / 예측 문구 갱신 주기 (네트워크 없음)
+TICK_MS = 1000
+
+# 상태바 아래 줄에 표시할 최근 로그 이벤트 (글자 수 제한)
+EVENT_MAX_CHARS = 56
+
+# 뷰별 표시할 구간 수 (None = 전체)
+VIEW_SECTIONS = {
+    VIEW_MAX: None,
+    VIEW_MIN: 1,
+    VIEW_MID: 2,
 }
 
+# 창 크기: 툴바 + 헤더 + 상태바 높이에 섹션 높이를 더함
+WINDOW_WIDTH = 380
+BASE_HEIGHT = 66
+SECTION_HEIGHT = 154
+GROUP_HEADER_HEIGHT = 10
+
+
+class _Section:
+    """구간 하나의 위젯 묶음"""
+
+    __slots__ = ('frame', 'has_header', 'reset_label', 'percent_label', 'forecast_label', 'progress',
+                 'sparkline')
+
 
 class DashboardWindow(ctk.CTk):
     """대시보드 메인 창"""
@@ -35,16 +59,23 @@ class DashboardWindow(ctk.CTk):
 
         # 창 설정
         self.title("Oh-my-claudeusage")
-        self.geometry("380x480")
+        self.geometry(f"{WINDOW_WIDTH}x{BASE_HEIGHT + SECTION_HEIGHT}")
         self.resizable(False, False)
 
         # 상태
         self.usage_data: Optional[UsageData] = None
+        self.forecasts: Dict[str, Forecast] = {}
+        self._applied: Dict[str, Dict] = {}  # 위젯별 마지막으로 적용한 옵션 (dirty tracking)
+        self.sections: Dict[str, _Section] = {}  # 구간 이름 → 섹션 (표시 순서)
+        self._history: Dict[str, List[Point]] = {}  # 아직 섹션이 없는 구간의 추세 기록
         self.view_mode = VIEW_MAX
         self.opacity = 1.0
         self.always_on_top = False
+        self._ring_version = -1
 
         self._create_widgets()
+        self._apply_view()
+        self.after(TICK_MS, self._tick)
 
     def _create_widgets(self):
         """위젯 생성"""
@@ -119,39 +150,12 @@ class DashboardWindow(ctk.CTk):
         )
         self.header_label.pack(fill="x", pady=(5, 10))
 
-        # ── 현재 세션 섹션 (항상 표시) ──
-        self.session_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        self.session_frame.pack(fill="x")
-        self._create_usage_section(self.session_frame, "Current Session", "current_session")
-
-        # ── 주간 전체 섹션 (중간/최대에서 표시) ──
-        self.weekly_all_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        self.weekly_all_frame.pack(fill="x")
-
-        self.sep1 = ctk.CTkFrame(self.weekly_all_frame, height=1, fg_color="gray30")
-        self.sep1.pack(fill="x", pady=(12, 8))
-
-        weekly_header = ctk.CTkLabel(
-            self.weekly_all_frame,
-            text="Weekly Limits",
-            font=ctk.CTkFont(family="Inter", size=16, weight="bold"),
-            anchor="w"
-        )
-        weekly_header.pack(fill="x", pady=(0, 6))
-
-        self._create_usage_section(self.weekly_all_frame, "All Models", "weekly_all")
-
-        # ── Sonnet 섹션 (최대에서만 표시) ──
-        self.weekly_sonnet_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        self.weekly_sonnet_frame.pack(fill="x")
-
-        self.sep2 = ctk.CTkFrame(self.weekly_sonnet_frame, height=1, fg_color="gray30")
-        self.sep2.pack(fill="x", pady=(10, 6))
-
-        self._create_usage_section(self.weekly_sonnet_frame, "Sonnet Only", "weekly_sonnet")
+        # ── 구간 섹션 (스키마 기본 구간, 응답에 새 구간이 오면 추가) ──
+        for key in BUCKET_KEYS:
+            self._add_section(key)
 
         # ── 하단 상태바 ──
-        self.status_frame = ctk.CTkFrame(self, fg_color="gray20", height=28, corner_radius=0)
+        self.status_frame = ctk.CTkFrame(self, fg_color="gray20", height=44, corner_radius=0)
         self.status_frame.pack(fill="x", side="bottom")
         self.status_frame.pack_propagate(False)
 
@@ -161,9 +165,45 @@ class DashboardWindow(ctk.CTk):
             font=ctk.CTkFont(family="Inter", size=10),
             text_color="gray"
         )
-        self.status_label.pack(pady=4)
+        self.status_label.pack(pady=(4, 0))
 
-    def _create_usage_section(self, parent, title: str, key: str):
+        self.event_label = ctk.CTkLabel(
+            self.status_frame,
+            text="",
+            font=ctk.CTkFont(family="Inter", size=9),
+            text_color="gray50",
+            height=14
+        )
+        self.event_label.pack()
+
+    def _add_section(self, key: str) -> _Section:
+        """구간 섹션 생성 (구분선 + 묶음이 바뀌면 묶음 제목)"""
+        spec = bucket_spec(key)
+        previous = bucket_spec(next(reversed(self.sections))) if self.sections else None
+        frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+
+        has_header = bool(spec.group) and (previous is None or previous.group != spec.group)
+        if previous is not None:
+            separator = ctk.CTkFrame(frame, height=1, fg_color="gray30")
+            separator.pack(fill="x", pady=(12, 8) if has_header else (10, 6))
+        if has_header:
+            group_label = ctk.CTkLabel(
+                frame,
+                text=spec.group,
+                font=ctk.CTkFont(family="Inter", size=16, weight="bold"),
+                anchor="w"
+            )
+            group_label.pack(fill="x", pady=(0, 6))
+
+        section = self._create_usage_section(frame, spec.title, window_for(key))
+        if key in self._history:
+            section.sparkline.load(self._history.pop(key))
+        section.frame = frame
+        section.has_header = has_header
+        self.sections[key] = section
+        return section
+
+    def _create_usage_section(self, parent, title: str, window: float) -> _Section:
         """사용량 섹션 생성"""
         section = ctk.CTkFrame(parent, fg_color="transparent")
         section.pack(fill="x", pady=(4, 4))
@@ -193,25 +233,47 @@ class DashboardWindow(ctk.CTk):
         )
         reset_label.pack(anchor="w")
 
-        # 오른쪽: 퍼센트
+        # 오른쪽: 퍼센트 + 소진 예측
+        right = ctk.CTkFrame(top, fg_color="transparent")
+        right.pack(side="right")
+
         percent_label = ctk.CTkLabel(
-            top,
+            right,
             text="0%",
             font=ctk.CTkFont(family="Inter", size=12),
             text_color="gray",
             anchor="e"
         )
-        percent_label.pack(side="right")
+        percent_label.pack(anchor="e")
 
-        # 진행률 바
-        progress = ctk.CTkProgressBar(section, height=8, corner_radius=4)
-        progress.pack(fill="x", pady=(4, 0))
+        forecast_label = ctk.CTkLabel(
+            right,
+            text="",
+            font=ctk.CTkFont(family="Inter", size=10),
+            text_color="gray",
+            anchor="e"
+        )
+        forecast_label.pack(anchor="e")
+
+        # 진행률 바 + 추세 그래프
+        bar_row = ctk.CTkFrame(section, fg_color="transparent")
+        bar_row.pack(fill="x", pady=(4, 0))
+
+        sparkline = Sparkline(bar_row, window, bg=self._apply_appearance_mode(self.cget("fg_color")))
+        sparkline.canvas.pack(side="right", padx=(8, 0))
+
+        progress = ctk.CTkProgressBar(bar_row, height=8, corner_radius=4)
+        progress.pack(side="left", fill="x", expand=True)
         progress.set(0)
 
         # 참조 저장
-        setattr(self, f"{key}_reset_label", reset_label)
-        setattr(self, f"{key}_percent_label", percent_label)
-        setattr(self, f"{key}_progress", progress)
+        widgets = _Section()
+        widgets.reset_label = reset_label
+        widgets.percent_label = percent_label
+        widgets.forecast_label = forecast_label
+        widgets.progress = progress
+        widgets.sparkline = sparkline
+        return widgets
 
     # ── 뷰 토글 ──
 
@@ -225,24 +287,22 @@ class DashboardWindow(ctk.CTk):
         """현재 뷰 모드에 따라 섹션 표시/숨기기 + 크기 조절"""
         mode = self.view_mode
 
-        # 섹션 표시/숨기기
-        if mode == VIEW_MIN:
-            self.weekly_all_frame.pack_forget()
-            self.weekly_sonnet_frame.pack_forget()
-        elif mode == VIEW_MID:
-            self.weekly_sonnet_frame.pack_forget()
-            # weekly_all이 빠져있으면 다시 추가
-            self.weekly_all_frame.pack(fill="x", after=self.session_frame)
-        else:  # VIEW_MAX
-            self.weekly_all_frame.pack(fill="x", after=self.session_frame)
-            self.weekly_sonnet_frame.pack(fill="x", after=self.weekly_all_frame)
+        # 섹션 표시/숨기기 (순서 유지를 위해 다시 pack)
+        count = VIEW_SECTIONS[mode]
+        visible = list(self.sections.values())[:count]
+        for section in self.sections.values():
+            section.frame.pack_forget()
+        for section in visible:
+            section.frame.pack(fill="x")
 
         # 버튼 텍스트 업데이트
         self.view_button.configure(text=VIEW_LABELS[mode])
 
         # 창 크기 조절
-        w, h = VIEW_SIZES[mode]
-        self.geometry(f"{w}x{h}")
+        height = BASE_HEIGHT + sum(
+            SECTION_HEIGHT + (GROUP_HEADER_HEIGHT if section.has_header else 0) for section in visible
+        )
+        self.geometry(f"{WINDOW_WIDTH}x{height}")
 
     # ── 항상 위 고정 ──
 
@@ -271,87 +331,143 @@ class DashboardWindow(ctk.CTk):
 
     # ── 데이터 업데이트 ──
 
-    def update_usage_data(self, data: UsageData):
+    def update_usage_data(self, data: UsageData, forecasts: Optional[Dict[str, Forecast]] = None):
         """사용량 데이터 업데이트"""
         self.usage_data = data
-
-        self._update_section(
-            "current_session",
-            data.current_session_usage,
-            data.current_session_limit,
-            data.current_session_reset
-        )
-        self._update_section(
-            "weekly_all",
-            data.weekly_all_usage,
-            data.weekly_all_limit,
-            data.weekly_all_reset
-        )
-        self._update_section(
-            "weekly_sonnet",
-            data.weekly_sonnet_usage,
-            data.weekly_sonnet_limit,
-            data.weekly_sonnet_reset
-        )
-
-        if data.last_updated:
-            self.status_label.configure(
+        if forecasts is not None:
+            self.forecasts = forecasts
+
+        new_keys = [key for key in data.buckets if key not in self.sections]
+        for key in new_keys:
+            self._add_section(key)
+        if new_keys:
+            self._apply_view()
+
+        for key, bucket in data.buckets.items():
+            self._update_section(key, bucket.percent)
+        if data.last_updated and not data.stale:
+            timestamp = data.last_updated.timestamp()
+            for key, bucket in data.buckets.items():
+                self.sections[key].sparkline.append(timestamp, bucket.percent)
+        self._update_countdowns()
+
+        if data.last_updated and data.stale:
+            # 디스크 캐시에서 복원한 값 - 실시간 조회 전까지 구분 표시
+            self._configure(
+                self.status_label,
+                text=f"Cached: {data.last_updated.strftime('%m/%d %H:%M')} (updating...)",
+                text_color="orange"
+            )
+        elif data.last_updated:
+            self._configure(
+                self.status_label,
                 text=f"Last updated: {data.last_updated.strftime('%H:%M:%S')}",
                 text_color="gray"
             )
 
-    def _update_section(self, key: str, usage: int, limit: int, reset_time: Optional[datetime]):
-        """섹션 업데이트"""
-        percent = (usage / limit * 100) if limit > 0 else 0
-
-        reset_label = getattr(self, f"{key}_reset_label")
-        percent_label = getattr(self, f"{key}_percent_label")
-        progress = getattr(self, f"{key}_progress")
-
-        if reset_time:
-            reset_label.configure(text=self._format_reset_time(reset_time))
-        else:
-            reset_label.configure(text="")
+    def load_history(self, series: Dict[str, List[Point]]):
+        """기록에서 읽어 다운샘플링한 추세 (구간 섹션이 아직 없으면 생길 때 표시)"""
+        for key, points in series.items():
+            section = self.sections.get(key)
+            if section:
+                section.sparkline.load(points)
+            else:
+                self._history[key] = points
+
+    # ── 로컬 갱신 ──
+
+    def _tick(self):
+        """재설정까지 남은 시간 / 예측 문구를 로컬 시계로 갱신"""
+        self._update_countdowns()
+        self._update_event()
+        self.after(TICK_MS, self._tick)
+
+    def _update_event(self):
+        """새 로그 이벤트가 있을 때만 상태바 아래 줄 갱신"""
+        if RING.version == self._ring_version:
+            return
+        self._ring_version = RING.version
+        event = RING.latest(logging.INFO)
+        if event is None:
+            return
+        message = event.message.splitlines()[0] if event.message else ""
+        if len(message) > EVENT_MAX_CHARS:
+            message = message[:EVENT_MAX_CHARS - 1] + "…"
+        self._configure(
+            self.event_label,
+            text=f"{datetime.fromtimestamp(event.created).strftime('%H:%M:%S')} {message}",
+            text_color="orange" if event.level >= logging.WARNING else "gray50"
+        )
 
-        percent_label.configure(text=f"{int(percent)}%")
+    def _update_countdowns(self):
+        """시간에 따라 바뀌는 문구만 다시 계산 (값이 같으면 configure 생략)"""
+        data = self.usage_data
+        if data is None:
+            return
+        for key, section in self.sections.items():
+            reset_time = data.get(key).reset
+            self._configure(section.reset_label, text=self._format_reset_time(reset_time) if reset_time else "")
+
+            forecast = self.forecasts.get(key)
+            forecast_label = section.forecast_label
+            if forecast:
+                self._configure(
+                    forecast_label,
+                    text=forecast.describe(),
+                    text_color="#f87171" if forecast.hits_before_reset else "gray"
+                )
+            else:
+                self._configure(forecast_label, text="")
+
+    def _configure(self, widget, **options):
+        """바뀐 옵션만 configure (dirty tracking)"""
+        applied = self._applied.setdefault(str(widget), {})
+        changed = {k: v for k, v in options.items() if applied.get(k) != v}
+        if changed:
+            widget.configure(**changed)
+            applied.update(changed)
+
+    def _set_progress(self, progress, value: float):
+        """진행률 값이 바뀐 경우에만 set"""
+        applied = self._applied.setdefault(str(progress), {})
+        if applied.get("value") != value:
+            progress.set(value)
+            applied["value"] = value
+
+    def _update_section(self, key: str, percent: float):
+        """섹션 업데이트 (재설정 문구는 _update_countdowns 에서)"""
+        section = self.sections[key]
+        percent_label = section.percent_label
+        progress = section.progress
+
+        self._configure(percent_label, text=f"{int(percent)}%")
 
         # 색상 변화: 낮음=초록, 중간=노랑, 높음=빨강
         if percent < 60:
-            progress.configure(progress_color="#4ade80")
+            self._configure(progress, progress_color="#4ade80")
         elif percent < 80:
-            progress.configure(progress_color="#facc15")
+            self._configure(progress, progress_color="#facc15")
         else:
-            progress.configure(progress_color="#f87171")
+            self._configure(progress, progress_color="#f87171")
 
-        progress.set(percent / 100)
+        self._set_progress(progress, percent / 100)
 
     def _format_reset_time(self, reset_time: datetime) -> str:
         """재설정 시간 포맷팅"""
-        if reset_time.tzinfo is not None:
-            from datetime import timezone
-            now = datetime.now(timezone.utc)
-        else:
-            now = datetime.now()
-
-        reset_naive = reset_time.replace(tzinfo=None) if reset_time.tzinfo else reset_time
-        now_naive = now.replace(tzinfo=None) if now.tzinfo else now
-        diff = reset_naive - now_naive
-
-        if diff.total_seconds() < 0:
-            return "Pending reset"
-        elif diff.total_seconds() < 3600:
-            minutes = int(diff.total_seconds() / 60)
-            return f"Resets in {minutes}m"
-        elif diff.total_seconds() < 86400:
-            hours = int(diff.total_seconds() / 3600)
-            minutes = int((diff.total_seconds() % 3600) / 60)
-            return f"Resets in {hours}h {minutes}m"
-        else:
-            weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-            weekday = weekdays[reset_naive.weekday()]
-            time_str = reset_naive.strftime("%I:%M %p")
-            return f"Resets {weekday} {time_str}"
+        return format_reset_time(reset_time)
+
+    def show_stale(self, message: str):
+        """조회 실패 - 마지막 정상 값은 그대로 두고 오래된 값임을 표시"""
+        data = self.usage_data
+        if data is None or data.last_updated is None:
+            self.show_error(message)
+            return
+        self._configure(
+            self.status_label,
+            text=f"Stale since {data.last_updated.strftime('%H:%M:%S')} · {message}",
+            text_color="orange"
+        )
 
     def show_error(self, message: str):
         """에러 메시지 표시"""
-        self.status_label.configure(text=f"Error: {message}", text_color="red")
+        self._configure(self.status_label, text=f"Error: {message}", text_color="red")
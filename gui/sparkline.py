@@ -0,0 +1,143 @@
+"""구간별 추세 그래프 (Canvas 하나 + LTTB 다운샘플링)
+
+기록 읽기와 다운샘플링(build_series)은 조회 스레드에서 하고, Tk 스레드는 그리기만 한다.
+새 샘플은 선분 하나를 추가하고 기존 선을 왼쪽으로 옮기기만 하며 (O(1)),
+REBUILD_EVERY 개마다 한 번 창 밖 샘플을 버리고 다시 다운샘플링해 점 수를 MAX_POINTS 로 유지한다.
+"""
+import tkinter as tk
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+SPARK_WIDTH = 96
+SPARK_HEIGHT = 22
+MAX_POINTS = SPARK_WIDTH * 2   # 기록이 아무리 길어도 그래프 하나의 점 수 상한
+REBUILD_EVERY = 32             # 이만큼 선분을 추가하면 다시 다운샘플링
+
+SESSION_WINDOW = 5 * 60 * 60       # 세션 구간: 최근 5시간
+WEEKLY_WINDOW = 7 * 24 * 60 * 60   # 주간 구간: 최근 7일
+LONGEST_WINDOW = WEEKLY_WINDOW
+
+LINE_COLOR = "#60a5fa"
+BASELINE_COLOR = "gray30"
+
+Point = Tuple[float, float]  # (epoch, 사용률 %)
+
+
+def window_for(key: str) -> float:
+    """구간이 보여줄 기간 (초)"""
+    return SESSION_WINDOW if key.startswith(('current_session', 'session_')) else WEEKLY_WINDOW
+
+
+def lttb(points: Sequence[Point], threshold: int) -> List[Point]:
+    """Largest-Triangle-Three-Buckets - 모양을 유지하며 threshold 개로 줄임 (시간순 입력)"""
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # 다음 버킷 평균점
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        count = avg_end - avg_start
+        avg_x = avg_y = 0.0
+        for x, y in points[avg_start:avg_end]:
+            avg_x += x
+            avg_y += y
+        avg_x /= count
+        avg_y /= count
+
+        # 현재 버킷에서 (직전 선택점, 다음 평균점) 과 만드는 삼각형이 가장 큰 점
+        ax, ay = points[a]
+        best, best_area = int(i * every) + 1, -1.0
+        for j in range(best, int((i + 1) * every) + 1):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def build_series(samples: Iterable, now: float) -> Dict[str, List[Point]]:
+    """기록 샘플 → 구간별 다운샘플링된 점 (조회 스레드에서 호출)"""
+    series: Dict[str, List[Point]] = {}
+    for sample in samples:
+        for key, (percent, _) in sample.buckets.items():
+            if sample.timestamp >= now - window_for(key):
+                series.setdefault(key, []).append((sample.timestamp, percent))
+    return {key: lttb(points, MAX_POINTS) for key, points in series.items()}
+
+
+class Sparkline:
+    """구간 하나의 추세 그래프 (오른쪽 끝 = 마지막 샘플, 세로축 0–100%)"""
+
+    def __init__(self, parent, window: float, bg: str,
+                 width: int = SPARK_WIDTH, height: int = SPARK_HEIGHT):
+        self.window = window
+        self.width = width
+        self.height = height
+        self.canvas = tk.Canvas(parent, width=width, height=height, bg=bg,
+                                highlightthickness=0, borderwidth=0)
+        self.canvas.create_line(0, height - 1, width, height - 1, fill=BASELINE_COLOR)
+        self.points: List[Point] = []
+        self._right: Optional[float] = None  # 오른쪽 끝 x 에 해당하는 시각
+        self._added = 0                      # 마지막 재구성 이후 추가한 선분 수
+
+    def _x(self, t: float) -> float:
+        return self.width - 1 - (self._right - t) * self.width / self.window
+
+    def _y(self, percent: float) -> float:
+        return self.height - 2 - min(max(percent, 0.0), 100.0) * (self.height - 3) / 100
+
+    def load(self, points: Sequence[Point]):
+        """기록에서 읽은 점으로 다시 그림 (그 사이 추가된 실시간 점은 유지)"""
+        merged = list(points)
+        if merged:
+            merged.extend(p for p in self.points if p[0] > merged[-1][0])
+        else:
+            merged = self.points
+        self.points = merged
+        self._rebuild()
+
+    def append(self, t: float, percent: float):
+        """새 샘플 하나 (선분 하나 추가 + 기존 선 이동)"""
+        points = self.points
+        if points and t <= points[-1][0]:
+            return
+        points.append((t, percent))
+        if len(points) == 1:
+            self._right = t
+            return
+        if t > self._right:
+            self.canvas.move('series', -(t - self._right) * self.width / self.window, 0)
+            self._right = t
+        pt, pp = points[-2]
+        self.canvas.create_line(self._x(pt), self._y(pp), self._x(t), self._y(percent),
+                                fill=LINE_COLOR, tags='series')
+        self._added += 1
+        if self._added >= REBUILD_EVERY:
+            self._rebuild()
+
+    def _rebuild(self):
+        """창 밖 점 정리 + 다운샘플링 + 선 하나로 다시 그림"""
+        self._added = 0
+        self.canvas.delete('series')
+        points = self.points
+        if not points:
+            return
+        self._right = points[-1][0]
+        start = self._right - self.window
+        first = next((i for i, p in enumerate(points) if p[0] >= start), len(points))
+        points = lttb(points[max(first - 1, 0):], MAX_POINTS)  # 왼쪽 끝이 이어지도록 창 밖 한 점 유지
+        self.points = points
+        if len(points) < 2:
+            return
+        coords = []
+        for t, percent in points:
+            coords.append(self._x(t))
+            coords.append(self._y(percent))
+        self.canvas.create_line(*coords, fill=LINE_COLOR, tags='series')
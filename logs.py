@@ -0,0 +1,99 @@
+"""로깅 설정 - 모듈 로거 + 큐 핸들러 + 최근 이벤트 링 버퍼
+
+각 모듈은 logging.getLogger(__name__) 만 쓴다. setup_logging() 이 루트 로거에
+QueueHandler 하나를 달고, 실제 출력(콘솔 / 파일)과 링 버퍼 기록은 리스너 스레드가 한다.
+조회 스레드는 큐에 넣기만 하므로 stdout 이 느려도 막히지 않는다.
+비활성 레벨(기본 DEBUG)의 호출은 isEnabledFor 확인 후 바로 반환된다.
+"""
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from typing import List, NamedTuple, Optional
+
+
+RING_SIZE = 200
+CONSOLE_FORMAT = "%(asctime)s %(levelname)-7s %(message)s"
+FILE_FORMAT = "%(asctime)s %(levelname)-7s %(name)s [%(threadName)s] %(message)s"
+DATE_FORMAT = "%H:%M:%S"
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+class LogEvent(NamedTuple):
+    created: float
+    level: int
+    name: str
+    message: str
+
+
+class RingBufferHandler(logging.Handler):
+    """최근 이벤트 N개를 메모리에 보관 (대시보드 상태 표시줄용)"""
+
+    def __init__(self, capacity: int = RING_SIZE, level: int = logging.INFO):
+        super().__init__(level)
+        self.events = collections.deque(maxlen=capacity)
+        self.version = 0  # 새 이벤트마다 증가 (읽는 쪽은 값이 바뀐 경우만 다시 그림)
+        self._events_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord):
+        event = LogEvent(record.created, record.levelno, record.name, record.getMessage())
+        with self._events_lock:
+            self.events.append(event)
+            self.version += 1
+
+    def recent(self, count: int = RING_SIZE, min_level: int = logging.NOTSET) -> List[LogEvent]:
+        with self._events_lock:
+            events = [e for e in self.events if e.level >= min_level]
+        return events[-count:]
+
+    def latest(self, min_level: int = logging.NOTSET) -> Optional[LogEvent]:
+        with self._events_lock:
+            for event in reversed(self.events):
+                if event.level >= min_level:
+                    return event
+        return None
+
+
+RING = RingBufferHandler()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: str = "INFO", stream=None, log_file: Optional[str] = None):
+    """루트 로거 구성 (프로세스마다 한 번, 다시 부르면 교체)"""
+    global _listener
+    shutdown_logging()
+
+    console = logging.StreamHandler(stream or sys.stdout)
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT, DATE_FORMAT))
+    handlers = [console, RING]
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=1024 * 1024, backupCount=3, encoding='utf-8'
+        )
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        handlers.append(file_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """큐에 남은 기록을 모두 출력하고 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -1,4 +1,7 @@
 """Oh-my-claudeusage - Claude 사용량 대시보드"""
+import time
+_T0 = time.perf_counter()
+
 import sys
 import io
 
@@ -7,48 +10,161 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', line_buffering=True)
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', line_buffering=True)
 
-# 출력 즉시 플러시
-import functools
-_original_print = print
-print = functools.partial(_original_print, flush=True)
-
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
 import subprocess
 import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-from gui.dashboard import DashboardWindow
-from gui.login import LoginWindow
+from diagnostics import PROFILE_DIR, PROFILE_EVERY, Profiler, StartupTrace
+from logs import LEVELS, setup_logging
+from scraper.alerts import ALERTS_FILE, AlertEngine
 from scraper.auth import ClaudeAuth
-from scraper.usage_playwright import ClaudeUsageScraperPlaywright
+from scraper.browser_manager import BROWSERS
+from scraper.browser_profile import PROFILE_MODES, BrowserProfile
+from scraper import metrics
+from scraper.forecast import UsageForecaster
+from scraper.history import UsageHistory
+from scraper.leader import FOLLOW_INTERVAL, Leadership
+from scraper.retry import AUTH_FAILURE_LIMIT, FetchPolicy
+from scraper.scheduler import AdaptiveScheduler
+from scraper.snapshot_cache import SnapshotCache, session_fingerprint
+from gui.channel import UiChannel
+from scraper.usage_async import AsyncClaudeUsageScraper
+from scraper.usage_playwright import UsageData
+
+logger = logging.getLogger(__name__)
+
+POLL_DEADLINE = 60.0  # 한 번의 조회(조직 + 사용량 + 폴백 포함) 제한 시간 (초)
 
 
 class App:
     """메인 애플리케이션"""
 
-    def __init__(self):
-        self.auth = ClaudeAuth()
+    def __init__(self, trace: Optional[StartupTrace] = None, profile: Optional[BrowserProfile] = None,
+                 alerts: Optional[AlertEngine] = None, profiler: Optional[Profiler] = None):
+        self.auth = ClaudeAuth(profile=profile)
         self.dashboard = None
+        self.headless = False  # 데몬 모드 (Tk 없음)
+        self.hub = None  # 로컬 API 스냅샷 배포 (데몬 / --serve)
+        self.api_server = None
         self.scraper = None  # 브라우저 인스턴스 유지
+        self.cache = None  # 웜 스타트 스냅샷 캐시
+        self.trace = trace or StartupTrace()
+        self.profiler = profiler or Profiler()  # --profile (꺼져 있으면 no-op)
         self._stop_event = threading.Event()
-        self.update_interval = 1 * 60 * 1000  # 1분 (밀리초)
+        self.ui = UiChannel()  # 조회 스레드 → Tk 메인 스레드
+        self._loop = None  # 조회 스레드의 asyncio 루프
+        self._task = None
+        self.update_interval = 1 * 60 * 1000  # 기본 1분 (밀리초) - 실제 간격은 스케줄러가 조정
+        self.scheduler = AdaptiveScheduler(base_interval=self.update_interval / 1000)
+        self.policy = FetchPolicy()  # 실패 시 백오프 / 회로 차단
+        self.history = UsageHistory()
+        self.forecaster = UsageForecaster()
+        self.forecasts = {}
+        self.last_usage = None
+        self.leadership = Leadership()  # 여러 인스턴스 중 조회는 리더 하나만
+        self.alerts = alerts  # 임계값 알림 (설정 파일이 없으면 None)
+        self._monitor_thread = None
+
+    def run(self, api: Optional[Tuple[Optional[int], Optional[str]]] = None):
+        """애플리케이션 실행 (api: 대시보드와 함께 켤 로컬 API (port, socket_path))"""
+        # 저장된 세션 확인 (Playwright 사용 안함 - 파일만 체크)
+        has_session = bool(self.auth.load_session() and self.auth.get_cookies())
+        self.trace.mark("session loaded")
+        if api:
+            self.start_api(*api)
+
+        # 세션이 있으면 Tk 창 생성과 병렬로 백엔드 부팅 + 첫 조회
+        if has_session:
+            logger.info("✓ 저장된 세션을 찾았습니다.")
+            self._start_scraper_thread()
 
-    def run(self):
-        """애플리케이션 실행"""
         # 대시보드 생성
+        from gui.dashboard import DashboardWindow
+        self.trace.mark("gui imported")
         self.dashboard = DashboardWindow()
+        self.trace.mark("dashboard created")
+        self.ui.attach(self.dashboard)
+        self.profiler.attach(self.dashboard)
+        self.dashboard.after(0, lambda: self.trace.mark("first paint"))
 
-        # 저장된 세션 확인 (Playwright 사용 안함 - 파일만 체크)
-        if self.auth.load_session() and self.auth.get_cookies():
-            print("✓ 저장된 세션을 찾았습니다.")
+        if has_session:
+            self._show_cached_usage()
             self.start_monitoring()
         else:
-            print("로그인이 필요합니다.")
+            logger.info("로그인이 필요합니다.")
             self.show_login()
 
         # 메인 루프 시작
         self.dashboard.mainloop()
 
+    def _show_cached_usage(self):
+        """디스크 캐시의 마지막 사용량을 즉시 표시 (stale 표시)"""
+        if self.dashboard.usage_data:
+            return  # 이미 실시간 데이터가 도착함
+        usage_data = self._load_cached_usage()
+        if usage_data:
+            self.dashboard.update_usage_data(usage_data)
+            self.trace.mark("cached paint")
+
+    def _load_cached_usage(self) -> Optional[UsageData]:
+        """디스크 캐시의 마지막 사용량 (stale 표시)"""
+        cached = self._get_cache().load_usage()
+        if not cached:
+            return None
+        try:
+            usage_data = UsageData.from_dict(cached)
+        except (TypeError, ValueError) as e:
+            logger.warning("캐시 복원 실패: %s", e)
+            return None
+        usage_data.stale = True
+        return usage_data
+
+    def _get_cache(self) -> SnapshotCache:
+        """현재 세션 기준 스냅샷 캐시"""
+        fingerprint = session_fingerprint(self.auth.get_cookies())
+        if not self.cache or self.cache.session != fingerprint:
+            self.cache = SnapshotCache(session=fingerprint)
+        return self.cache
+
+    def start_api(self, port: Optional[int], socket_path: Optional[str] = None):
+        """로컬 API 서버 시작 (/usage, /events, /health, /metrics)"""
+        from daemon import ApiServer, SnapshotHub
+
+        self.hub = SnapshotHub()
+        cached = self._load_cached_usage() if self.auth.get_cookies() else None
+        if cached:
+            self.hub.publish_usage(cached, {}, stale=True)
+        self.api_server = ApiServer(self.hub, port, socket_path)
+        self.api_server.start()
+
+    def run_daemon(self, port: Optional[int], socket_path: Optional[str] = None):
+        """헤드리스 데몬 실행 (Tk 없이 조회 + 로컬 API 제공)"""
+        self.headless = True
+        if not (self.auth.load_session() and self.auth.get_cookies()):
+            logger.error("저장된 세션이 없습니다. 먼저 `python main.py` 로 로그인하세요.")
+            return
+
+        self.start_api(port, socket_path)
+        self._start_scraper_thread()
+        try:
+            # 짧게 나눠 대기해야 Ctrl+C 가 바로 처리됨
+            while not self._stop_event.wait(1):
+                pass
+        except KeyboardInterrupt:
+            logger.info("데몬 종료")
+        finally:
+            self.stop()
+
     def show_login(self):
         """로그인 창 표시"""
+        from gui.login import LoginWindow
         LoginWindow(self.dashboard, self.on_login)
 
     def on_login(self) -> bool:
@@ -56,11 +172,11 @@ class App:
         success = self.auth.login_with_browser_manual()
 
         if success:
-            print("✓ Login successful")
-            self.dashboard.after(0, self.start_monitoring)
+            logger.info("✓ Login successful")
+            self._post(self.start_monitoring)
             return True
         else:
-            print("✗ 로그인 실패")
+            logger.warning("✗ 로그인 실패")
             return False
 
     def start_monitoring(self):
@@ -74,81 +190,428 @@ class App:
         self.dashboard.lift()
         self.dashboard.focus_force()
 
-        # 전용 백그라운드 스레드에서 Playwright 실행 (스레드 바인딩 유지)
-        if not self.scraper:
-            self.scraper = ClaudeUsageScraperPlaywright(cookies)
-            thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-            thread.start()
+        self._start_scraper_thread()
+
+    def _start_scraper_thread(self):
+        """전용 스레드에서 asyncio 조회 엔진 실행"""
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.scraper = AsyncClaudeUsageScraper(
+            self.auth.get_cookies(), on_cookies_updated=self.auth.save_session,
+            cache=self._get_cache(), profile=self.auth.profile
+        )
+        self._monitor_thread = threading.Thread(target=self._monitoring_loop, name="monitor", daemon=True)
+        self._monitor_thread.start()
+
+    def stop(self):
+        """조회 중지 (어느 스레드에서든, 여러 번 호출해도 안전)"""
+        self._stop_event.set()
+        loop, task = self._loop, self._task
+        if loop and task:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # 이벤트 루프가 이미 닫힘
+        thread = self._monitor_thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=10)
+        if self.api_server:
+            self.api_server.stop()
+            self.api_server = None
+        if self.alerts:
+            self.alerts.close()
+        self.profiler.stop()
+
+    def _post(self, callback):
+        """Tk 메인 스레드로 콜백 전달 (스레드 안전 채널)"""
+        self.ui.post(callback)
+
+    def _show_usage(self, usage_data, forecasts=None):
+        """사용량 표시 (Tk 메인 스레드)"""
+        with self.profiler.capture("ui"):
+            self.dashboard.update_usage_data(usage_data, forecasts)
+        self.trace.mark("first data")
+        self.trace.report()
+
+    def _publish(self, stale: bool = False, error: Optional[str] = None):
+        """최신 스냅샷 배포 (로컬 API 리더 + 팔로워 인스턴스)"""
+        from daemon import build_snapshot
+
+        snapshot = build_snapshot(self.last_usage, self.forecasts, stale, error)
+        if self.hub:
+            self.hub.publish(snapshot)
+        self.leadership.publish(snapshot)
+
+    def _on_usage(self, usage_data):
+        """새 사용량 배포 (대시보드 / 데몬 리더 / 팔로워)"""
+        self.last_usage = usage_data
+        self._publish()
+        if not self.headless:
+            self._post(lambda d=usage_data, f=self.forecasts: self._show_usage(d, f))
+
+    def _on_error(self, message: str):
+        """조회 실패 배포 (마지막 정상 값은 stale로 유지)"""
+        self._publish(stale=True, error=message)
+        if not self.headless:
+            self._post(lambda m=message: self.dashboard.show_stale(m))
+
+    def _on_snapshot(self, snapshot: Dict):
+        """팔로워: 리더가 게시한 스냅샷 반영 (조회 / 기록 / 캐시 저장 없음)"""
+        from daemon import parse_snapshot
+
+        if self.hub:
+            self.hub.publish(snapshot)
+        try:
+            parsed = parse_snapshot(snapshot)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("스냅샷 해석 실패: %s", e)
+            return
+        if parsed is None:
+            return
+        self.last_usage, self.forecasts = parsed
+        if not self.headless:
+            self._post(lambda d=self.last_usage, f=self.forecasts: self._show_usage(d, f))
+            error = snapshot.get('error')
+            if error:
+                self._post(lambda m=error: self.dashboard.show_stale(m))
+
+    def _failure_message(self, status: Optional[int], delay: float) -> str:
+        """실패 원인 + 다음 시도까지 남은 시간"""
+        if status == 429:
+            reason = "요청 한도 초과"
+        elif status:
+            reason = f"응답 {status}"
+        else:
+            reason = "연결 실패"
+        detail = self.policy.describe()
+        return f"{reason} - {delay:.0f}초 후 재시도" + (f" ({detail})" if detail else "")
+
+    def _on_session_expired(self):
+        """세션 만료 - GUI는 로그인 창, 데몬은 종료"""
+        if self.headless:
+            self._on_error("세션이 만료되었습니다. `python main.py` 로 다시 로그인하세요.")
+            self._stop_event.set()
+        else:
+            self._post(self.show_login)
+
+    def _record_history(self, usage_data):
+        """시계열 기록 (실패해도 조회는 계속)"""
+        try:
+            self.history.append(usage_data)
+        except OSError as e:
+            logger.warning("기록 저장 실패: %s", e)
+
+    def _seed_forecaster(self):
+        """최근 기록으로 예측 모델 초기화 (재시작 직후에도 예측 표시)"""
+        try:
+            self.forecaster.seed(self.history.query(time.time() - 6 * 60 * 60))
+        except OSError as e:
+            logger.warning("기록 읽기 실패: %s", e)
+
+    def _load_sparklines(self):
+        """대시보드 추세 그래프용 기록 (Tk 스레드 밖에서 읽고 다운샘플링)"""
+        from gui.sparkline import LONGEST_WINDOW, build_series
+
+        now = time.time()
+        try:
+            series = build_series(self.history.query(now - LONGEST_WINDOW), now)
+        except OSError as e:
+            logger.warning("기록 읽기 실패: %s", e)
+            return
+        self._post(lambda s=series: self.dashboard.load_history(s))
 
     def _monitoring_loop(self):
-        """전용 스레드에서 Playwright 브라우저 유지 + 주기적 조회"""
+        """전용 스레드에서 조회 코루틴을 공용 브라우저 루프에 실행하고 끝날 때까지 대기"""
+        try:
+            BROWSERS.run(self._monitor())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.exception("모니터링 루프 오류: %s", e)
+
+    async def _monitor(self):
+        """리더면 조회, 아니면 리더의 스냅샷을 따라가다 리더가 사라지면 이어받음 (stop() 시 취소)"""
+        self._task = asyncio.current_task()
+        self._loop = asyncio.get_running_loop()
+        try:
+            if self._stop_event.is_set():
+                return  # 루프 시작 전에 stop() 됨
+            if not self.headless:
+                # 기록 읽기는 백엔드 부팅 / 첫 조회와 병렬로
+                self._loop.run_in_executor(None, self._load_sparklines)
+            if not self.leadership.acquire():
+                logger.info("다른 인스턴스(PID %s)가 조회 중 - 게시된 스냅샷을 표시합니다",
+                            self.leadership.leader_pid() or "?")
+                if not await self._follow():
+                    return
+                logger.info("조회 중이던 인스턴스가 종료되어 조회를 이어받습니다")
+                # 리더가 그동안 갱신해 저장한 쿠키로 시작
+                if self.auth.load_session() and self.auth.get_cookies():
+                    self.scraper.cookies = self.auth.get_cookies()
+            await self._poll()
+        finally:
+            self._loop = None
+            self._task = None
+            self.leadership.release()
+
+    async def _follow(self) -> bool:
+        """팔로워 루프 (Chromium 없음). 리더 잠금을 얻으면 True, stop() 이면 False"""
+        while not self._stop_event.is_set():
+            snapshot = self.leadership.read_snapshot()
+            if snapshot is not None:
+                self._on_snapshot(snapshot)
+            await asyncio.sleep(FOLLOW_INTERVAL)
+            if self.leadership.acquire():
+                return True
+        return False
+
+    async def _poll(self):
+        """리더: 백엔드 유지 + 주기적 조회"""
+        scraper = self.scraper
         first_fetch = True
         try:
-            self.scraper.start()
+            await scraper.start()
+            self.trace.mark("backend started")
+            self._seed_forecaster()
 
             while not self._stop_event.is_set():
-                print("사용량 데이터 조회 중...")
-                try:
-                    usage_data = self.scraper.fetch_usage_data()
+                with self.profiler.capture("poll"):
+                    logger.debug("사용량 데이터 조회 중...")
+                    try:
+                        usage_data = await asyncio.wait_for(scraper.fetch_usage_data(), POLL_DEADLINE)
+                    except asyncio.TimeoutError:
+                        logger.warning("✗ 사용량 조회 시간 초과 (%.0f초)", POLL_DEADLINE)
+                        usage_data = None
+                    except Exception as e:
+                        logger.exception("✗ 사용량 조회 오류: %s", e)
+                        usage_data = None
+
+                    if first_fetch:
+                        self.trace.mark("first fetch")
+                    metrics.FETCHES.inc("success" if usage_data else "failure", str(scraper.last_status))
                     if usage_data:
-                        self.dashboard.after(0, lambda d=usage_data: self.dashboard.update_usage_data(d))
-                        print("✓ 사용량 데이터 업데이트 완료")
+                        self.policy.record_success()
+                        self.scheduler.record(usage_data)
+                        self.cache.save_usage(usage_data.to_dict())
+                        self._record_history(usage_data)
+                        self.forecasts = self.forecaster.update(usage_data)
+                        if self.alerts:
+                            self.alerts.evaluate(usage_data, self.forecasts)
+                        self._on_usage(usage_data)
+                        logger.debug("✓ 사용량 데이터 업데이트 완료")
                         first_fetch = False
                     else:
-                        if first_fetch:
+                        self.policy.record_failure(scraper.last_status, scraper.retry_after)
+                        if scraper.last_status in (401, 403) and (
+                                first_fetch or self.policy.auth_failures >= AUTH_FAILURE_LIMIT):
                             # 세션 만료 → 로그인 필요
-                            print("세션이 만료되었습니다. 재로그인 필요.")
-                            self.dashboard.after(0, self.show_login)
+                            logger.warning("세션이 만료되었습니다. 재로그인 필요.")
+                            self._on_session_expired()
                             return
-                        self.dashboard.after(0, lambda: self.dashboard.show_error("사용량 데이터를 가져올 수 없습니다."))
-                        print("✗ 사용량 데이터 조회 실패")
-                except Exception as e:
-                    print(f"✗ 사용량 조회 오류: {e}")
-                    err_msg = str(e)
-                    self.dashboard.after(0, lambda m=err_msg: self.dashboard.show_error(f"오류: {m}"))
-
-                # 1분 대기 (중간에 stop 가능)
-                self._stop_event.wait(self.update_interval / 1000)
+                        logger.warning("✗ 사용량 데이터 조회 실패")
+                if self.profiler.poll_done():
+                    await self._loop.run_in_executor(None, self.profiler.checkpoint)
 
-        except Exception as e:
-            print(f"모니터링 루프 오류: {e}")
-            import traceback
-            traceback.print_exc()
+                # 변화 속도 / 재설정 시각에 따라 대기, 실패 중이면 백오프 (stop() 시 즉시 취소)
+                delay = self.policy.next_delay(self.scheduler.next_delay())
+                if not usage_data:
+                    self._on_error(self._failure_message(scraper.last_status, delay))
+                logger.debug("다음 조회: %.0f초 후", delay)
+                await asyncio.sleep(delay)
         finally:
-            self.scraper.stop()
+            await scraper.stop()
+            if self.scraper is scraper:
+                self.scraper = None  # 재로그인 시 새 엔진으로 다시 시작
+
+
+def _playwright_browsers_dir() -> Optional[Path]:
+    """Playwright 브라우저 설치 경로 (playwright import 없이 계산)"""
+    env = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if env == "0":
+        spec = importlib.util.find_spec("playwright")
+        if not spec or not spec.origin:
+            return None
+        return Path(spec.origin).parent / "driver" / "package" / ".local-browsers"
+    if env:
+        return Path(env)
+    if sys.platform == 'win32':
+        return Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / "ms-playwright"
+    if sys.platform == 'darwin':
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "ms-playwright"
+
+
+def _expected_chromium_dirs() -> List[str]:
+    """현재 playwright 버전이 요구하는 Chromium 디렉터리 이름 (browsers.json 기준)"""
+    spec = importlib.util.find_spec("playwright")
+    if not spec or not spec.origin:
+        return []
+    browsers_json = Path(spec.origin).parent / "driver" / "package" / "browsers.json"
+    try:
+        browsers = json.loads(browsers_json.read_text(encoding='utf-8'))["browsers"]
+    except (OSError, ValueError, KeyError):
+        return []
+    return [
+        f"{b['name'].replace('-', '_')}-{b['revision']}"
+        for b in browsers
+        if b.get('name') in ("chromium", "chromium-headless-shell")
+    ]
+
+
+def is_chromium_installed() -> bool:
+    """Chromium 설치 여부를 파일시스템만으로 확인 (브라우저 실행 없음)"""
+    browsers_dir = _playwright_browsers_dir()
+    if not browsers_dir or not browsers_dir.is_dir():
+        return False
+
+    expected = _expected_chromium_dirs()
+    if expected:
+        return all((browsers_dir / name / "INSTALLATION_COMPLETE").exists() for name in expected)
+    # browsers.json을 못 읽으면 아무 버전이든 설치 완료된 chromium이 있는지 확인
+    return any((d / "INSTALLATION_COMPLETE").exists() for d in browsers_dir.glob("chromium-*"))
 
 
 def ensure_playwright_chromium():
     """Playwright Chromium 브라우저가 없으면 자동 설치"""
+    if is_chromium_installed():
+        return
+    logger.info("Chromium 브라우저를 설치합니다...")
+    subprocess.run(
+        [sys.executable, "-m", "playwright", "install", "chromium"],
+        check=True,
+    )
+    logger.info("✓ Chromium 설치 완료")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Oh-my-claudeusage - Claude 사용량 대시보드")
+    parser.add_argument("--startup-trace", action="store_true",
+                        help="시작 단계별 소요 시간(time-to-first-data) 출력")
+    parser.add_argument("--once", action="store_true",
+                        help="GUI 없이 한 번 조회하고 종료")
+    parser.add_argument("--json", action="store_true",
+                        help="결과를 JSON으로 출력 (--once / --watch 와 함께, 단독 사용 시 --once)")
+    parser.add_argument("--watch", action="store_true",
+                        help="GUI 없이 계속 조회하며 값이 바뀔 때마다 한 줄 출력")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Tk 없이 조회만 하고 로컬 API로 스냅샷 제공")
+    parser.add_argument("--serve", action="store_true",
+                        help="대시보드와 함께 로컬 API(/usage, /metrics 등) 제공")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="데몬 / --serve HTTP 포트 (127.0.0.1, 0이면 자동, -1이면 사용 안 함)")
+    parser.add_argument("--socket", metavar="PATH", nargs="?", const="",
+                        help="데몬 / --serve Unix 소켓 사용 (경로 생략 시 기본 경로, Windows 제외)")
+    parser.add_argument("--browser-profile", choices=PROFILE_MODES, default="off",
+                        help="브라우저 상태 유지 방식 (storage: 쿠키/스토리지 파일, "
+                             "persistent: 전용 사용자 데이터 디렉터리)")
+    parser.add_argument("--fleet", metavar="DIR", nargs="?", const="config/sessions",
+                        help="여러 계정 감시 (DIR/*.json 세션마다 한 계정, 기본 config/sessions) - "
+                             "Tk 없이 로컬 API로 계정별 스냅샷 + 요약 제공")
+    parser.add_argument("--fleet-login", metavar="NAME",
+                        help="브라우저 로그인으로 fleet 계정 추가 (config/sessions/NAME.json)")
+    parser.add_argument("--fleet-contexts", type=int, default=2, metavar="N",
+                        help="fleet 공유 브라우저에서 동시에 여는 컨텍스트 수 (기본 2)")
+    parser.add_argument("--export", metavar="FILE",
+                        help="사용량 기록 내보내기 (CSV / JSON Lines / Parquet / Arrow, '-' 면 stdout) 후 종료")
+    parser.add_argument("--export-format", choices=("csv", "jsonl", "parquet", "arrow"),
+                        help="내보내기 형식 (기본: 파일 확장자로 판단, 모르면 csv)")
+    parser.add_argument("--since", metavar="TIME",
+                        help="--export 시작 시각 (ISO-8601 또는 30d / 12h 같은 기간)")
+    parser.add_argument("--until", metavar="TIME", help="--export 끝 시각 (기본: 지금)")
+    parser.add_argument("--buckets", metavar="NAMES",
+                        help="--export 할 구간 (쉼표 구분, 예: current_session,weekly_all)")
+    parser.add_argument("--export-resume", action="store_true",
+                        help="지난번 내보낸 이후 기록만 이어서 내보내기 (FILE.cursor 에 위치 저장)")
+    parser.add_argument("--export-account", metavar="NAME",
+                        help="fleet 계정 기록 내보내기 (config/fleet/NAME)")
+    parser.add_argument("--alerts", metavar="FILE", default=str(ALERTS_FILE),
+                        help="알림 규칙 / 싱크 설정 파일 (기본 config/alerts.json, 없으면 알림 끔)")
+    parser.add_argument("--profile", metavar="DIR", nargs="?", const=str(PROFILE_DIR),
+                        help="조회 루프 / Tk 콜백 cProfile, 메모리 증가, Tk 이벤트 루프 지연 기록 "
+                             "(기본 config/profile, 최근 실행 5개 보관)")
+    parser.add_argument("--profile-every", type=int, default=PROFILE_EVERY, metavar="N",
+                        help=f"--profile 결과를 N회 조회마다 기록 (기본 {PROFILE_EVERY})")
+    parser.add_argument("--log-level", choices=LEVELS, default="INFO",
+                        help="로그 레벨 (DEBUG 면 조회마다 상세 출력)")
+    parser.add_argument("--log-file", metavar="PATH",
+                        help="로그를 파일에도 기록 (1MB 단위로 3개까지 순환)")
+    return parser.parse_args(argv)
+
+
+def _load_alerts(path: str) -> Optional[AlertEngine]:
+    """알림 설정 로드 (설정이 잘못됐으면 오류 로그 후 종료)"""
     try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            p.chromium.launch(headless=True).close()
-    except Exception:
-        print("Chromium 브라우저를 설치합니다...")
-        subprocess.run(
-            [sys.executable, "-m", "playwright", "install", "chromium"],
-            check=True,
-        )
-        print("✓ Chromium 설치 완료")
+        return AlertEngine.load(Path(path))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.error("알림 설정을 읽을 수 없습니다 (%s): %s", path, e)
+        sys.exit(1)
+
+
+def _run_fleet(args: argparse.Namespace, alerts: Optional[AlertEngine]) -> int:
+    """--fleet / --fleet-login"""
+    import fleet
+
+    if args.fleet_login:
+        try:
+            return 0 if fleet.login_account(args.fleet_login) else 1
+        except ValueError as e:
+            logger.error("%s", e)
+            return 1
+    from daemon import default_socket_path
+    port = args.port if args.port >= 0 else None
+    socket_path = default_socket_path() if args.socket == "" else args.socket
+    return fleet.run_fleet(Path(args.fleet), args.fleet_contexts, port, socket_path, alerts=alerts)
 
 
 def main():
     """메인 함수"""
+    args = parse_args()
+    if args.export:
+        # 기록 내보내기: Tk / Chromium 없이 파일만 읽음 (로그는 stderr, stdout 은 '-' 출력 전용)
+        setup_logging(args.log_level, stream=sys.stderr, log_file=args.log_file)
+        from export import run_export
+        history_dir = Path("config/fleet") / args.export_account if args.export_account else Path("config")
+        sys.exit(run_export(args.export, args.export_format, args.since, args.until, args.buckets,
+                            resume=args.export_resume, history_dir=history_dir))
+    if args.once or args.watch or args.json:
+        # CLI 모드: Tk / Chromium 확인 없이 바로 조회 (로그는 stderr, 결과는 stdout)
+        setup_logging(args.log_level, stream=sys.stderr, log_file=args.log_file)
+        from cli import run_cli
+        sys.exit(run_cli(watch=args.watch, as_json=args.json, profile=BrowserProfile(args.browser_profile),
+                         alerts=_load_alerts(args.alerts)))
+
+    setup_logging(args.log_level, log_file=args.log_file)
+    trace = StartupTrace(enabled=args.startup_trace, t0=_T0)
+    trace.mark("imports")
+
     ensure_playwright_chromium()
+    trace.mark("chromium check")
+    alerts = None if args.fleet_login else _load_alerts(args.alerts)
+    if args.fleet_login or args.fleet:
+        sys.exit(_run_fleet(args, alerts))
     app = None
     try:
-        app = App()
-        app.run()
+        profiler = Profiler(enabled=bool(args.profile), directory=Path(args.profile or PROFILE_DIR),
+                            every=args.profile_every)
+        profiler.start()
+        app = App(trace=trace, profile=BrowserProfile(args.browser_profile), alerts=alerts, profiler=profiler)
+        port = args.port if args.port >= 0 else None
+        if args.daemon or args.serve:
+            from daemon import default_socket_path
+            socket_path = default_socket_path() if args.socket == "" else args.socket
+        if args.daemon:
+            app.run_daemon(port, socket_path)
+        else:
+            app.run(api=(port, socket_path) if args.serve else None)
     except KeyboardInterrupt:
-        print("\n프로그램 종료")
+        logger.info("프로그램 종료")
     except Exception as e:
-        print(f"오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("오류 발생: %s", e)
     finally:
-        if app and app.scraper:
-            app.scraper.stop()
+        if app:
+            app.stop()
         sys.exit(0)
 
 
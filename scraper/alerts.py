@@ -0,0 +1,350 @@
+"""사용량 알림 - 조회 결과마다 규칙 평가 (히스테리시스 + 중복 억제) 후 싱크로 전달
+
+config/alerts.json 예:
+    {
+      "rules": [
+        {"when": "five_hour >= 80%"},
+        {"when": "weekly_all rising > 10%/h", "clear": 5},
+        {"name": "exhaust", "when": "* exhausts before reset", "notify_resolved": true}
+      ],
+      "sinks": [
+        {"type": "desktop"},
+        {"type": "webhook", "url": "http://127.0.0.1:9000/claude-usage"},
+        {"type": "command", "command": "~/bin/on-claude-alert.sh"}
+      ]
+    }
+
+규칙은 구간 이름으로 색인되고, 샘플마다 값이 바뀐 구간과 알림이 켜져 있는 구간의 규칙만 평가한다.
+전송(데스크톱 알림 / HTTP / 명령 실행)은 별도 스레드에서 하므로 조회 루프를 막지 않는다.
+"""
+import json
+import logging
+import os
+import queue
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from scraper.usage_playwright import Bucket, UsageData, bucket_name
+
+logger = logging.getLogger(__name__)
+
+
+ALERTS_FILE = Path("config/alerts.json")
+
+DEFAULT_COOLDOWN = 15 * 60   # 같은 알림을 다시 보내기까지 최소 간격 (초) - 경계에서 흔들릴 때 중복 방지
+PERCENT_HYSTERESIS = 5.0     # 사용률 규칙: 임계값보다 이만큼 내려가야 해제 (%p)
+RATE_HYSTERESIS = 0.5        # 증가 속도 규칙: 임계값의 이 비율 아래로 내려가야 해제
+SINK_TIMEOUT = 10            # 싱크 하나의 전송 제한 시간 (초)
+
+METRICS = ('percent', 'rate', 'exhausts')
+_OPS = {
+    '>=': lambda a, b: a >= b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '<': lambda a, b: a < b,
+}
+
+_WHEN = re.compile(
+    r'^\s*(?P<bucket>[\w*]+)\s+(?:(?P<metric>percent|rate|rising)\s*)?'
+    r'(?P<op>>=|<=|>|<)\s*(?P<value>\d+(?:\.\d+)?)\s*(?:%/h|%)?\s*$'
+)
+_EXHAUSTS = re.compile(r'^\s*(?P<bucket>[\w*]+)\s+exhausts(?:\s+before\s+reset)?\s*$')
+
+
+class Rule:
+    """임계값 규칙 하나 (bucket '*' = 모든 구간)"""
+
+    __slots__ = ('name', 'bucket', 'metric', 'op', 'value', 'clear', 'cooldown', 'notify_resolved')
+
+    def __init__(self, name: str, bucket: str, metric: str, op: str = '>=', value: float = 1.0,
+                 clear: Optional[float] = None, cooldown: float = DEFAULT_COOLDOWN,
+                 notify_resolved: bool = False):
+        if metric not in METRICS:
+            raise ValueError(f"알 수 없는 지표: {metric}")
+        if op not in _OPS:
+            raise ValueError(f"알 수 없는 비교 연산자: {op}")
+        self.name = name
+        self.bucket = bucket if bucket == '*' else bucket_name(bucket)
+        self.metric = metric
+        self.op = op
+        self.value = float(value)
+        self.clear = float(clear) if clear is not None else self._default_clear()
+        self.cooldown = cooldown
+        self.notify_resolved = notify_resolved
+
+    def _default_clear(self) -> float:
+        rising = self.op in ('>=', '>')
+        if self.metric == 'percent':
+            return self.value - PERCENT_HYSTERESIS if rising else self.value + PERCENT_HYSTERESIS
+        if self.metric == 'rate':
+            return self.value * RATE_HYSTERESIS if rising else self.value / RATE_HYSTERESIS
+        return 0.5  # exhausts: 1 / 0
+
+    def measure(self, bucket: Bucket, forecast) -> Optional[float]:
+        """규칙이 보는 값 (아직 알 수 없으면 None)"""
+        if self.metric == 'percent':
+            return bucket.percent
+        if forecast is None:
+            return None
+        if self.metric == 'rate':
+            return forecast.rate * 3600 if forecast.rate is not None else None
+        return 1.0 if forecast.hits_before_reset else 0.0
+
+    def fires(self, value: float) -> bool:
+        return _OPS[self.op](value, self.value)
+
+    def clears(self, value: float) -> bool:
+        """히스테리시스 경계를 넘어 돌아왔는지"""
+        if self.op in ('>=', '>'):
+            return value < self.clear
+        return value > self.clear
+
+    def describe(self, bucket: str, value: float, forecast=None) -> str:
+        if self.metric == 'exhausts':
+            eta = ""
+            if forecast is not None and forecast.limit_at:
+                from scraper.forecast import format_duration
+                eta = f" (~{format_duration(forecast.limit_at - time.time())})"
+            return f"{bucket} will hit the limit before reset{eta}"
+        unit = "%/h" if self.metric == 'rate' else "%"
+        what = f"{bucket} rising" if self.metric == 'rate' else bucket
+        return f"{what} {value:.0f}{unit} {self.op} {self.value:g}{unit}"
+
+
+def parse_rule(spec: Dict) -> Rule:
+    """설정 dict → Rule ("when" 축약식 또는 bucket / metric / op / value 필드)"""
+    options = {k: spec[k] for k in ('clear', 'cooldown', 'notify_resolved') if k in spec}
+    when = spec.get('when')
+    if when:
+        when = when.replace('≥', '>=').replace('≤', '<=')
+        match = _EXHAUSTS.match(when)
+        if match:
+            return Rule(spec.get('name', when), match['bucket'], 'exhausts', **options)
+        match = _WHEN.match(when)
+        if not match:
+            raise ValueError(f"규칙을 해석할 수 없습니다: {spec['when']!r}")
+        metric = {'rising': 'rate', None: 'percent'}.get(match['metric'], match['metric'])
+        return Rule(spec.get('name', when), match['bucket'], metric, match['op'],
+                    float(match['value']), **options)
+    return Rule(spec.get('name', f"{spec['bucket']} {spec['metric']}"), spec['bucket'], spec['metric'],
+                spec.get('op', '>='), spec.get('value', 1.0), **options)
+
+
+# ── 싱크 ──
+
+class DesktopSink:
+    """OS 데스크톱 알림 (notify-send / osascript / PowerShell 풍선 알림)"""
+
+    TITLE = "Claude usage alert"
+
+    def send(self, alert: Dict):
+        env = None
+        if sys.platform == 'darwin':
+            command = ['osascript', '-e',
+                       f"display notification {json.dumps(alert['message'])} with title {json.dumps(self.TITLE)}"]
+        elif sys.platform == 'win32':
+            # 문자열은 환경 변수로 넘겨 따옴표 처리 문제를 피함
+            env = dict(os.environ, OMC_TITLE=self.TITLE, OMC_MESSAGE=alert['message'])
+            command = ['powershell', '-NoProfile', '-Command',
+                       "Add-Type -AssemblyName System.Windows.Forms;"
+                       "$n = New-Object System.Windows.Forms.NotifyIcon;"
+                       "$n.Icon = [System.Drawing.SystemIcons]::Information; $n.Visible = $true;"
+                       "$n.ShowBalloonTip(10000, $env:OMC_TITLE, $env:OMC_MESSAGE, 'Warning');"
+                       "Start-Sleep -Seconds 5; $n.Dispose()"]
+        else:
+            command = ['notify-send', '--app-name=oh-my-claudeusage', self.TITLE, alert['message']]
+        subprocess.run(command, env=env, timeout=SINK_TIMEOUT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class WebhookSink:
+    """알림 JSON 을 HTTP POST"""
+
+    def __init__(self, url: str, timeout: float = SINK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alert: Dict):
+        request = urllib.request.Request(
+            self.url, data=json.dumps(alert, ensure_ascii=False).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST'
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class CommandSink:
+    """명령 실행 (알림 JSON 은 stdin, 주요 필드는 OMC_ALERT_* 환경 변수)"""
+
+    def __init__(self, command):
+        self.argv = shlex.split(os.path.expanduser(command)) if isinstance(command, str) else list(command)
+
+    def send(self, alert: Dict):
+        env = dict(os.environ)
+        for key in ('rule', 'account', 'bucket', 'state', 'message'):
+            env[f"OMC_ALERT_{key.upper()}"] = str(alert.get(key) or "")
+        env["OMC_ALERT_VALUE"] = f"{alert['value']:g}"
+        subprocess.run(self.argv, input=json.dumps(alert, ensure_ascii=False).encode('utf-8'),
+                       env=env, timeout=SINK_TIMEOUT, check=True)
+
+
+def build_sink(spec: Dict):
+    kind = spec.get('type')
+    if kind == 'desktop':
+        return DesktopSink()
+    if kind == 'webhook':
+        return WebhookSink(spec['url'], spec.get('timeout', SINK_TIMEOUT))
+    if kind == 'command':
+        return CommandSink(spec.get('command') or spec['argv'])
+    raise ValueError(f"알 수 없는 알림 싱크: {kind!r}")
+
+
+# ── 엔진 ──
+
+class _RuleState:
+    __slots__ = ('firing', 'sent_at')
+
+    def __init__(self):
+        self.firing = False
+        self.sent_at = float('-inf')
+
+
+class AlertEngine:
+    """규칙 평가 + 중복 억제 + 비동기 전송"""
+
+    def __init__(self, rules: Iterable[Rule], sinks: Iterable = ()):
+        self.rules = list(rules)
+        self.sinks = list(sinks)
+        self._by_bucket: Dict[str, List[Rule]] = {}
+        self._wildcard: List[Rule] = []
+        for rule in self.rules:
+            if rule.bucket == '*':
+                self._wildcard.append(rule)
+            else:
+                self._by_bucket.setdefault(rule.bucket, []).append(rule)
+        self._last: Dict[str, Dict[str, Bucket]] = {}      # 계정 → 구간 → 마지막 평가 값
+        self._states: Dict[tuple, _RuleState] = {}          # (계정, 규칙, 구간) → 상태
+        self._firing: Dict[str, Dict[str, int]] = {}        # 계정 → 구간 → 켜진 알림 수
+        self._queue: "queue.SimpleQueue[Optional[Dict]]" = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+
+    @classmethod
+    def load(cls, path: Path = ALERTS_FILE) -> Optional["AlertEngine"]:
+        """설정 파일에서 생성 (파일이 없으면 None - 알림 비활성, 비용 없음)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            return None
+        rules = [parse_rule(spec) for spec in config.get('rules', [])]
+        sinks = [build_sink(spec) for spec in config.get('sinks', [])]
+        logger.info("✓ 알림 규칙 %d개, 싱크 %d개 (%s)", len(rules), len(sinks), path)
+        return cls(rules, sinks)
+
+    def evaluate(self, usage: UsageData, forecasts: Optional[Dict] = None, account: str = "",
+                 now: Optional[float] = None) -> List[Dict]:
+        """샘플 하나 평가 - 값이 바뀐 구간 + 알림이 켜진 구간의 규칙만. 보낸 알림 목록 반환"""
+        now = now if now is not None else time.time()
+        forecasts = forecasts or {}
+        last = self._last.setdefault(account, {})
+        firing = self._firing.setdefault(account, {})
+        touched: Set[str] = {key for key, bucket in usage.buckets.items() if last.get(key) != bucket}
+        touched.update(firing)
+
+        sent = []
+        for key in touched:
+            bucket = usage.buckets.get(key)
+            if bucket is None:
+                continue
+            last[key] = bucket
+            forecast = forecasts.get(key)
+            for rule in self._by_bucket.get(key, ()):
+                sent.extend(self._apply(rule, account, key, bucket, forecast, now))
+            for rule in self._wildcard:
+                sent.extend(self._apply(rule, account, key, bucket, forecast, now))
+        return sent
+
+    def _apply(self, rule: Rule, account: str, key: str, bucket: Bucket, forecast, now: float) -> List[Dict]:
+        value = rule.measure(bucket, forecast)
+        if value is None:
+            return []
+        state_key = (account, rule.name, key)
+        state = self._states.get(state_key)
+        if state is None:
+            state = self._states[state_key] = _RuleState()
+
+        if not state.firing:
+            if not rule.fires(value):
+                return []
+            state.firing = True
+            self._firing[account][key] = self._firing[account].get(key, 0) + 1
+            if now - state.sent_at < rule.cooldown:
+                return []  # 방금 보낸 알림이 잠깐 해제됐다 다시 켜짐 - 중복 억제
+            state.sent_at = now
+            return [self._send(rule, account, key, value, forecast, "firing", now)]
+
+        if not rule.clears(value):
+            return []
+        state.firing = False
+        count = self._firing[account].get(key, 1) - 1
+        if count:
+            self._firing[account][key] = count
+        else:
+            self._firing[account].pop(key, None)
+        if rule.notify_resolved:
+            return [self._send(rule, account, key, value, forecast, "resolved", now)]
+        return []
+
+    def _send(self, rule: Rule, account: str, key: str, value: float, forecast, state: str,
+              now: float) -> Dict:
+        message = rule.describe(key, value, forecast)
+        if state == "resolved":
+            message = f"resolved: {message}"
+        if account:
+            message = f"[{account}] {message}"
+        alert = {
+            'rule': rule.name,
+            'account': account or None,
+            'bucket': key,
+            'state': state,
+            'value': value,
+            'threshold': rule.value,
+            'message': message,
+            'at': now,
+        }
+        logger.warning("알림: %s", message)
+        if self.sinks:
+            self._ensure_worker()
+            self._queue.put(alert)
+        return alert
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._deliver, name="alerts", daemon=True)
+            self._worker.start()
+
+    def _deliver(self):
+        while True:
+            alert = self._queue.get()
+            if alert is None:
+                return
+            for sink in self.sinks:
+                try:
+                    sink.send(alert)
+                except Exception as e:
+                    logger.warning("알림 전송 실패 (%s): %s", type(sink).__name__, e)
+
+    def close(self, timeout: float = SINK_TIMEOUT):
+        """대기 중인 알림 전송 후 종료"""
+        worker = self._worker
+        if worker is not None:
+            self._queue.put(None)
+            worker.join(timeout)
+            self._worker = None
@@ -1,16 +1,115 @@
 """Claude.ai 인증 및 세션 관리"""
+import asyncio
 import json
-import os
+import logging
 from pathlib import Path
-from typing import Optional, Dict
-from playwright.sync_api import sync_playwright, Page, Browser
+from typing import Optional, Dict, List
+
+from scraper.browser_manager import BROWSERS
+from scraper.browser_profile import BrowserProfile
+
+logger = logging.getLogger(__name__)
+
+
+LOGIN_TIMEOUT = 5 * 60  # 로그인 대기 최대 시간 (초)
+ORGANIZATIONS_URL = "https://claude.ai/api/organizations"
+
+
+class _LoginDetector:
+    """브라우저 이벤트로 로그인 완료 감지
+
+    - 웹앱이 스스로 호출한 /api/organizations 가 200 → 추가 요청 없이 검증 완료
+    - 응답의 Set-Cookie 또는 페이지 이동 후 쿠키에 sessionKey 등장 → 검증 1회
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self._signal = asyncio.Event()
+        self._verified = False
+        self._closed = False
+        context.on("response", self.on_response)
+        context.on("close", self.on_closed)
+
+    def on_response(self, response):
+        if not response.url.startswith("https://claude.ai/"):
+            return
+        if response.url.split('?', 1)[0] == ORGANIZATIONS_URL and response.status == 200:
+            self._verified = True
+            self._signal.set()
+        elif response.request.resource_type in ("document", "fetch", "xhr"):
+            # Set-Cookie 는 response.headers 에 없으므로 비동기로 확인
+            asyncio.ensure_future(self._check_set_cookie(response))
+
+    def on_navigated(self, frame):
+        # 쿠키는 변경 이벤트가 없으므로 탐색 시점에만 확인
+        if frame.parent_frame is None:
+            asyncio.ensure_future(self._check_cookies())
+
+    def on_closed(self, *_):
+        self._closed = True
+        self._signal.set()
+
+    async def _check_set_cookie(self, response):
+        try:
+            set_cookie = await response.header_value('set-cookie')
+        except Exception:
+            return
+        if set_cookie and 'sessionKey=' in set_cookie:
+            self._signal.set()
+
+    async def _check_cookies(self):
+        try:
+            cookies = await self.context.cookies("https://claude.ai")
+        except Exception:
+            return
+        if any(c['name'] == 'sessionKey' for c in cookies):
+            self._signal.set()
+
+    async def wait(self, page, timeout: float) -> Optional[List[Dict]]:
+        """로그인 완료 시 쿠키 목록, 타임아웃 / 창 닫힘이면 None"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.warning("⚠ 타임아웃: 5분이 경과했습니다")
+                return None
+            try:
+                await asyncio.wait_for(self._signal.wait(), remaining)
+            except asyncio.TimeoutError:
+                continue
+            self._signal.clear()
+            if self._closed:
+                logger.warning("⚠ 브라우저 창이 닫혔습니다")
+                return None
+
+            if self._verified:
+                logger.info("✓ Login complete")
+                return await self.context.cookies()
+
+            # 세션 쿠키 감지 → 검증 1회 + 쿠키 추출을 동시에
+            logger.info("Session detected. Verifying API...")
+            try:
+                response, cookies = await asyncio.gather(
+                    page.request.get(ORGANIZATIONS_URL, timeout=10000),
+                    self.context.cookies(),
+                )
+            except Exception as e:
+                logger.warning("API test error: %s", e)
+                continue
+            if response.status == 200:
+                logger.info("✓ Login complete")
+                return cookies
+            logger.info("API response: %s - 계속 대기", response.status)
 
 
 class ClaudeAuth:
     """Claude.ai 인증 관리 클래스"""
 
-    def __init__(self):
-        self.session_file = Path("config/session.json")
+    def __init__(self, profile: Optional[BrowserProfile] = None,
+                 session_file: Path = Path("config/session.json")):
+        self.session_file = session_file  # fleet 모드는 계정마다 config/sessions/<이름>.json
+        self.profile = profile or BrowserProfile()  # 로그인 창과 스크래퍼가 공유
         self.session_data: Optional[Dict] = None
         self.cookies: Optional[Dict] = None
 
@@ -25,7 +124,7 @@ class ClaudeAuth:
                 self.cookies = self.session_data.get('cookies', {})
             return True
         except Exception as e:
-            print(f"세션 로드 실패: {e}")
+            logger.warning("세션 로드 실패: %s", e)
             return False
 
     def save_session(self, cookies: Dict) -> bool:
@@ -44,164 +143,88 @@ class ClaudeAuth:
             self.cookies = cookies
             return True
         except Exception as e:
-            print(f"세션 저장 실패: {e}")
+            logger.error("세션 저장 실패: %s", e)
             return False
 
     def login_with_browser_manual(self) -> bool:
-        """브라우저를 열어서 사용자가 직접 로그인 (GUI 안전 버전)"""
+        """브라우저를 열어서 사용자가 직접 로그인 (GUI 안전 버전, 백그라운드 스레드에서 호출)"""
         try:
-            print("=" * 80)
-            print("브라우저 로그인")
-            print("=" * 80)
-            print()
-            print("브라우저가 열립니다. Claude.ai에 로그인하세요.")
-            print()
-
-            with sync_playwright() as p:
-                # 브라우저 설정
-                browser = p.chromium.launch(
-                    headless=False,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                    ]
-                )
-
-                context = browser.new_context(
-                    viewport={'width': 1280, 'height': 720},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                )
-
-                page = context.new_page()
-
-                # Claude.ai로 이동
-                print("브라우저에서 https://claude.ai 를 여는 중...")
-                page.goto("https://claude.ai", wait_until="networkidle")
-
-                print("✓ Browser opened")
-                print("Please sign in. Login will be detected automatically...")
-
-                # 로그인 완료 대기 - 쿠키 모니터링 + API 확인
-                print("로그인 완료 대기 중 (최대 5분)...")
-                import time
-                login_success = False
-                start_time = time.time()
-                initial_cookie_count = len(context.cookies())
-                print(f"초기 쿠키 수: {initial_cookie_count}")
-
-                while True:
-                    current_time = time.time()
-                    elapsed = int(current_time - start_time)
-                    if elapsed > 300:  # 5분 타임아웃
-                        print("⚠ 타임아웃: 5분이 경과했습니다")
-                        break
-
-                    try:
-                        # 쿠키 변화 모니터링
-                        current_cookies = context.cookies()
-                        cookie_count = len(current_cookies)
-                        cookie_names = {c['name'] for c in current_cookies}
-
-                        # 세션 쿠키 확인
-                        has_session = bool(cookie_names & {'sessionKey', '__ssid', 'lastActiveOrg'})
-                        print(f"[{elapsed}s] 쿠키: {cookie_count}개, 세션쿠키: {has_session}")
-
-                        if has_session or cookie_count > initial_cookie_count + 3:
-                            # 기존 페이지의 request API로 테스트 (새 탭 없음)
-                            print(f"[{elapsed}s] Session detected. Verifying API...")
-                            try:
-                                test_response = page.request.get(
-                                    "https://claude.ai/api/organizations",
-                                    timeout=10000
-                                )
-                                status = test_response.status
-                                print(f"[{elapsed}s] API response: {status}")
-                                if status == 200:
-                                    print("✓ Login complete")
-                                    login_success = True
-                                    break
-                            except Exception as e:
-                                print(f"[{elapsed}s] API test error: {e}")
-
-                        time.sleep(3)
-                    except Exception as e:
-                        print(f"[{elapsed}s] 확인 중 오류: {e}")
-                        time.sleep(3)
-
-                if not login_success:
-                    print("✗ 로그인이 완료되지 않았습니다")
-                    browser.close()
-                    return False
-
-                print("쿠키를 추출하는 중...")
-
-                # 쿠키 추출
-                cookies = context.cookies()
-                cookie_dict = {cookie['name']: cookie['value'] for cookie in cookies}
-
-                print(f"✓ {len(cookie_dict)}개의 쿠키를 추출했습니다")
-                print("✓ 세션이 검증되었습니다")
-
-                browser.close()
-
-                # 세션 저장
-                if self.save_session(cookie_dict):
-                    print("✓ 세션이 저장되었습니다")
-                    return True
-                else:
-                    print("✗ 세션 저장 실패")
-                    return False
-
+            logger.info("브라우저 로그인 - 브라우저가 열립니다. Claude.ai에 로그인하세요.")
+            return BROWSERS.run(self._login_async())
         except Exception as e:
-            print(f"오류 발생: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
-
-    def verify_session(self) -> bool:
-        """세션 유효성 검증 (Playwright 사용)"""
-        if not self.cookies:
-            print("쿠키가 없습니다")
+            logger.exception("로그인 오류: %s", e)
             return False
 
+    async def _login_async(self) -> bool:
+        """응답 / 탐색 이벤트로 로그인 감지 (폴링 없음)"""
+        # 공용 headed 브라우저의 컨텍스트 (프로필 모드면 이전 로그인 상태에서 시작)
+        context = await BROWSERS.new_context(
+            headless=False, profile=self.profile, viewport={'width': 1280, 'height': 720}
+        )
         try:
-            print("API 검증 중 (Playwright): https://claude.ai/api/organizations")
+            detector = _LoginDetector(context)
+            page = await context.new_page()
+            page.on("framenavigated", detector.on_navigated)
+            page.on("close", detector.on_closed)
 
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                )
+            # Claude.ai로 이동 (networkidle 대기 없이 바로 감지 시작)
+            logger.info("브라우저에서 https://claude.ai 를 여는 중...")
+            await page.goto("https://claude.ai", wait_until="domcontentloaded")
 
-                # 쿠키를 Playwright 형식으로 변환하여 추가
-                cookies_list = []
-                for name, value in self.cookies.items():
-                    cookies_list.append({
-                        'name': name,
-                        'value': value,
-                        'domain': '.claude.ai',
-                        'path': '/',
-                    })
-                context.add_cookies(cookies_list)
+            logger.info("✓ Browser opened - please sign in. Login will be detected automatically...")
 
-                page = context.new_page()
+            cookies = await detector.wait(page, LOGIN_TIMEOUT)
+            if cookies is not None:
+                await self.profile.save_async(context)
+        finally:
+            await BROWSERS.release(context)
 
-                # API 호출
-                response = page.request.get("https://claude.ai/api/organizations")
+        if cookies is None:
+            logger.warning("✗ 로그인이 완료되지 않았습니다")
+            return False
 
-                print(f"API 응답 상태: {response.status}")
+        cookie_dict = {cookie['name']: cookie['value'] for cookie in cookies}
+        logger.info("✓ %d개의 쿠키를 추출했습니다", len(cookie_dict))
 
-                if response.status != 200:
-                    print(f"API 응답 내용: {response.text()[:200]}")
+        # 세션 저장
+        if self.save_session(cookie_dict):
+            logger.info("✓ 세션이 저장되었습니다")
+            return True
+        else:
+            logger.error("✗ 세션 저장 실패")
+            return False
 
-                browser.close()
-                return response.status == 200
+    def verify_session(self) -> bool:
+        """세션 유효성 검증 (공용 headless 브라우저 사용)"""
+        if not self.cookies:
+            logger.warning("쿠키가 없습니다")
+            return False
 
+        try:
+            logger.info("API 검증 중 (Playwright): %s", ORGANIZATIONS_URL)
+            return BROWSERS.run(self._verify_async())
         except Exception as e:
-            print(f"API 호출 오류: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("API 호출 오류: %s", e)
             return False
 
+    async def _verify_async(self) -> bool:
+        context = await BROWSERS.new_context(headless=True, profile=self.profile)
+        try:
+            # 저장된 프로필에 없는 쿠키만 Playwright 형식으로 추가
+            cookies_list = self.profile.cookies_to_add(
+                await context.cookies("https://claude.ai"), self.cookies
+            )
+            await context.add_cookies(cookies_list)
+
+            page = await context.new_page()
+            response = await page.request.get(ORGANIZATIONS_URL)
+            logger.info("API 응답 상태: %s", response.status)
+            if response.status != 200:
+                logger.warning("API 응답 내용: %s", (await response.text())[:200])
+            return response.status == 200
+        finally:
+            await BROWSERS.release(context)
+
     def get_cookies(self) -> Optional[Dict]:
         """현재 쿠키 반환"""
         return self.cookies
@@ -0,0 +1,241 @@
+"""헤드리스 Chromium 실행 옵션 + 메모리 감시
+
+스크래퍼는 page.request 로 API 만 호출하므로 렌더링 / 리소스 대부분이 필요 없다.
+(Cloudflare 챌린지를 통과하려면 JavaScript 는 켜 두어야 한다.)
+"""
+import itertools
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from scraper.metrics import BROWSER_RSS
+
+
+# API 호출 + 챌린지 통과에 필요 없는 기능 끄기
+LEAN_ARGS = [
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-domain-reliability',
+    '--disable-sync',
+    '--disable-breakpad',
+    '--disable-dev-shm-usage',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,InterestFeedContentSuggestions',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-default-browser-check',
+    '--no-first-run',
+    '--no-pings',
+    '--renderer-process-limit=1',
+    '--blink-settings=imagesEnabled=false',
+]
+
+# 챌린지 페이지 탐색 시 받지 않는 리소스 유형
+BLOCKED_RESOURCES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+RSS_LIMIT_MB = 400            # 브라우저 프로세스 트리 RSS 한도
+MAX_BROWSER_AGE = 12 * 60 * 60  # 메모리와 무관하게 주기적으로 재시작 (초)
+CHECK_INTERVAL = 60           # RSS 측정 간격 (초)
+MARKER_SWITCH = '--omc-watchdog'  # 감시 대상 브라우저 프로세스 식별용 (Chromium 은 모르는 스위치를 무시)
+
+_watchdog_ids = itertools.count(1)
+
+
+def block_assets(route):
+    """route 핸들러 (동기 API)"""
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+async def block_assets_async(route):
+    """route 핸들러 (비동기 API)"""
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _children_map() -> Dict[int, List[int]]:
+    """/proc 기준 부모 PID → 자식 PID 목록 (Linux)"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        stat = _read_stat(int(entry))
+        if stat:
+            children.setdefault(stat[1], []).append(int(entry))
+    return children
+
+
+def _read_stat(pid: int) -> Optional[tuple]:
+    """(state, ppid, rss_pages) - 프로세스가 사라졌으면 None"""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # comm 에 공백 / 괄호가 있을 수 있으므로 마지막 ')' 뒤부터 파싱
+    fields = data[data.rindex(b')') + 2:].split()
+    return fields[0].decode(), int(fields[1]), int(fields[21])
+
+
+def _read_cmdline(pid: int) -> List[str]:
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            return f.read().decode(errors='replace').split('\0')
+    except OSError:
+        return []
+
+
+def _psutil():
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+
+def find_descendant(ancestor: int, arg: str) -> Optional[int]:
+    """ancestor 의 하위 프로세스 중 명령줄에 arg 가 있는 것 (없거나 측정 불가 플랫폼이면 None)"""
+    psutil = _psutil()
+    if psutil is not None:
+        try:
+            descendants = psutil.Process(ancestor).children(recursive=True)
+        except psutil.Error:
+            return None
+        for proc in descendants:
+            try:
+                if arg in proc.cmdline():
+                    return proc.pid
+            except psutil.Error:
+                pass
+        return None
+
+    if not sys.platform.startswith('linux'):
+        return None
+    children = _children_map()
+    stack = list(children.get(ancestor, ()))
+    while stack:
+        pid = stack.pop()
+        if arg in _read_cmdline(pid):
+            return pid
+        stack.extend(children.get(pid, ()))
+    return None
+
+
+def process_tree_usage(root: int) -> Optional[tuple]:
+    """root 와 그 하위 프로세스 전체 (RSS 바이트 합, 좀비 수) - root 가 없거나 측정 불가 플랫폼이면 None
+
+    root 는 감시하는 Chromium 브라우저 프로세스 (렌더러 / GPU 등은 그 자손).
+    psutil 이 설치되어 있으면 사용하고, 없으면 Linux /proc 를 직접 읽는다.
+    """
+    psutil = _psutil()
+    if psutil is not None:
+        try:
+            process = psutil.Process(root)
+            descendants = [process] + process.children(recursive=True)
+        except psutil.Error:
+            return None
+        rss = zombies = 0
+        for proc in descendants:
+            try:
+                if proc.status() == psutil.STATUS_ZOMBIE:
+                    zombies += 1
+                else:
+                    rss += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss, zombies
+
+    if not sys.platform.startswith('linux'):
+        return None
+    if _read_stat(root) is None:
+        return None
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    children = _children_map()
+    rss = zombies = 0
+    stack = [root]
+    while stack:
+        pid = stack.pop()
+        stat = _read_stat(pid)
+        if stat is None:
+            continue
+        if stat[0] == 'Z':
+            zombies += 1
+        else:
+            rss += stat[2] * page_size
+        stack.extend(children.get(pid, ()))
+    return rss, zombies
+
+
+class BrowserWatchdog:
+    """브라우저 재시작이 필요한지 판단 (측정은 CHECK_INTERVAL 마다 한 번)
+
+    측정 대상은 launch_args() 로 띄운 브라우저 프로세스와 그 자손뿐이다.
+    (로그인 창, 알림 명령 등 이 프로세스의 다른 자식은 세지 않음)
+    """
+
+    def __init__(self, rss_limit_mb: float = RSS_LIMIT_MB, max_age: float = MAX_BROWSER_AGE,
+                 check_interval: float = CHECK_INTERVAL):
+        self.rss_limit = rss_limit_mb * 1024 * 1024
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self.started_at: Optional[float] = None
+        self.last_rss: Optional[int] = None   # 마지막 측정값 (바이트)
+        self.recycles = 0                      # 재시작 횟수
+        self.marker = f"{MARKER_SWITCH}={os.getpid()}.{next(_watchdog_ids)}"
+        self._root: Optional[int] = None       # 감시 중인 브라우저 프로세스 PID (첫 측정 때 찾음)
+        self._checked_at = 0.0
+
+    def launch_args(self, args: List[str]) -> List[str]:
+        """감시할 브라우저의 실행 인자 (식별용 스위치 추가)"""
+        return list(args) + [self.marker]
+
+    def started(self):
+        """브라우저 시작 시 호출"""
+        self.started_at = time.monotonic()
+        self._checked_at = self.started_at
+        self._root = None
+
+    def stopped(self):
+        self.started_at = None
+        self.last_rss = None
+        self._root = None
+        BROWSER_RSS.set(0)
+
+    def check(self, connected: bool = True) -> Optional[str]:
+        """재시작 사유 (필요 없으면 None)"""
+        if self.started_at is None:
+            return None
+        if not connected:
+            return "브라우저 연결 끊김"
+        now = time.monotonic()
+        if now - self.started_at >= self.max_age:
+            return f"실행 {self.max_age / 3600:.0f}시간 경과"
+        if now - self._checked_at < self.check_interval:
+            return None
+        self._checked_at = now
+
+        if self._root is None:
+            self._root = find_descendant(os.getpid(), self.marker)
+            if self._root is None:
+                return None
+        usage = process_tree_usage(self._root)
+        if usage is None:
+            self._root = None  # 브라우저 프로세스가 사라짐 (연결 끊김은 다음 확인에서)
+            return None
+        rss, zombies = usage
+        self.last_rss = rss
+        BROWSER_RSS.set(rss)
+        if zombies:
+            return f"좀비 프로세스 {zombies}개"
+        if rss > self.rss_limit:
+            return f"메모리 {rss / 1024 / 1024:.0f}MB > {self.rss_limit / 1024 / 1024:.0f}MB"
+        return None
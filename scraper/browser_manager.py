@@ -0,0 +1,289 @@
+"""프로세스 공용 Playwright 드라이버 / 브라우저
+
+로그인 창, 세션 검증, 스크래퍼, fleet 컨텍스트 풀이 각자 Playwright 를 띄우면 재로그인 중에
+드라이버와 브라우저가 두세 개씩 뜬다. BROWSERS 하나가 드라이버를 소유하고 종류(headless / headed)별로
+브라우저를 최대 하나씩 띄워 격리된 컨텍스트를 빌려준다.
+- 참조 카운트: 빌려준 컨텍스트가 모두 반납되면 종류별 유휴 시간 후 브라우저 종료, 브라우저가 없으면 드라이버도 종료
+- Playwright 객체는 만든 이벤트 루프에서만 쓸 수 있으므로, 브라우저를 쓰는 코루틴은 전용 스레드의 루프에서
+  BROWSERS.run() 으로 실행한다 (asyncio.run 대신).
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from typing import Dict, Optional
+
+from scraper import metrics
+from scraper.browser import LEAN_ARGS, BrowserWatchdog
+from scraper.browser_profile import BrowserProfile
+
+logger = logging.getLogger(__name__)
+
+
+HEADLESS = "headless"   # 조회 (스크래퍼 / fleet 풀 / 세션 검증)
+HEADED = "headed"       # 로그인 창
+
+KIND_ARGS = {
+    HEADLESS: LEAN_ARGS,
+    HEADED: ['--disable-blink-features=AutomationControlled'],
+}
+# 마지막 컨텍스트 반납 후 브라우저를 유지하는 시간 (초) - 로그인 창은 바로 닫음
+IDLE_SHUTDOWN = {
+    HEADLESS: 5 * 60,
+    HEADED: 0,
+}
+SHUTDOWN_TIMEOUT = 10  # 종료 / 취소 시 정리 대기 (초)
+
+_PERSISTENT = "persistent"  # launch_persistent_context 로 띄운 전용 브라우저 (프로필 디렉터리 잠금)
+
+
+class _Browser:
+    """종류 하나의 브라우저 + 참조 카운트"""
+
+    __slots__ = ('browser', 'refs', 'idle_handle', 'recycle')
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.refs = 0
+        self.idle_handle: Optional[asyncio.TimerHandle] = None
+        self.recycle = False
+
+
+class BrowserManager:
+    """공용 Playwright 드라이버 + 종류별 브라우저 (참조 카운트, 유휴 종료)"""
+
+    def __init__(self, idle_shutdown: Optional[Dict[str, float]] = None):
+        self.idle_shutdown = dict(IDLE_SHUTDOWN, **(idle_shutdown or {}))
+        self.watchdog = BrowserWatchdog()  # headless 브라우저 (장시간 실행) 감시
+        self.launches = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._lock: Optional[asyncio.Lock] = None
+        self._playwright = None
+        self._browsers: Dict[str, _Browser] = {}
+        self._leases: Dict[object, str] = {}  # 빌려준 컨텍스트 → 종류
+
+    # ── 전용 스레드 / 이벤트 루프 ──
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="playwright", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+                atexit.register(self.shutdown)
+        return self._loop
+
+    def run(self, coro):
+        """브라우저 루프에서 코루틴 실행 후 결과 반환 (asyncio.run 대신, 다른 스레드에서 호출)
+
+        취소되면 asyncio.CancelledError, Ctrl+C 면 작업을 취소하고 정리가 끝날 때까지 기다린 뒤 다시 발생.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("브라우저 루프 안에서는 await 로 호출하세요")
+        loop = self._ensure_loop()
+        started = threading.Event()
+        finished = threading.Event()
+
+        async def guarded():
+            started.set()
+            try:
+                return await coro
+            finally:
+                finished.set()
+
+        future = asyncio.run_coroutine_threadsafe(guarded(), loop)
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            raise asyncio.CancelledError() from None
+        except KeyboardInterrupt:
+            future.cancel()
+            if started.is_set():
+                finished.wait(SHUTDOWN_TIMEOUT)
+            else:
+                coro.close()
+            raise
+
+    def _check_loop(self):
+        if self._loop is None or asyncio.get_running_loop() is not self._loop:
+            raise RuntimeError("브라우저는 BROWSERS.run() 으로 실행한 코루틴에서만 쓸 수 있습니다")
+
+    # ── 컨텍스트 대여 / 반납 (브라우저 루프에서) ──
+
+    async def new_context(self, headless: bool = True, profile: Optional[BrowserProfile] = None,
+                          **options):
+        """격리된 컨텍스트 대여 (release() 로 반납)
+
+        persistent 프로필은 사용자 데이터 디렉터리를 쓰는 전용 브라우저를 띄운다.
+        """
+        self._check_loop()
+        profile = profile or BrowserProfile()
+        kind = HEADLESS if headless else HEADED
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            playwright = await self._ensure_driver()
+            if profile.persistent:
+                context = await playwright.chromium.launch_persistent_context(
+                    **profile.persistent_options(headless, KIND_ARGS[kind], **options)
+                )
+                self._leases[context] = _PERSISTENT
+                return context
+
+            entry = await self._ensure_browser(kind)
+            entry.refs += 1
+            try:
+                context = await entry.browser.new_context(**profile.context_options(**options))
+            except BaseException:
+                entry.refs -= 1
+                await self._after_release(kind, entry)
+                raise
+            self._leases[context] = kind
+            return context
+
+    async def release(self, context, recycle: bool = False):
+        """컨텍스트 반납 (닫기). recycle 이면 마지막 반납 때 브라우저를 바로 종료 (다음 대여 때 새로 시작)"""
+        kind = self._leases.pop(context, None)
+        try:
+            await context.close()
+        except Exception:
+            pass
+        if kind is None:
+            return
+        async with self._lock:
+            if kind == _PERSISTENT:
+                await self._stop_driver_if_unused()
+                return
+            entry = self._browsers.get(kind)
+            if entry is None:
+                return
+            entry.refs -= 1
+            entry.recycle = entry.recycle or recycle
+            await self._after_release(kind, entry)
+
+    async def _after_release(self, kind: str, entry: _Browser):
+        # 잠금을 잡은 상태에서 호출
+        if entry.refs > 0:
+            return
+        if kind == HEADLESS and not entry.recycle:
+            reason = self.watchdog.check(entry.browser.is_connected())
+            if reason:
+                logger.warning("공용 브라우저 재시작: %s", reason)
+                self.watchdog.recycles += 1
+                metrics.BROWSER_RECYCLES.inc()
+                entry.recycle = True
+        idle = self.idle_shutdown[kind]
+        if entry.recycle or idle <= 0 or not entry.browser.is_connected():
+            await self._close_browser(kind)
+        else:
+            entry.idle_handle = self._loop.call_later(
+                idle, lambda: asyncio.ensure_future(self._close_if_idle(kind, entry))
+            )
+
+    async def _close_if_idle(self, kind: str, entry: _Browser):
+        async with self._lock:
+            if self._browsers.get(kind) is entry and entry.refs == 0:
+                await self._close_browser(kind)
+                logger.info("✓ 공용 브라우저 종료됨 (%s, 유휴)", kind)
+
+    # ── 드라이버 / 브라우저 (잠금을 잡은 상태에서) ──
+
+    async def _ensure_driver(self):
+        if self._playwright is None:
+            from playwright.async_api import async_playwright  # 지연 import
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def _ensure_browser(self, kind: str) -> _Browser:
+        entry = self._browsers.get(kind)
+        if entry is not None:
+            if entry.idle_handle:
+                entry.idle_handle.cancel()
+                entry.idle_handle = None
+            if entry.browser.is_connected() and not (entry.recycle and entry.refs == 0):
+                return entry
+            await self._close_browser(kind, stop_driver=False)
+
+        args = self.watchdog.launch_args(KIND_ARGS[kind]) if kind == HEADLESS else KIND_ARGS[kind]
+        browser = await self._playwright.chromium.launch(headless=kind == HEADLESS, args=args)
+        entry = self._browsers[kind] = _Browser(browser)
+        self.launches += 1
+        if kind == HEADLESS:
+            self.watchdog.started()
+        logger.info("✓ 공용 브라우저 시작됨 (%s)", kind)
+        return entry
+
+    async def _close_browser(self, kind: str, stop_driver: bool = True):
+        entry = self._browsers.pop(kind, None)
+        if entry is None:
+            return
+        if entry.idle_handle:
+            entry.idle_handle.cancel()
+        try:
+            await entry.browser.close()
+        except Exception:
+            pass
+        if kind == HEADLESS:
+            self.watchdog.stopped()
+        if stop_driver:
+            await self._stop_driver_if_unused()
+
+    async def _stop_driver_if_unused(self):
+        if self._browsers or self._leases or self._playwright is None:
+            return
+        playwright, self._playwright = self._playwright, None
+        try:
+            await playwright.stop()
+        except Exception:
+            pass
+
+    # ── 종료 / 상태 ──
+
+    async def close(self):
+        """빌려준 컨텍스트와 브라우저, 드라이버 모두 종료"""
+        if self._lock is None:
+            return
+        for context in list(self._leases):
+            try:
+                await context.close()
+            except Exception:
+                pass
+        async with self._lock:
+            self._leases.clear()
+            for kind in list(self._browsers):
+                await self._close_browser(kind)
+            await self._stop_driver_if_unused()
+
+    def shutdown(self):
+        """프로세스 종료 시 정리 (atexit)"""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result(SHUTDOWN_TIMEOUT)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+
+    def running(self, kind: str = HEADLESS) -> bool:
+        return kind in self._browsers
+
+    def active(self, kind: str = HEADLESS) -> int:
+        entry = self._browsers.get(kind)
+        return entry.refs if entry else 0
+
+    def stats(self) -> Dict:
+        return {
+            'driver': self._playwright is not None,
+            'browsers': {kind: entry.refs for kind, entry in self._browsers.items()},
+            'launches': self.launches,
+            'recycles': self.watchdog.recycles,
+            'rss_bytes': self.watchdog.last_rss,
+        }
+
+
+BROWSERS = BrowserManager()
@@ -0,0 +1,91 @@
+"""브라우저 프로필 (로그인 / 스크래퍼 공용, 선택 사항)
+
+off         매번 빈 컨텍스트 + session.json 쿠키를 .claude.ai 도메인으로 주입 (기존 동작)
+storage     Playwright storage state(config/storage_state.json)로 쿠키 속성/로컬 스토리지 유지
+persistent  사용자 데이터 디렉터리(config/browser_profile/) 유지 - HTTP 캐시, Cloudflare 상태까지 보존
+
+persistent 모드의 디렉터리는 Chromium 이 잠그므로 로그인 창과 스크래퍼가 동시에 열 수 없다.
+(로그인은 세션이 만료되어 스크래퍼가 멈춘 뒤에만 열린다.)
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from scraper.http_backend import USER_AGENT
+
+
+PROFILE_MODES = ("off", "storage", "persistent")
+AUTH_COOKIES = ("sessionKey",)  # 재로그인 시 저장 상태보다 session.json 값을 우선
+
+
+class BrowserProfile:
+    """컨텍스트 생성 / 저장 방법"""
+
+    def __init__(self, mode: str = "off", directory: Path = Path("config")):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"알 수 없는 프로필 모드: {mode}")
+        self.mode = mode
+        self.storage_state_file = directory / "storage_state.json"
+        self.user_data_dir = directory / "browser_profile"
+
+    @property
+    def persistent(self) -> bool:
+        return self.mode == "persistent"
+
+    def context_options(self, **options) -> Dict:
+        """new_context() 옵션 (storage 모드면 저장 상태 포함)"""
+        options.setdefault('user_agent', USER_AGENT)
+        if self.mode == "storage" and self.storage_state_file.exists():
+            options['storage_state'] = str(self.storage_state_file)
+        return options
+
+    def persistent_options(self, headless: bool, args: Optional[List[str]] = None, **options) -> Dict:
+        """launch_persistent_context() 옵션"""
+        self.user_data_dir.mkdir(parents=True, exist_ok=True)
+        options.setdefault('user_agent', USER_AGENT)
+        return dict(options, user_data_dir=str(self.user_data_dir), headless=headless, args=args or [])
+
+    def cookies_to_add(self, existing: List[Dict], cookies: Dict,
+                       url: Optional[str] = None) -> List[Dict]:
+        """session.json 쿠키 중 컨텍스트에 보충할 것 (Playwright 형식)
+
+        저장된 상태에 이미 있는 쿠키는 실제 도메인/속성을 보존한다.
+        sessionKey 만 값이 다르면(재로그인) 기존 속성 그대로 값만 교체한다.
+        url 을 주면 .claude.ai 도메인 대신 그 URL 기준으로 추가한다 (로컬 가짜 서버).
+        """
+        target = {'url': url} if url else {'domain': '.claude.ai', 'path': '/'}
+        by_name = {c['name']: c for c in existing}
+        result = []
+        for name, value in cookies.items():
+            current = by_name.get(name)
+            if current is None:
+                result.append(dict(target, name=name, value=value))
+            elif name in AUTH_COOKIES and current['value'] != value:
+                result.append(dict(current, value=value))
+        return result
+
+    # ── 동기 API ──
+
+    def open_sync(self, playwright, headless: bool, args: Optional[List[str]] = None,
+                  **options) -> Tuple[Optional[object], object]:
+        """(browser, context) - persistent 모드는 browser 가 None"""
+        if self.persistent:
+            context = playwright.chromium.launch_persistent_context(
+                **self.persistent_options(headless, args, **options)
+            )
+            return None, context
+        browser = playwright.chromium.launch(headless=headless, args=args or [])
+        return browser, browser.new_context(**self.context_options(**options))
+
+    def save_sync(self, context):
+        """storage 모드면 현재 상태 저장"""
+        if self.mode == "storage" and context is not None:
+            self.storage_state_file.parent.mkdir(parents=True, exist_ok=True)
+            context.storage_state(path=str(self.storage_state_file))
+
+    # ── 비동기 API ──
+
+    async def save_async(self, context):
+        """storage 모드면 현재 상태 저장"""
+        if self.mode == "storage" and context is not None:
+            self.storage_state_file.parent.mkdir(parents=True, exist_ok=True)
+            await context.storage_state(path=str(self.storage_state_file))
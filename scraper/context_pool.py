@@ -0,0 +1,107 @@
+"""여러 계정이 Chromium 하나를 나눠 쓰는 브라우저 컨텍스트 풀 (asyncio, fleet 모드)
+
+계정마다 브라우저를 띄우면 메모리가 계정 수에 비례해 늘어난다. 풀은 공용 headless 브라우저(BROWSERS)에서
+계정별 격리된 컨텍스트(쿠키 / 스토리지 분리)를 요청 동안만 빌려준다.
+동시에 열 수 있는 컨텍스트 수는 size 로 제한되고 나머지 요청은 대기한다.
+브라우저 시작 / 유휴 종료 / 메모리 감시 재시작은 BROWSERS 가 한다.
+"""
+import asyncio
+from typing import Dict, Optional
+
+from scraper.browser import block_assets_async
+from scraper.browser_manager import BROWSERS, HEADLESS
+from scraper import metrics
+from scraper.usage_async import AsyncClaudeUsageScraper
+from scraper.usage_playwright import UsageData
+
+
+DEFAULT_POOL_SIZE = 2
+
+
+class BrowserContextPool:
+    """공용 브라우저 컨텍스트 동시 대여 수 제한"""
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE):
+        self.size = max(size, 1)
+        self.active = 0       # 빌려준 컨텍스트 수
+        self.leases = 0       # 누적 대여 횟수
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def running(self) -> bool:
+        return BROWSERS.running(HEADLESS)
+
+    async def acquire(self, **options):
+        """격리된 새 컨텍스트 대여 (release() 로 반납)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)  # 이벤트 루프 안에서 처음 쓸 때 생성
+        await self._semaphore.acquire()
+        try:
+            context = await BROWSERS.new_context(headless=True, **options)
+            await context.route("**/*", block_assets_async)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        self.active += 1
+        self.leases += 1
+        metrics.CONTEXT_RECREATIONS.inc()
+        return context
+
+    async def release(self, context):
+        """컨텍스트 반납 (닫기)"""
+        try:
+            await BROWSERS.release(context)
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict:
+        """fleet 요약용 상태"""
+        return {
+            'running': self.running,
+            'size': self.size,
+            'active': self.active,
+            'leases': self.leases,
+            'recycles': BROWSERS.watchdog.recycles,
+            'rss_bytes': BROWSERS.watchdog.last_rss,
+        }
+
+
+class PooledUsageScraper(AsyncClaudeUsageScraper):
+    """브라우저가 필요할 때만 풀에서 컨텍스트를 빌리고 조회가 끝나면 반납하는 스크래퍼"""
+
+    def __init__(self, cookies: Dict, pool: BrowserContextPool, **kwargs):
+        super().__init__(cookies, **kwargs)
+        self.pool = pool
+        self.usage_metrics = False  # 계정마다 같은 구간 지표를 덮어쓰지 않도록
+
+    async def _start_browser(self):
+        if self.context:
+            return
+        self.context = await self.pool.acquire(**self.profile.context_options())
+        try:
+            await self._inject_cookies()
+            self.page = await self.context.new_page()
+        except BaseException:
+            await self._stop_browser()
+            raise
+
+    async def _stop_browser(self):
+        context = self.context
+        self.page = None
+        self.context = None
+        if context is not None:
+            await self.pool.release(context)
+
+    async def _check_browser(self):
+        pass  # 재시작 판단은 풀이 함
+
+    async def _create_context(self):
+        # 쿠키가 바뀌면 다음 대여 때 새 컨텍스트로
+        await self._stop_browser()
+
+    async def fetch_usage_data(self) -> Optional[UsageData]:
+        try:
+            return await super().fetch_usage_data()
+        finally:
+            await self._stop_browser()
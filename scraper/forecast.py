@@ -0,0 +1,175 @@
+"""사용량 소진 시점 예측 (구간별 지수가중 이동 선형회귀, 샘플당 O(1) 갱신)"""
+import time
+from typing import Dict, Iterable, Optional
+
+from scraper.usage_playwright import UsageData
+
+
+WEEKLY_HALF_LIFE = 6 * 60 * 60
+
+# 구간별 가중치 반감기 (초) - 오래된 샘플일수록 영향 감소
+HALF_LIFE = {
+    'current_session': 20 * 60,
+    'weekly_all': WEEKLY_HALF_LIFE,
+    'weekly_sonnet': WEEKLY_HALF_LIFE,
+}
+DEFAULT_HALF_LIFE = 60 * 60
+MIN_RATE = 0.01 / 3600   # %/초 - 이보다 느리면 증가 없음으로 취급
+
+
+class _Regression:
+    """지수가중 최소제곱 (누적합만 유지)"""
+
+    __slots__ = ('half_life', 't0', 'sw', 'sx', 'sy', 'sxx', 'sxy', 'last_t', 'last_y', 'reset')
+
+    def __init__(self, half_life: float):
+        self.half_life = half_life
+        self.clear()
+
+    def clear(self):
+        self.t0 = None
+        self.sw = self.sx = self.sy = self.sxx = self.sxy = 0.0
+        self.last_t = None
+        self.last_y = None
+        self.reset = None
+
+    def add(self, t: float, y: float):
+        if self.t0 is None:
+            self.t0 = t
+        if self.last_t is not None and t > self.last_t:
+            decay = 0.5 ** ((t - self.last_t) / self.half_life)
+            self.sw *= decay
+            self.sx *= decay
+            self.sy *= decay
+            self.sxx *= decay
+            self.sxy *= decay
+        x = t - self.t0
+        self.sw += 1
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.sxy += x * y
+        self.last_t = t
+        self.last_y = y
+
+    def slope(self) -> Optional[float]:
+        """기울기 (%/초), 샘플 부족 시 None"""
+        denom = self.sw * self.sxx - self.sx * self.sx
+        if self.sw < 1.5 or denom <= 1e-9:
+            return None
+        return (self.sw * self.sxy - self.sx * self.sy) / denom
+
+
+class Forecast:
+    """구간 하나의 예측 결과"""
+
+    def __init__(self, bucket: str, percent: float, rate: Optional[float],
+                 limit_at: Optional[float], reset_at: Optional[float]):
+        self.bucket = bucket
+        self.percent = percent
+        self.rate = rate            # %/초 (None = 아직 모름)
+        self.limit_at = limit_at    # 100% 도달 예상 epoch (None = 도달 안 함)
+        self.reset_at = reset_at    # 재설정 epoch
+
+    @property
+    def hits_before_reset(self) -> bool:
+        """재설정 전에 한도 도달 예상 여부"""
+        if self.limit_at is None:
+            return False
+        return self.reset_at is None or self.limit_at < self.reset_at
+
+    def describe(self, now: Optional[float] = None) -> str:
+        """표시용 문구"""
+        now = now if now is not None else time.time()
+        if self.percent >= 100:
+            return "limit reached"
+        if self.rate is None:
+            return ""
+        if self.hits_before_reset:
+            return f"will hit limit in ~{format_duration(self.limit_at - now)}"
+        if self.reset_at is not None:
+            return "safe until reset"
+        return "stable"
+
+    def to_dict(self) -> Dict:
+        return {
+            'bucket': self.bucket,
+            'percent': self.percent,
+            'rate_per_hour': self.rate * 3600 if self.rate is not None else None,
+            'limit_at': self.limit_at,
+            'reset_at': self.reset_at,
+            'hits_before_reset': self.hits_before_reset,
+            'summary': self.describe(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Forecast':
+        """to_dict() 결과에서 복원 (다른 인스턴스가 게시한 스냅샷)"""
+        rate = data.get('rate_per_hour')
+        return cls(data['bucket'], data['percent'], rate / 3600 if rate is not None else None,
+                   data.get('limit_at'), data.get('reset_at'))
+
+
+def format_duration(seconds: float) -> str:
+    """짧은 기간 표기 (42m, 3h 10m, 2d 4h)"""
+    minutes = max(int(seconds // 60), 1)
+    if minutes < 60:
+        return f"{minutes}m"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours}h {minutes}m"
+    days, hours = divmod(hours, 24)
+    return f"{days}d {hours}h"
+
+
+class UsageForecaster:
+    """구간별 회귀 상태 유지 + 예측"""
+
+    def __init__(self):
+        self._models: Dict[str, _Regression] = {}
+
+    def _model(self, bucket: str) -> _Regression:
+        model = self._models.get(bucket)
+        if model is None:
+            default = WEEKLY_HALF_LIFE if bucket.startswith('weekly_') else DEFAULT_HALF_LIFE
+            model = _Regression(HALF_LIFE.get(bucket, default))
+            self._models[bucket] = model
+        return model
+
+    def add_sample(self, bucket: str, t: float, percent: float, reset_at: Optional[float]):
+        """샘플 하나 반영 - 재설정이 일어났으면 회귀를 새로 시작"""
+        model = self._model(bucket)
+        if model.last_t is not None:
+            if t < model.last_t:
+                return
+            reset_moved = (reset_at is not None and model.reset is not None
+                           and abs(reset_at - model.reset) > 60)
+            if percent < model.last_y - 1 or reset_moved:
+                model.clear()
+        model.reset = reset_at
+        model.add(t, percent)
+
+    def update(self, data: UsageData, now: Optional[float] = None) -> Dict[str, Forecast]:
+        """새 UsageData 반영 후 전체 예측 반환"""
+        now = now if now is not None else time.time()
+        for bucket, (percent, reset) in data.buckets.items():
+            self.add_sample(bucket, now, percent, reset.timestamp() if reset else None)
+        return self.forecasts()
+
+    def seed(self, samples: Iterable):
+        """기록(history)으로 초기 상태 구성"""
+        for sample in samples:
+            for bucket, (percent, reset_at) in sample.buckets.items():
+                self.add_sample(bucket, sample.timestamp, percent, reset_at)
+
+    def forecasts(self) -> Dict[str, Forecast]:
+        result = {}
+        for bucket, model in self._models.items():
+            if model.last_t is None:
+                continue
+            rate = model.slope()
+            limit_at = None
+            if rate is not None and rate > MIN_RATE and model.last_y < 100:
+                limit_at = model.last_t + (100 - model.last_y) / rate
+            result[bucket] = Forecast(bucket, model.last_y, rate, limit_at, model.reset)
+        return result
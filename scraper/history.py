@@ -0,0 +1,357 @@
+"""사용량 시계열 기록 (고정 길이 레코드, 추가 전용)
+
+파일 구조: 256바이트 헤더(매직 + 구간 이름) + 레코드 배열
+레코드: 시각(uint32) + 구간별 [사용률 x100 (uint16), 재설정 시각 (uint32, 0=없음)]
+레코드는 시간순으로만 추가되므로 범위 조회는 이진 탐색 + 순차 읽기로 처리한다.
+API 에 새 구간이 생기면 헤더에 이름을 덧붙여 파일을 한 번 다시 쓴다 (기존 레코드의 새 구간 값은 0).
+"""
+import logging
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from scraper.usage_playwright import BUCKET_KEYS, UsageData
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b'OMCH'
+VERSION = 1
+HEADER_SIZE = 256
+
+RAW_RETENTION = 7 * 24 * 60 * 60         # 원본 해상도 유지 기간
+HOURLY_RETENTION = 180 * 24 * 60 * 60    # 시간 단위 롤업 유지 기간
+HEARTBEAT = 60 * 60                      # 값이 같아도 이 간격마다 한 번은 기록
+COMPACT_EVERY = 24 * 60 * 60             # 보존/다운샘플링 주기
+CHUNK_RECORDS = 4096                     # 파일 처리 단위 (메모리 상한)
+
+
+class HistorySample(NamedTuple):
+    """기록 샘플 한 개"""
+    timestamp: float
+    buckets: Dict[str, Tuple[float, Optional[float]]]  # 구간 → (사용률 %, 재설정 epoch)
+
+
+class _RecordFile:
+    """고정 길이 레코드 파일 하나"""
+
+    def __init__(self, path: Path, bucket_keys: Sequence[str]):
+        self.path = path
+        self._set_keys(bucket_keys)
+
+    def _set_keys(self, bucket_keys: Sequence[str]):
+        self.bucket_keys = tuple(bucket_keys)
+        self.record = struct.Struct('<I' + 'HI' * len(self.bucket_keys))
+
+    def _header(self) -> bytes:
+        names = ','.join(self.bucket_keys).encode('utf-8')
+        header = MAGIC + bytes([VERSION, len(self.bucket_keys)]) + names
+        if len(header) > HEADER_SIZE:
+            raise ValueError("구간 이름이 헤더 크기를 넘습니다")
+        return header.ljust(HEADER_SIZE, b'\0')
+
+    @staticmethod
+    def _parse_header(header: bytes) -> Optional[Tuple[str, ...]]:
+        """헤더의 구간 이름 (형식이 다르면 None)"""
+        if len(header) < 6 or header[:4] != MAGIC or header[4] != VERSION:
+            return None
+        names = header[6:].rstrip(b'\0').decode('utf-8', 'replace')
+        keys = tuple(names.split(',')) if names else ()
+        return keys if len(keys) == header[5] else None
+
+    def ensure(self):
+        """헤더 확인 / 생성 (기존 파일은 그 파일의 구간 구성을 따름)"""
+        if self.path.exists():
+            with open(self.path, 'rb') as f:
+                keys = self._parse_header(f.read(HEADER_SIZE))
+            if keys is not None:
+                self._set_keys(keys)
+                return
+            logger.warning("기록 파일 형식이 달라 새로 만듭니다: %s", self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'wb') as f:
+            f.write(self._header())
+
+    def extend(self, new_keys: Sequence[str]):
+        """구간 추가 - 새 레이아웃으로 전체를 다시 씀 (드문 작업)"""
+        keys = self.bucket_keys + tuple(k for k in new_keys if k not in self.bucket_keys)
+        if keys != self.bucket_keys:
+            self.rewrite(self.scan(), keys)
+
+    def count(self) -> int:
+        try:
+            return max(os.path.getsize(self.path) - HEADER_SIZE, 0) // self.record.size
+        except OSError:
+            return 0
+
+    def pack(self, sample: HistorySample) -> bytes:
+        values = []
+        for key in self.bucket_keys:
+            percent, reset = sample.buckets.get(key, (0.0, None))
+            values.append(min(max(int(round(percent * 100)), 0), 0xFFFF))
+            values.append(int(reset) if reset else 0)
+        return self.record.pack(int(sample.timestamp), *values)
+
+    def unpack(self, raw: bytes) -> HistorySample:
+        fields = self.record.unpack(raw)
+        buckets = {}
+        for i, key in enumerate(self.bucket_keys):
+            percent, reset = fields[1 + i * 2], fields[2 + i * 2]
+            buckets[key] = (percent / 100, float(reset) if reset else None)
+        return HistorySample(float(fields[0]), buckets)
+
+    def append(self, samples: List[HistorySample]):
+        if samples:
+            with open(self.path, 'ab') as f:
+                f.write(b''.join(self.pack(s) for s in samples))
+
+    def read_last(self) -> Optional[HistorySample]:
+        n = self.count()
+        if n == 0:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(HEADER_SIZE + (n - 1) * self.record.size)
+            return self.unpack(f.read(self.record.size))
+
+    def open(self) -> Optional["_Reader"]:
+        """지금 파일의 읽기 전용 뷰 (파일이 없거나 형식이 다르면 None)"""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return None
+        try:
+            # 레이아웃은 열린 파일의 헤더 기준 - 이후 교체 / 구간 확장과 무관
+            keys = self._parse_header(f.read(HEADER_SIZE))
+            if keys is None:
+                f.close()
+                logger.warning("기록 파일 형식이 달라 읽지 않습니다: %s", self.path)
+                return None
+            layout = _RecordFile(self.path, keys)  # self 의 레이아웃은 구간 추가 시 바뀜
+            n = max(os.fstat(f.fileno()).st_size - HEADER_SIZE, 0) // layout.record.size
+        except BaseException:
+            f.close()
+            raise
+        return _Reader(f, layout, n)
+
+    def scan(self, start: float = 0, end: float = float('inf')) -> Iterator[HistorySample]:
+        """[start, end) 범위 레코드를 청크 단위로 읽기"""
+        reader = self.open()
+        if reader is None:
+            return
+        with reader:
+            yield from reader.scan(start, end)
+
+    def rewrite(self, samples: Iterator[HistorySample], bucket_keys: Optional[Sequence[str]] = None):
+        """조건에 맞는 레코드만 남기고 교체 (스트리밍). bucket_keys 를 주면 그 레이아웃으로"""
+        target = _RecordFile(self.path, bucket_keys) if bucket_keys is not None else self
+        tmp = self.path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(target._header())
+            batch = []
+            for sample in samples:
+                batch.append(target.pack(sample))
+                if len(batch) >= CHUNK_RECORDS:
+                    f.write(b''.join(batch))
+                    batch = []
+            f.write(b''.join(batch))
+        os.replace(tmp, self.path)
+        if target is not self:
+            self._set_keys(target.bucket_keys)
+
+
+class _Reader:
+    """열어 둔 기록 파일 하나 (연 시점의 레이아웃 / 레코드 수로 고정)
+
+    읽는 동안 append 가 정리(_compact)나 구간 추가로 파일을 교체해도 열린 파일은 그대로이므로
+    다른 스레드(추세 그래프, 내보내기)의 읽기가 레코드 중간에서 끊기지 않는다.
+    """
+
+    def __init__(self, f, layout: _RecordFile, n: int):
+        self.f = f
+        self.layout = layout
+        self.n = n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.f.close()
+
+    def _timestamp_at(self, index: int) -> int:
+        self.f.seek(HEADER_SIZE + index * self.layout.record.size)
+        return struct.unpack('<I', self.f.read(4))[0]
+
+    def _lower_bound(self, ts: float) -> int:
+        """timestamp >= ts 인 첫 레코드 번호 (이진 탐색)"""
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamp_at(mid) < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def first(self) -> Optional[HistorySample]:
+        if self.n == 0:
+            return None
+        self.f.seek(HEADER_SIZE)
+        return self.layout.unpack(self.f.read(self.layout.record.size))
+
+    def scan(self, start: float = 0, end: float = float('inf')) -> Iterator[HistorySample]:
+        """[start, end) 범위 레코드를 청크 단위로 읽기"""
+        n = self.n
+        if n == 0:
+            return
+        size = self.layout.record.size
+        f = self.f
+        index = self._lower_bound(start) if start > 0 else 0
+        f.seek(HEADER_SIZE + index * size)
+        while index < n:
+            chunk = f.read(min(CHUNK_RECORDS, n - index) * size)
+            if not chunk:
+                return
+            for offset in range(0, len(chunk) - size + 1, size):
+                sample = self.layout.unpack(chunk[offset:offset + size])
+                if sample.timestamp >= end:
+                    return
+                yield sample
+            index += len(chunk) // size
+
+
+class UsageHistory:
+    """원본(최근) + 시간 단위 롤업(장기) 두 파일로 구성된 사용량 기록"""
+
+    def __init__(self, directory: Path = Path("config"), bucket_keys: Sequence[str] = BUCKET_KEYS):
+        # 새 파일의 기본 구간 (기존 파일은 헤더의 구성을 따르고 새 구간이 오면 확장)
+        self.raw = _RecordFile(directory / "history.bin", bucket_keys)
+        self.hourly = _RecordFile(directory / "history_hourly.bin", bucket_keys)
+        self._lock = threading.Lock()
+        self._last: Optional[HistorySample] = None
+        self._last_compact = 0.0
+        self._opened = False
+
+    def _open(self):
+        if self._opened:
+            return
+        self.raw.ensure()
+        self.hourly.ensure()
+        self._last = self.raw.read_last()
+        self._opened = True
+
+    @staticmethod
+    def sample_from(data: UsageData, timestamp: Optional[float] = None) -> HistorySample:
+        """UsageData → 기록 샘플"""
+        if timestamp is None:
+            timestamp = data.last_updated.timestamp() if data.last_updated else time.time()
+        buckets = {
+            key: (percent, reset.timestamp() if reset else None)
+            for key, (percent, reset) in data.buckets.items()
+        }
+        return HistorySample(timestamp, buckets)
+
+    def append(self, data: UsageData, timestamp: Optional[float] = None) -> bool:
+        """샘플 추가 (직전과 같으면 건너뜀). 기록했으면 True"""
+        sample = self.sample_from(data, timestamp)
+        with self._lock:
+            self._open()
+            if any(k not in self.raw.bucket_keys for k in sample.buckets):
+                self._extend(sample.buckets)
+            last = self._last
+            if last is not None:
+                if sample.timestamp < last.timestamp:
+                    return False  # 시간 역행 (시계 변경 등) - 순서 유지를 위해 버림
+                if (self._same_values(last, sample)
+                        and sample.timestamp - last.timestamp < HEARTBEAT):
+                    return False
+            self.raw.append([sample])
+            self._last = sample
+
+            if sample.timestamp - self._last_compact >= COMPACT_EVERY:
+                self._compact(sample.timestamp)
+        return True
+
+    def _extend(self, keys: Sequence[str]):
+        """새 구간을 두 파일 헤더에 추가"""
+        try:
+            self.raw.extend(keys)
+            self.hourly.extend(keys)
+        except (OSError, ValueError) as e:
+            # 실패하면 기존 구간만 계속 기록
+            logger.warning("기록 구간 추가 실패: %s", e)
+
+    def _same_values(self, a: HistorySample, b: HistorySample) -> bool:
+        """저장 해상도 기준으로 값이 같은지"""
+        return self.raw.pack(a._replace(timestamp=0)) == self.raw.pack(b._replace(timestamp=0))
+
+    def compact(self, now: Optional[float] = None):
+        """보존 기간 정리 + 오래된 원본을 시간 단위로 롤업"""
+        with self._lock:
+            self._open()
+            self._compact(now if now is not None else time.time())
+
+    def _compact(self, now: float):
+        self._last_compact = now
+        try:
+            self._rotate(now)
+        except OSError as e:
+            # 다른 곳에서 파일을 읽는 중이면 (Windows) 다음 주기에 다시 시도
+            logger.warning("기록 정리 실패: %s", e)
+
+    def _rotate(self, now: float):
+        raw_cutoff = now - RAW_RETENTION
+        raw_cutoff -= raw_cutoff % 3600  # 시간 경계에서 자름 (롤업 구간이 쪼개지지 않도록)
+
+        first = next(self.raw.scan(), None)
+        if first is not None and first.timestamp < raw_cutoff:
+            last_hour = self.hourly.read_last()
+            rollup_from = last_hour.timestamp + 3600 if last_hour else 0
+            self.hourly.append(list(self._rollup(self.raw.scan(rollup_from, raw_cutoff))))
+            self.raw.rewrite(self.raw.scan(raw_cutoff))
+
+        hourly_cutoff = now - HOURLY_RETENTION
+        first_hour = next(self.hourly.scan(), None)
+        if first_hour is not None and first_hour.timestamp < hourly_cutoff:
+            self.hourly.rewrite(self.hourly.scan(hourly_cutoff))
+
+    def _rollup(self, samples: Iterator[HistorySample]) -> Iterator[HistorySample]:
+        """시간 단위 집계 (구간별 최대 사용률 + 마지막 재설정 시각)"""
+        hour = None
+        acc: Dict[str, Tuple[float, Optional[float]]] = {}
+        for sample in samples:
+            sample_hour = sample.timestamp - sample.timestamp % 3600
+            if hour is not None and sample_hour != hour:
+                yield HistorySample(hour, acc)
+                acc = {}
+            hour = sample_hour
+            for key, (percent, reset) in sample.buckets.items():
+                prev = acc.get(key)
+                acc[key] = (max(percent, prev[0]) if prev else percent, reset)
+        if hour is not None:
+            yield HistorySample(hour, acc)
+
+    def query(self, start: float, end: Optional[float] = None) -> Iterator[HistorySample]:
+        """[start, end) 구간 샘플 (오래된 구간은 시간 단위 롤업, 최근 구간은 원본) - 파일을 만들거나 고치지 않음"""
+        end = end if end is not None else time.time() + 1
+        with self._lock:
+            # 두 파일을 같은 시점에 열어 둠 - 읽는 중 정리가 원본을 롤업으로 옮겨도 빠지거나 겹치지 않음
+            # 읽기 전용: 파일이 없거나 형식이 다르면 그 파일은 건너뜀 (ensure() 처럼 새로 만들지 않음)
+            raw = self.raw.open()
+            hourly = self.hourly.open()
+        try:
+            first_raw = raw.first() if raw else None
+            raw_start = first_raw.timestamp if first_raw else end
+            if hourly and start < raw_start:
+                yield from hourly.scan(start, min(end, raw_start))
+            if raw and end > raw_start:
+                yield from raw.scan(max(start, raw_start), end)
+        finally:
+            for reader in (raw, hourly):
+                if reader:
+                    reader.close()
@@ -0,0 +1,199 @@
+"""Claude.ai API 조회 백엔드 (브라우저 없는 HTTP + Playwright 폴백)"""
+import email.utils
+import gzip
+import http.client
+import json
+import threading
+import zlib
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie, CookieError
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Cloudflare 챌린지 페이지에 나타나는 표식
+CHALLENGE_MARKERS = (b'challenge-platform', b'cf-chl', b'Just a moment', b'cf_chl_opt')
+
+
+class FetchResponse:
+    """백엔드 공통 응답"""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = {k.lower(): v for k, v in headers.items()}
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초, 없으면 None"""
+        value = self.headers.get('retry-after', '').strip()
+        if not value:
+            return None
+        if value.isdigit():
+            return float(value)
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    @property
+    def is_challenge(self) -> bool:
+        """Cloudflare 챌린지 응답 여부"""
+        if self.headers.get('cf-mitigated', '').lower() == 'challenge':
+            return True
+        if self.status not in (403, 429, 503):
+            return False
+        if 'text/html' not in self.headers.get('content-type', ''):
+            return False
+        head = self.body[:4096]
+        return any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class FetchBackend:
+    """조회 백엔드 인터페이스"""
+
+    name = "base"
+
+    def get(self, url: str, timeout: float = 30) -> FetchResponse:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HttpFetchBackend(FetchBackend):
+    """keep-alive 연결 풀을 사용하는 브라우저 없는 백엔드 (저장된 쿠키 재사용)"""
+
+    name = "http"
+
+    def __init__(self, cookies: Dict, pool_size: int = 2, referer: str = 'https://claude.ai/'):
+        self.cookies = dict(cookies)
+        self.pool_size = pool_size
+        self.referer = referer
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def update_cookies(self, cookies: Dict):
+        """쿠키 교체 (재로그인 / 새 clearance 획득 시)"""
+        with self._lock:
+            self.cookies = dict(cookies)
+
+    def _acquire(self, origin: Tuple[str, str], timeout: float) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(origin)
+            if idle:
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn
+        scheme, host = origin
+        # http 는 로컬 가짜 서버(벤치마크)용
+        conn_class = http.client.HTTPConnection if scheme == 'http' else http.client.HTTPSConnection
+        return conn_class(host, timeout=timeout)
+
+    def _release(self, origin: Tuple[str, str], conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(origin, [])
+            if len(idle) < self.pool_size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _headers(self) -> Dict[str, str]:
+        with self._lock:
+            cookie_header = '; '.join(f"{k}={v}" for k, v in self.cookies.items())
+        return {
+            'User-Agent': USER_AGENT,
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Referer': self.referer,
+            'Connection': 'keep-alive',
+            'Cookie': cookie_header,
+        }
+
+    def _store_set_cookies(self, raw_headers: List[Tuple[str, str]]):
+        """Set-Cookie 반영 (cf_clearance, __cf_bm 갱신 등)"""
+        updates = {}
+        for name, value in raw_headers:
+            if name.lower() != 'set-cookie':
+                continue
+            try:
+                parsed = SimpleCookie()
+                parsed.load(value)
+            except CookieError:
+                continue
+            for morsel in parsed.values():
+                updates[morsel.key] = morsel.value
+        if updates:
+            with self._lock:
+                self.cookies.update(updates)
+
+    def get(self, url: str, timeout: float = 30) -> FetchResponse:
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.netloc)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        headers = self._headers()
+
+        # 풀에서 꺼낸 연결이 서버 측에서 끊겼을 수 있으므로 한 번 재시도
+        for attempt in range(2):
+            conn = self._acquire(origin, timeout)
+            try:
+                conn.request('GET', path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise
+
+            raw_headers = resp.getheaders()
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(origin, conn)
+            break
+
+        self._store_set_cookies(raw_headers)
+
+        encoding = resp.getheader('Content-Encoding', '').lower()
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+
+        return FetchResponse(resp.status, dict(raw_headers), body)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class PlaywrightFetchBackend(FetchBackend):
+    """Playwright 페이지의 request API를 사용하는 백엔드"""
+
+    name = "playwright"
+
+    def __init__(self, page):
+        self.page = page
+
+    def get(self, url: str, timeout: float = 30) -> FetchResponse:
+        response = self.page.request.get(url, timeout=timeout * 1000)
+        return FetchResponse(response.status, response.headers, response.body())
+
@@ -0,0 +1,131 @@
+"""인스턴스 간 조회 담당(리더) 선출 - config 디렉터리(세션)당 claude.ai 조회는 한 프로세스만
+
+잠금 파일에 비차단 배타 잠금을 건 프로세스가 리더가 되어 조회하고, 매 결과를
+config/snapshot.json 에 원자적으로 게시한다. 나머지 인스턴스(팔로워)는 Chromium 을
+띄우지 않고 스냅샷 파일이 바뀐 경우에만 읽으며, FOLLOW_INTERVAL 마다 잠금을 다시 시도한다.
+잠금은 OS 가 관리하므로 리더가 비정상 종료해도 즉시 풀리고 다음 시도에서 팔로워가 이어받는다.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from scraper.retry import MAX_COOLDOWN, MAX_RETRY_AFTER
+from scraper.scheduler import MAX_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+if sys.platform == 'win32':
+    import msvcrt
+
+    def _lock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+FOLLOW_INTERVAL = 5.0          # 팔로워: 스냅샷 확인 + 잠금 재시도 간격 (초, 최소 조회 간격보다 짧게)
+# 이보다 오래된 스냅샷은 이전 실행의 잔재로 보고 무시 (초)
+# 살아 있는 리더도 회로 차단 / Retry-After 대기 중에는 게시가 멈추므로 최장 대기 + 최대 조회 간격
+SNAPSHOT_MAX_AGE = max(MAX_COOLDOWN, MAX_RETRY_AFTER) + MAX_INTERVAL
+
+
+class Leadership:
+    """잠금 파일 기반 리더 선출 + 스냅샷 게시 / 구독"""
+
+    def __init__(self, directory: Path = Path("config")):
+        self.lock_path = directory / "poller.lock"
+        self.snapshot_path = directory / "snapshot.json"
+        self.is_leader = False
+        self._lock_file = None
+        self._seen: Optional[tuple] = None  # 마지막으로 읽은 스냅샷 파일 (mtime_ns, size)
+
+    def acquire(self) -> bool:
+        """리더 잠금 시도 (비차단). 이미 리더면 True"""
+        if self.is_leader:
+            return True
+        try:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(self.lock_path, 'a+b')
+        except OSError as e:
+            # 잠금 파일을 만들 수 없으면 조정 없이 단독 실행으로 동작
+            logger.warning("리더 잠금 파일을 열 수 없어 단독으로 조회합니다: %s", e)
+            self.is_leader = True
+            return True
+        try:
+            _lock(f)
+        except OSError:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()).encode('ascii'))
+        f.flush()
+        self._lock_file = f
+        self.is_leader = True
+        return True
+
+    def release(self):
+        """잠금 해제 (리더가 아니면 무시)"""
+        f, self._lock_file = self._lock_file, None
+        self.is_leader = False
+        if f is None:
+            return
+        try:
+            _unlock(f)
+        except OSError:
+            pass
+        f.close()
+
+    def leader_pid(self) -> Optional[int]:
+        """현재 리더 프로세스 ID (로그 표시용)"""
+        try:
+            return int(self.lock_path.read_text(encoding='ascii').strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def publish(self, snapshot: Dict):
+        """리더: 스냅샷 게시 (임시 파일에 쓰고 교체 - 팔로워가 반쯤 쓴 파일을 읽지 않도록)"""
+        if not self.is_leader:
+            return
+        tmp = self.snapshot_path.with_suffix('.tmp')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp, self.snapshot_path)
+        except OSError as e:
+            # Windows 에서 팔로워가 읽는 중이면 교체가 실패할 수 있음 - 다음 게시에서 다시
+            logger.debug("스냅샷 게시 실패: %s", e)
+
+    def read_snapshot(self, max_age: float = SNAPSHOT_MAX_AGE) -> Optional[Dict]:
+        """팔로워: 지난번 이후 바뀐 스냅샷 (바뀌지 않았거나 너무 오래됐으면 None)"""
+        try:
+            stat = os.stat(self.snapshot_path)
+        except OSError:
+            return None
+        seen = (stat.st_mtime_ns, stat.st_size)
+        if seen == self._seen:
+            return None
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._seen = seen
+        if not isinstance(snapshot, dict) or time.time() - snapshot.get('updated_at', 0) > max_age:
+            return None
+        return snapshot
@@ -0,0 +1,221 @@
+"""OpenMetrics(Prometheus) 지표
+
+지표는 프로세스 전역 REGISTRY 에 모이고 /metrics 요청 때만 텍스트로 직렬화된다.
+API 서버가 켜지기 전(REGISTRY.enabled = False)에는 기록 호출이 속성 확인 한 번으로 끝난다.
+"""
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# 요청 지연 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Registry:
+    """지표 목록 + 활성화 여부"""
+
+    def __init__(self):
+        self.enabled = False
+        self._metrics: List["_Metric"] = []
+
+    def register(self, metric: "_Metric") -> "_Metric":
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> bytes:
+        """OpenMetrics 텍스트 (수집 요청 때만 호출)"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        lines.append("# EOF\n")
+        return "\n".join(lines).encode('utf-8')
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "unknown"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 registry: Registry = REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._registry = registry
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터 (이름에 _total 이 붙어 노출)"""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {} if self.labelnames else {(): 0}
+
+    def inc(self, *labels, amount: float = 1):
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}_total{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in items]
+
+
+class Gauge(_Metric):
+    """현재 값 - set() 또는 수집 시점에 계산하는 함수(set_function)"""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {} if self.labelnames else {(): 0}
+        self._function: Optional[Callable[[Tuple, float], float]] = None
+
+    def set(self, value: float, *labels):
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = value
+
+    def remove(self, *labels):
+        with self._lock:
+            self._values.pop(labels, None)
+
+    def set_function(self, function: Callable[[Tuple, float], float]):
+        """저장된 값 대신 function(labels, value) 결과를 노출 (예: 남은 시간)"""
+        self._function = function
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        if self._function:
+            items = [(k, self._function(k, v)) for k, v in items]
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in items]
+
+
+class Histogram(_Metric):
+    """누적 구간 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple, List] = {}  # labels → [구간별 개수..., +Inf 개수, 합]
+
+    def observe(self, value: float, *labels):
+        if not self._registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+        return lines
+
+
+# ── 지표 정의 ──
+
+REQUEST_LATENCY = Histogram(
+    "claude_usage_request_duration_seconds", "claude.ai API request latency",
+    labelnames=("endpoint",)
+)
+REQUESTS = Counter(
+    "claude_usage_requests", "claude.ai API responses by HTTP status",
+    labelnames=("endpoint", "status")
+)
+FETCHES = Counter(
+    "claude_usage_fetches", "Usage polls by outcome and last HTTP status",
+    labelnames=("result", "status")
+)
+CONTEXT_RECREATIONS = Counter(
+    "claude_usage_browser_context_recreations", "Browser contexts rebuilt for new cookies"
+)
+BROWSER_RECYCLES = Counter(
+    "claude_usage_browser_recycles", "Browser restarts triggered by the watchdog"
+)
+BROWSER_RSS = Gauge(
+    "claude_usage_browser_rss_bytes", "RSS of the Playwright driver and Chromium process tree"
+)
+BUCKET_UTILIZATION = Gauge(
+    "claude_usage_utilization_percent", "Current utilization per usage bucket",
+    labelnames=("bucket",)
+)
+BUCKET_RESET = Gauge(
+    "claude_usage_seconds_to_reset", "Seconds until the usage bucket resets",
+    labelnames=("bucket",)
+)
+# 재설정 시각(epoch)을 저장해 두고 남은 시간은 수집 시점에 계산
+BUCKET_RESET.set_function(lambda labels, resets_at: round(max(resets_at - time.time(), 0.0), 3))
+
+
+def observe_request(endpoint: str, status: Optional[int], started: float):
+    """API 요청 하나 기록 (started: time.perf_counter() 값)"""
+    if not REGISTRY.enabled:
+        return
+    REQUEST_LATENCY.observe(time.perf_counter() - started, endpoint)
+    REQUESTS.inc(endpoint, str(status) if status is not None else "none")
+
+
+def observe_usage(buckets: Dict[str, tuple]):
+    """파싱된 구간별 사용률 / 재설정 시각 기록"""
+    if not REGISTRY.enabled:
+        return
+    for key, (percent, reset) in buckets.items():
+        BUCKET_UTILIZATION.set(percent, key)
+        if reset is not None:
+            BUCKET_RESET.set(reset.timestamp(), key)
+        else:
+            BUCKET_RESET.remove(key)
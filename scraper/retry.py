@@ -0,0 +1,105 @@
+"""조회 실패 시 재시도 정책 (지터 지수 백오프 + Retry-After + 회로 차단기)
+
+closed     정상. 실패하면 지수 백오프(지터 포함)로 기본 주기보다 빨리 재시도
+open       연속 실패가 쌓이면 일정 시간 요청을 보내지 않음 (장애 중 서버를 두드리지 않도록)
+half-open  대기 후 시험 요청 1회 - 성공하면 closed, 실패하면 더 긴 대기로 다시 open
+"""
+import logging
+import random
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+BASE_BACKOFF = 10            # 첫 재시도 대기 (초)
+MAX_BACKOFF = 5 * 60         # 재시도 대기 상한 (초)
+FAILURE_THRESHOLD = 5        # 연속 실패 → 회로 열림
+BREAKER_COOLDOWN = 5 * 60    # 회로가 열린 뒤 시험 요청까지 (초)
+MAX_COOLDOWN = 30 * 60       # 시험 요청이 계속 실패할 때 대기 상한 (초)
+MAX_RETRY_AFTER = 60 * 60    # 서버가 준 Retry-After 상한 (초)
+AUTH_FAILURE_LIMIT = 3       # 연속 401/403 → 세션 만료로 판단
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class FetchPolicy:
+    """다음 조회까지의 대기 시간을 실패 이력으로 조정"""
+
+    def __init__(self, base_backoff: float = BASE_BACKOFF, max_backoff: float = MAX_BACKOFF,
+                 threshold: int = FAILURE_THRESHOLD, cooldown: float = BREAKER_COOLDOWN,
+                 rng: Callable[[], float] = random.random):
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self._rng = rng
+        self.failures = 0          # 연속 실패
+        self.auth_failures = 0     # 연속 401/403
+        self.cooldown = cooldown
+        self.open_until: Optional[float] = None
+        self.retry_at: Optional[float] = None  # Retry-After 로 받은 다음 허용 시각
+
+    @property
+    def state(self) -> str:
+        if self.open_until is None:
+            return CLOSED
+        return OPEN if time.time() < self.open_until else HALF_OPEN
+
+    def record_success(self):
+        """성공 - 회로 닫고 백오프 초기화"""
+        if self.open_until is not None:
+            logger.info("✓ 조회 복구 - 회로 닫힘")
+        self.failures = 0
+        self.auth_failures = 0
+        self.cooldown = self.base_cooldown
+        self.open_until = None
+        self.retry_at = None
+
+    def record_failure(self, status: Optional[int] = None, retry_after: Optional[float] = None,
+                       now: Optional[float] = None):
+        """실패 기록 (status: HTTP 상태, 없으면 네트워크 오류 / 시간 초과)"""
+        now = now if now is not None else time.time()
+        was_probe = self.open_until is not None and now >= self.open_until
+        self.failures += 1
+        self.auth_failures = self.auth_failures + 1 if status in (401, 403) else 0
+        self.retry_at = now + min(retry_after, MAX_RETRY_AFTER) if retry_after is not None else None
+
+        if was_probe:
+            # 시험 요청 실패 → 더 오래 쉼
+            self.cooldown = min(self.cooldown * 2, MAX_COOLDOWN)
+            self._open(now)
+        elif self.open_until is None and self.failures >= self.threshold:
+            self._open(now)
+
+    def _open(self, now: float):
+        # 여러 인스턴스가 동시에 복구 요청을 보내지 않도록 대기에도 지터
+        self.open_until = now + self.cooldown * (0.8 + 0.4 * self._rng())
+        logger.warning("연속 %d회 실패 - %.0f초 동안 조회 중단", self.failures, self.open_until - now)
+
+    def next_delay(self, scheduled: float, now: Optional[float] = None) -> float:
+        """다음 조회까지 대기 (실패가 없으면 스케줄러가 정한 scheduled 그대로)"""
+        now = now if now is not None else time.time()
+        if self.failures == 0:
+            return scheduled
+
+        if self.open_until is not None and now < self.open_until:
+            delay = self.open_until - now
+        else:
+            # equal jitter: 상한의 절반은 보장, 나머지 절반은 무작위
+            backoff = min(self.base_backoff * 2 ** (self.failures - 1), self.max_backoff)
+            delay = backoff / 2 + self._rng() * backoff / 2
+        if self.retry_at is not None:
+            delay = max(delay, self.retry_at - now)
+        return max(delay, 1)
+
+    def describe(self, now: Optional[float] = None) -> str:
+        """상태 표시줄용 요약"""
+        now = now if now is not None else time.time()
+        if self.failures == 0:
+            return ""
+        if self.open_until is not None and now < self.open_until:
+            return f"연속 {self.failures}회 실패, 조회 일시 중단"
+        return f"연속 {self.failures}회 실패"
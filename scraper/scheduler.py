@@ -0,0 +1,91 @@
+"""적응형 조회 주기 스케줄러 (사용량 변화 속도 + 재설정 시각 기반)"""
+import math
+import time
+from typing import Dict, Optional
+
+from scraper.usage_playwright import UsageData
+
+
+MIN_INTERVAL = 20           # 빠르게 증가 중이거나 한도 근접 시 (초)
+MAX_INTERVAL = 10 * 60      # 변화 없을 때 최대 (초)
+STRETCH_FACTOR = 1.5        # 변화 없는 조회마다 간격 증가 배율
+FAST_RATE = 20.0            # %/시간 - 이 이상이면 최소 간격
+NEAR_LIMIT = 90.0           # % - 이 이상이면 최소 간격
+WARN_LIMIT = 80.0           # % - 이 이상이면 기본 간격 이하로 유지
+RESET_GRACE = 5             # 재설정 직후 조회까지 여유 (초)
+RATE_SMOOTHING = 0.5        # 속도 지수평활 계수
+
+
+class AdaptiveScheduler:
+    """다음 조회까지의 대기 시간 계산"""
+
+    def __init__(self, base_interval: float = 60, min_interval: float = MIN_INTERVAL,
+                 max_interval: float = MAX_INTERVAL):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.rates: Dict[str, float] = {}      # 구간별 %/시간 (평활)
+        self._last: Optional[Dict[str, tuple]] = None
+        self._last_time: Optional[float] = None
+        self._flat_polls = 0
+        # 이만큼 늘리면 최대 간격에 도달 - 변화 없는 기간이 길어도 거듭제곱이 넘치지 않도록 상한
+        steps = (math.log(max_interval / base_interval) / math.log(STRETCH_FACTOR)
+                 if 0 < base_interval < max_interval else 0)
+        self._max_flat_polls = max(math.ceil(steps), 1)
+
+    def record(self, data: UsageData, now: Optional[float] = None):
+        """새 샘플 반영 (변화 속도 갱신)"""
+        now = now if now is not None else time.time()
+        buckets = data.buckets
+
+        if self._last is not None and now > self._last_time:
+            hours = (now - self._last_time) / 3600
+            changed = False
+            for key, (percent, _) in buckets.items():
+                if key not in self._last:
+                    continue  # 새로 생긴 구간은 다음 조회부터
+                prev = self._last[key].percent
+                # 재설정으로 감소한 경우는 속도 0으로 취급
+                rate = max(percent - prev, 0) / hours
+                if percent != prev:
+                    changed = True
+                old = self.rates.get(key, rate)
+                self.rates[key] = old + RATE_SMOOTHING * (rate - old)
+            self._flat_polls = 0 if changed else min(self._flat_polls + 1, self._max_flat_polls)
+
+        self._last = buckets
+        self._last_time = now
+
+    def next_delay(self, now: Optional[float] = None) -> float:
+        """다음 조회까지 대기 시간 (초)"""
+        now = now if now is not None else time.time()
+        if self._last is None:
+            return self.base_interval
+
+        max_rate = max(self.rates.values(), default=0.0)
+        max_percent = max(percent for percent, _ in self._last.values())
+
+        if max_rate >= FAST_RATE or max_percent >= NEAR_LIMIT:
+            delay = self.min_interval
+        elif max_percent >= WARN_LIMIT or self._flat_polls == 0:
+            # 한도 경고 구간이거나 방금 값이 변함 → 속도에 비례해 간격 축소
+            delay = self.base_interval / (1 + max_rate / FAST_RATE * 2)
+        else:
+            delay = self.base_interval * (STRETCH_FACTOR ** self._flat_polls)
+        delay = min(max(delay, self.min_interval), self.max_interval)
+
+        # 재설정 직후에 바로 조회
+        next_reset = self._next_reset(now)
+        if next_reset is not None and next_reset - now + RESET_GRACE < delay:
+            delay = max(next_reset - now + RESET_GRACE, 1)
+
+        return delay
+
+    def _next_reset(self, now: float) -> Optional[float]:
+        """가장 가까운 미래 재설정 시각 (epoch)"""
+        upcoming = [
+            reset.timestamp()
+            for _, reset in self._last.values()
+            if reset is not None and reset.timestamp() > now
+        ]
+        return min(upcoming, default=None)
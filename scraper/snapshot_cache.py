@@ -0,0 +1,99 @@
+"""마지막 사용량 / 조직 정보 디스크 캐시 (웜 스타트용)"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+USAGE_TTL = 24 * 60 * 60      # 마지막 사용량: 하루 지나면 표시하지 않음
+ORG_TTL = 7 * 24 * 60 * 60    # 조직 ID: 일주일
+
+
+def session_fingerprint(cookies: Optional[Dict]) -> str:
+    """세션 식별용 해시 (다른 계정으로 재로그인하면 캐시 무효)"""
+    session_key = (cookies or {}).get('sessionKey', '')
+    return hashlib.sha256(session_key.encode('utf-8')).hexdigest()[:16]
+
+
+class SnapshotCache:
+    """config/cache.json 에 저장되는 스냅샷 캐시 (항목별 저장 시각 + TTL)"""
+
+    def __init__(self, cache_file: Path = Path("config/cache.json"), session: str = ""):
+        self.cache_file = cache_file
+        self.session = session
+        self._lock = threading.Lock()
+        self._data: Dict = self._read()
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('session') != self.session:
+            return {}
+        return data
+
+    def _write(self):
+        """임시 파일에 쓰고 교체 (중간에 종료돼도 깨지지 않음)"""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            logger.warning("캐시 저장 실패: %s", e)
+
+    def _get(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(name)
+        if not entry:
+            return None
+        if time.time() - entry.get('saved_at', 0) > entry.get('ttl', 0):
+            return None
+        return entry
+
+    def _put(self, entry: str, ttl: int, **values):
+        with self._lock:
+            self._data['session'] = self.session
+            self._data[entry] = {'saved_at': time.time(), 'ttl': ttl, **values}
+            self._write()
+
+    # ── 사용량 ──
+
+    def load_usage(self) -> Optional[Dict]:
+        """마지막 사용량 dict (만료 시 None)"""
+        entry = self._get('usage')
+        return entry['data'] if entry else None
+
+    def save_usage(self, data: Dict):
+        self._put('usage', USAGE_TTL, data=data)
+
+    # ── 조직 ──
+
+    def load_org_id(self) -> Optional[str]:
+        """캐시된 조직 ID (만료 시 None)"""
+        entry = self._get('org')
+        return entry['org_id'] if entry else None
+
+    def org_refresh_due(self, margin: float = 0.1) -> bool:
+        """조직 ID 캐시가 TTL 끝부분(margin 비율)에 들어섰는지 - 미리 재검증할 시점"""
+        entry = self._get('org')
+        if not entry:
+            return False
+        return time.time() - entry['saved_at'] > entry['ttl'] * (1 - margin)
+
+    def save_org(self, org_id: str, name: str = ""):
+        self._put('org', ORG_TTL, org_id=org_id, name=name)
+
+    def invalidate_org(self):
+        with self._lock:
+            if self._data.pop('org', None) is not None:
+                self._write()
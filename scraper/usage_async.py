@@ -0,0 +1,256 @@
+"""Claude.ai 사용량 조회 (asyncio 버전)
+
+동기 스크래퍼와 같은 상태(쿠키, 조직 ID 캐시, 챌린지 폴백)를 쓰되 네트워크 호출은 모두 코루틴이다.
+- 요청마다 제한 시간(asyncio.wait_for) + 취소 가능
+- 서로 독립인 요청(조직 ID 재검증 / 사용량)은 동시에 실행
+- Playwright 폴백은 async API + 공용 브라우저(BROWSERS) 사용 - 코루틴은 BROWSERS.run() 으로 실행
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from scraper import metrics
+from scraper.browser import block_assets_async
+from scraper.browser_manager import BROWSERS
+from scraper.http_backend import FetchResponse, HttpFetchBackend
+from scraper.usage_playwright import (
+    BROWSER_TIMEOUT, REQUEST_TIMEOUT, ClaudeUsageScraperPlaywright, UsageData
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncClaudeUsageScraper(ClaudeUsageScraperPlaywright):
+    """asyncio 기반 사용량 스크래퍼 (start / stop / fetch_usage_data 는 코루틴)"""
+
+    def __init__(self, cookies: Dict, request_timeout: float = REQUEST_TIMEOUT, **kwargs):
+        super().__init__(cookies, **kwargs)
+        self.request_timeout = request_timeout
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._clearance_gen = 0  # clearance 획득 횟수 (동시 요청이 중복 폴백하지 않도록)
+        self.watchdog = BROWSERS.watchdog  # 브라우저는 프로세스 공용
+
+    async def start(self):
+        """백엔드 시작 (한 번만 호출)"""
+        if self.is_running:
+            return
+        self._browser_lock = asyncio.Lock()
+        if self.backend == "http":
+            self.http = HttpFetchBackend(self.cookies, referer=f"{self.base_url}/")
+            logger.info("✓ HTTP 백엔드 시작됨 (keep-alive, asyncio)")
+        else:
+            await self._start_browser()
+        self.is_running = True
+
+    async def stop(self):
+        """백엔드 종료 (같은 이벤트 루프에서 한 번만 정리)"""
+        if not self.is_running and not self.context:
+            return
+        self.is_running = False
+        if self.http:
+            self.http.close()
+        await self._stop_browser()
+
+    async def update_cookies(self, cookies: Dict):
+        """쿠키 갱신 (세션 재로그인 시)"""
+        self.cookies = cookies
+        if self.http:
+            self.http.update_cookies(cookies)
+        if self.context:
+            await self._create_context()
+        self._invalidate_org()
+
+    def __enter__(self):
+        raise TypeError("AsyncClaudeUsageScraper 는 async with 로 사용하세요")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    # ── 브라우저 (공용 브라우저의 컨텍스트) ──
+
+    async def _start_browser(self):
+        if self.context:
+            return
+        self.context = await BROWSERS.new_context(headless=True, profile=self.profile)
+        self.browser = self.context.browser  # persistent 프로필이면 None
+        await self.context.route("**/*", block_assets_async)
+        await self._inject_cookies()
+        self.page = await self.context.new_page()
+        logger.info("✓ Playwright 컨텍스트 시작됨 (async)")
+
+    async def _stop_browser(self, recycle: bool = False):
+        was_running = self.context is not None
+        if not was_running:
+            return
+        try:
+            await self.profile.save_async(self.context)
+        except Exception as e:
+            logger.warning("브라우저 상태 저장 실패: %s", e)
+        context = self.context
+        self.page = None
+        self.context = None
+        self.browser = None
+        await BROWSERS.release(context, recycle=recycle)
+        logger.info("✓ Playwright 컨텍스트 종료됨")
+
+    async def _check_browser(self):
+        reason = self._browser_recycle_reason()
+        if reason:
+            logger.warning("브라우저 재시작: %s", reason)
+            self.watchdog.recycles += 1
+            metrics.BROWSER_RECYCLES.inc()
+            await self._stop_browser(recycle=True)
+
+    async def _create_context(self):
+        metrics.CONTEXT_RECREATIONS.inc()
+        if self.profile.persistent:
+            await self._inject_cookies()
+            return
+        # 반납 후 바로 다시 빌림 - 브라우저는 유휴 대기 중이므로 그대로 재사용
+        await self._stop_browser()
+        await self._start_browser()
+
+    async def _inject_cookies(self):
+        existing = await self.context.cookies(self.base_url)
+        cookies_list = self.profile.cookies_to_add(existing, self.cookies, self._cookie_url)
+        if cookies_list:
+            await self.context.add_cookies(cookies_list)
+
+    async def _browser_get(self, url: str) -> FetchResponse:
+        response = await self.page.request.get(url, timeout=self.request_timeout * 1000)
+        return FetchResponse(response.status, response.headers, await response.body())
+
+    # ── 요청 ──
+
+    async def _get(self, url: str) -> FetchResponse:
+        """제한 시간 내 GET (챌린지 감지 시 브라우저 폴백)"""
+        if self.backend == "playwright":
+            async with self._browser_lock:
+                await self._check_browser()
+                await self._start_browser()
+                return await asyncio.wait_for(self._browser_get(url), self.request_timeout)
+
+        # http.client 는 블로킹이므로 스레드에서 실행 (소켓 timeout 으로도 제한)
+        gen = self._clearance_gen
+        response = await asyncio.wait_for(
+            asyncio.to_thread(self.http.get, url, self.request_timeout),
+            self.request_timeout + 1
+        )
+        self._sync_cookies(self.http.cookies)
+        if not response.is_challenge:
+            self._clearance_fresh = False
+            return response
+
+        async with self._browser_lock:
+            if self._clearance_gen == gen:
+                return await self._get_challenged(url)
+        # 기다리는 동안 다른 요청이 새 clearance 를 받아옴 → 잠금을 놓고 HTTP 로 다시
+        # (다시 차단되면 clearance 가 방금 갱신됐으므로 브라우저 모드로 전환)
+        return await self._get(url)
+
+    async def _get_challenged(self, url: str) -> FetchResponse:
+        """챌린지 응답 처리 (_browser_lock 을 잡은 상태에서)"""
+        if self._clearance_fresh:
+            logger.warning("HTTP 백엔드가 계속 차단됨 - 브라우저 모드로 유지")
+            self.backend = "playwright"
+            await self._start_browser()
+            return await asyncio.wait_for(self._browser_get(url), self.request_timeout)
+
+        logger.info("Cloudflare 챌린지 감지 - 브라우저로 clearance 획득")
+        return await asyncio.wait_for(self._get_via_browser(url), BROWSER_TIMEOUT)
+
+    async def _get_via_browser(self, url: str) -> FetchResponse:
+        """브라우저로 요청 후 새 clearance 쿠키를 HTTP 백엔드에 넘기고 브라우저 종료"""
+        await self._start_browser()
+        response = await self._browser_get(url)
+        if response.is_challenge:
+            await self.page.goto(self.base_url, wait_until="domcontentloaded",
+                                 timeout=BROWSER_TIMEOUT * 1000)
+            response = await self._browser_get(url)
+
+        if not response.is_challenge:
+            browser_cookies = {c['name']: c['value'] for c in await self.context.cookies()}
+            self.http.update_cookies({**self.cookies, **browser_cookies})
+            self._sync_cookies(self.http.cookies)
+            self._clearance_fresh = True
+            self._clearance_gen += 1
+            await self._stop_browser()
+        return response
+
+    async def _resolve_org(self) -> Optional[str]:
+        """조직 목록 조회 → 첫 조직 ID (캐시 저장)"""
+        started = time.perf_counter()
+        response = await self._get(f"{self.base_url}/api/organizations")
+        self._record_response(response, "organizations", started)
+        if response.status != 200:
+            logger.warning("조직 정보 조회 실패: %s", response.status)
+            return None
+        orgs = response.json()
+        if not orgs:
+            logger.warning("조직 정보가 없습니다")
+            return None
+        org_id = orgs[0].get('uuid')
+        if org_id != self.org_id:
+            logger.info("✓ 조직 ID: %s", org_id)
+        self.org_id = org_id
+        self._org_from_cache = False
+        if self.cache:
+            self.cache.save_org(org_id, orgs[0].get('name', ''))
+        return org_id
+
+    async def _fetch_usage(self, org_id: str) -> FetchResponse:
+        started = time.perf_counter()
+        response = await self._get(f"{self.base_url}/api/organizations/{org_id}/usage")
+        self._record_response(response, "usage", started)
+        return response
+
+    async def fetch_usage_data(self) -> Optional[UsageData]:
+        """사용량 조회 - 취소(CancelledError)는 그대로 전파"""
+        self.last_status = None
+        self.retry_after = None
+        try:
+            if not self.org_id:
+                logger.info("조직 정보 조회 중...")
+                if not await self._resolve_org():
+                    return None
+                usage_response = await self._fetch_usage(self.org_id)
+            elif self.cache and self.cache.org_refresh_due():
+                # 캐시 만료가 가까우면 조직 재검증과 사용량 조회를 동시에
+                org_id = self.org_id
+                usage_response, new_org = await asyncio.gather(
+                    self._fetch_usage(org_id), self._resolve_org()
+                )
+                # 두 요청 중 나중에 끝난 쪽이 상태를 덮어쓰므로 정책 / 세션 만료 판단은 사용량 응답 기준으로
+                self._record_status(usage_response)
+                if usage_response.status != 200 and new_org and new_org != org_id:
+                    usage_response = await self._fetch_usage(new_org)
+            else:
+                usage_response = await self._fetch_usage(self.org_id)
+
+            if usage_response.status == 200:
+                logger.debug("✓ 사용량 데이터 조회 성공")
+                return self._parse_usage_data(usage_response.json())
+
+            logger.warning("사용량 API 응답 실패: %s", usage_response.status)
+            if self._org_from_cache and usage_response.status in (401, 403, 404):
+                logger.info("캐시된 조직 ID 무효 - 조직 정보 재조회")
+                self._invalidate_org()
+                return await self.fetch_usage_data()
+            if usage_response.status in (401, 403):
+                logger.warning("세션 만료 가능성 - 조직 정보 재조회 예정")
+                self._invalidate_org()
+            return None
+
+        except asyncio.TimeoutError:
+            logger.warning("사용량 조회 시간 초과 (%.0f초)", self.request_timeout)
+            return None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("사용량 조회 실패: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            return None
@@ -1,75 +1,232 @@
 """Claude.ai 사용량 조회 (Playwright 버전)"""
-from typing import Optional, Dict
+from typing import Optional, Dict, Callable, NamedTuple
 from datetime import datetime, timedelta
-from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+import functools
 import json
+import logging
+import time
+
+from scraper.http_backend import FetchResponse, HttpFetchBackend, PlaywrightFetchBackend
+from scraper import metrics
+from scraper.browser import BrowserWatchdog, LEAN_ARGS, block_assets
+from scraper.browser_profile import BrowserProfile
+from scraper.snapshot_cache import SnapshotCache
+
+logger = logging.getLogger(__name__)
+
+
+BASE_URL = "https://claude.ai"  # 벤치마크는 로컬 가짜 서버 주소로 교체
+
+REQUEST_TIMEOUT = 15.0   # 요청 하나 제한 시간 (초)
+BROWSER_TIMEOUT = 45.0   # 브라우저 폴백(챌린지 통과 포함) 제한 시간 (초)
+
+
+class BucketSpec(NamedTuple):
+    """사용량 구간 표시 정보"""
+    name: str    # 내부 이름 (기록 / 캐시 / API 키)
+    title: str   # 대시보드 섹션 제목
+    label: str   # CLI 한 줄 요약용 짧은 이름
+    group: str   # 대시보드 묶음 제목 ("" = 없음)
+
+
+WEEKLY_GROUP = "Weekly Limits"
+
+# 알려진 API 필드 → 구간 (응답에 값이 없어도 항상 표시)
+BUCKET_SCHEMA = {
+    'five_hour': BucketSpec('current_session', "Current Session", "session", ""),
+    'seven_day': BucketSpec('weekly_all', "All Models", "weekly", WEEKLY_GROUP),
+    'seven_day_sonnet': BucketSpec('weekly_sonnet', "Sonnet Only", "sonnet", WEEKLY_GROUP),
+}
+BUCKET_KEYS = tuple(spec.name for spec in BUCKET_SCHEMA.values())
+_SPECS_BY_NAME = {spec.name: spec for spec in BUCKET_SCHEMA.values()}
+
+# 스키마에 없는 필드 이름 규칙 (API 필드 접두사, 내부 이름 접두사, 묶음)
+_FIELD_PREFIXES = (
+    ('five_hour_', 'session_', ""),
+    ('seven_day_', 'weekly_', WEEKLY_GROUP),
+)
+
+
+@functools.lru_cache(maxsize=64)
+def bucket_name(field: str) -> str:
+    """API 필드 이름 → 구간 내부 이름 (seven_day_opus → weekly_opus)"""
+    spec = BUCKET_SCHEMA.get(field)
+    if spec:
+        return spec.name
+    for field_prefix, name_prefix, _ in _FIELD_PREFIXES:
+        if field.startswith(field_prefix):
+            return name_prefix + field[len(field_prefix):]
+    return field
+
+
+@functools.lru_cache(maxsize=64)
+def bucket_spec(name: str) -> BucketSpec:
+    """구간 내부 이름 → 표시 정보 (스키마에 없으면 이름에서 생성)"""
+    spec = _SPECS_BY_NAME.get(name)
+    if spec:
+        return spec
+    for _, name_prefix, group in _FIELD_PREFIXES:
+        if name.startswith(name_prefix):
+            suffix = name[len(name_prefix):]
+            return BucketSpec(name, f"{suffix.replace('_', ' ').title()} Only", suffix, group)
+    return BucketSpec(name, name.replace('_', ' ').title(), name, "")
+
+
+@functools.lru_cache(maxsize=64)
+def parse_timestamp(text: str) -> datetime:
+    """ISO-8601 시각 파싱 (resets_at 은 조회마다 같은 문자열이 반복되므로 캐시)"""
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        # 표준에서 벗어난 형식만 dateutil 로 처리
+        from dateutil import parser as date_parser
+        return date_parser.parse(text)
+
+
+class Bucket(NamedTuple):
+    """구간 하나의 사용률"""
+    percent: float
+    reset: Optional[datetime]
+
+
+EMPTY_BUCKET = Bucket(0.0, None)
 
 
 class UsageData:
-    """사용량 데이터 클래스"""
+    """사용량 데이터 클래스 (구간 이름 → Bucket)"""
+
+    __slots__ = ('buckets', 'last_updated', 'stale')
+
+    def __init__(self, buckets: Optional[Dict[str, Bucket]] = None,
+                 last_updated: Optional[datetime] = None):
+        self.buckets: Dict[str, Bucket] = buckets if buckets is not None else {
+            key: EMPTY_BUCKET for key in BUCKET_KEYS
+        }
+        self.last_updated = last_updated
+        self.stale = False  # 캐시에서 복원된 값 (아직 실시간 조회 전)
+
+    def get(self, key: str) -> Bucket:
+        return self.buckets.get(key, EMPTY_BUCKET)
+
+    def to_dict(self) -> Dict:
+        """캐시 저장용 dict 변환"""
+        return {
+            'buckets': {
+                key: {'percent': b.percent, 'resets_at': b.reset.isoformat() if b.reset else None}
+                for key, b in self.buckets.items()
+            },
+            'last_updated': self.last_updated.isoformat() if self.last_updated else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'UsageData':
+        """캐시 dict에서 복원"""
+        if 'buckets' in data:
+            buckets = {
+                key: Bucket(float(b['percent']), parse_timestamp(b['resets_at']) if b['resets_at'] else None)
+                for key, b in data['buckets'].items()
+            }
+        else:
+            # 이전 형식 ({key}_usage / {key}_limit / {key}_reset)
+            buckets = {}
+            for key in BUCKET_KEYS:
+                limit = data.get(f"{key}_limit") or 100
+                reset = data.get(f"{key}_reset")
+                buckets[key] = Bucket(data.get(f"{key}_usage", 0) / limit * 100,
+                                      parse_timestamp(reset) if reset else None)
+        last_updated = data.get('last_updated')
+        return cls(buckets, parse_timestamp(last_updated) if last_updated else None)
 
-    def __init__(self):
-        self.current_session_usage = 0
-        self.current_session_limit = 100
-        self.current_session_reset = None
 
-        self.weekly_all_usage = 0
-        self.weekly_all_limit = 100
-        self.weekly_all_reset = None
+def format_reset_time(reset_time: datetime) -> str:
+    """재설정 시간 포맷팅 (GUI / CLI 공용)"""
+    if reset_time.tzinfo is not None:
+        from datetime import timezone
+        now = datetime.now(timezone.utc)
+    else:
+        now = datetime.now()
 
-        self.weekly_sonnet_usage = 0
-        self.weekly_sonnet_limit = 100
-        self.weekly_sonnet_reset = None
+    reset_naive = reset_time.replace(tzinfo=None) if reset_time.tzinfo else reset_time
+    now_naive = now.replace(tzinfo=None) if now.tzinfo else now
+    diff = reset_naive - now_naive
 
-        self.last_updated = None
+    if diff.total_seconds() < 0:
+        return "Pending reset"
+    elif diff.total_seconds() < 3600:
+        minutes = int(diff.total_seconds() / 60)
+        return f"Resets in {minutes}m"
+    elif diff.total_seconds() < 86400:
+        hours = int(diff.total_seconds() / 3600)
+        minutes = int((diff.total_seconds() % 3600) / 60)
+        return f"Resets in {hours}h {minutes}m"
+    else:
+        weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+        weekday = weekdays[reset_naive.weekday()]
+        time_str = reset_naive.strftime("%I:%M %p")
+        return f"Resets {weekday} {time_str}"
 
 
 class ClaudeUsageScraperPlaywright:
-    """Claude 사용량 스크래퍼 (Playwright 사용, 브라우저 인스턴스 유지)"""
+    """Claude 사용량 스크래퍼 (기본 HTTP 백엔드, Cloudflare 챌린지 시 Playwright 폴백)"""
 
-    def __init__(self, cookies: Dict):
+    def __init__(self, cookies: Dict, backend: str = "http",
+                 on_cookies_updated: Optional[Callable[[Dict], None]] = None,
+                 cache: Optional[SnapshotCache] = None,
+                 profile: Optional[BrowserProfile] = None, base_url: str = BASE_URL):
         self.cookies = cookies
+        self.profile = profile or BrowserProfile()
+        self.base_url = base_url.rstrip('/')
+        self.backend = backend  # "http" | "playwright"
+        self.on_cookies_updated = on_cookies_updated
+        self.http: Optional[HttpFetchBackend] = None
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
-        self.org_id = None  # 캐시
+        self.cache = cache
+        self.org_id = cache.load_org_id() if cache else None  # 캐시
+        self._org_from_cache = self.org_id is not None
         self.is_running = False
+        self.last_status = None  # 마지막 API 응답 상태 (None = 응답 없음)
+        self.retry_after: Optional[float] = None  # 마지막 응답의 Retry-After (초)
+        self.request_timeout = REQUEST_TIMEOUT
+        self.watchdog = BrowserWatchdog()  # 장시간 실행 브라우저 메모리 감시
+        self.usage_metrics = True  # 구간별 사용률 지표 기록 (fleet 모드는 계정끼리 덮어쓰므로 끔)
+        self._clearance_fresh = False
 
     def start(self):
-        """브라우저 시작 (한 번만 호출)"""
+        """백엔드 시작 (한 번만 호출)"""
         if self.is_running:
             return
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=True)
-        self._create_context()
+        if self.backend == "http":
+            self.http = HttpFetchBackend(self.cookies, referer=f"{self.base_url}/")
+            logger.info("✓ HTTP 백엔드 시작됨 (keep-alive)")
+        else:
+            self._start_browser()
         self.is_running = True
-        print("✓ Playwright 브라우저 시작됨 (유지 모드)")
 
-    def _create_context(self):
-        """브라우저 컨텍스트 생성"""
+    def _start_browser(self):
+        """Playwright 브라우저 시작"""
         if self.context:
-            try:
-                self.context.close()
-            except:
-                pass
-        self.context = self.browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            return
+        from playwright.sync_api import sync_playwright  # 지연 import (HTTP 백엔드만 쓰면 로드 안 함)
+        self.playwright = sync_playwright().start()
+        self.browser, self.context = self.profile.open_sync(
+            self.playwright, headless=True, args=self.watchdog.launch_args(LEAN_ARGS)
         )
-        cookies_list = []
-        for name, value in self.cookies.items():
-            cookies_list.append({
-                'name': name,
-                'value': value,
-                'domain': '.claude.ai',
-                'path': '/',
-            })
-        self.context.add_cookies(cookies_list)
+        self.context.route("**/*", block_assets)
+        self._inject_cookies()
         self.page = self.context.new_page()
+        self.watchdog.started()
+        logger.info("✓ Playwright 브라우저 시작됨 (유지 모드)")
 
-    def stop(self):
-        """브라우저 종료"""
-        self.is_running = False
+    def _stop_browser(self):
+        """Playwright 브라우저 종료 (storage 프로필이면 상태 저장)"""
+        was_running = self.context is not None
+        try:
+            self.profile.save_sync(self.context)
+        except Exception as e:
+            logger.warning("브라우저 상태 저장 실패: %s", e)
         try:
             if self.page:
                 self.page.close()
@@ -81,13 +238,73 @@ class ClaudeUsageScraperPlaywright:
                 self.playwright.stop()
         except:
             pass
-        print("✓ Playwright 브라우저 종료됨")
+        self.page = None
+        self.context = None
+        self.browser = None
+        self.playwright = None
+        self.watchdog.stopped()
+        if was_running:
+            logger.info("✓ Playwright 브라우저 종료됨")
+
+    def _browser_recycle_reason(self) -> Optional[str]:
+        """브라우저를 새로 띄워야 하는 이유 (메모리 한도 / 좀비 / 연결 끊김 / 실행 시간)"""
+        if not self.context:
+            return None
+        connected = self.browser.is_connected() if self.browser else True
+        return self.watchdog.check(connected)
+
+    def _check_browser(self):
+        """필요하면 브라우저 종료 - 다음 요청에서 새로 시작"""
+        reason = self._browser_recycle_reason()
+        if reason:
+            logger.warning("브라우저 재시작: %s", reason)
+            self.watchdog.recycles += 1
+            metrics.BROWSER_RECYCLES.inc()
+            self._stop_browser()
+
+    def _create_context(self):
+        """브라우저 컨텍스트 재생성 (persistent 프로필은 같은 컨텍스트에 쿠키만 보충)"""
+        metrics.CONTEXT_RECREATIONS.inc()
+        if self.profile.persistent:
+            self._inject_cookies()
+            return
+        if self.context:
+            try:
+                self.context.close()
+            except:
+                pass
+        self.context = self.browser.new_context(**self.profile.context_options())
+        self.context.route("**/*", block_assets)
+        self._inject_cookies()
+        self.page = self.context.new_page()
+
+    @property
+    def _cookie_url(self) -> Optional[str]:
+        """claude.ai 가 아니면(로컬 가짜 서버) 쿠키를 URL 기준으로 주입"""
+        return None if self.base_url == BASE_URL else self.base_url
+
+    def _inject_cookies(self):
+        """session.json 쿠키 중 컨텍스트에 없는 것만 추가 (저장된 쿠키 속성 보존)"""
+        existing = self.context.cookies(self.base_url)
+        cookies_list = self.profile.cookies_to_add(existing, self.cookies, self._cookie_url)
+        if cookies_list:
+            self.context.add_cookies(cookies_list)
+
+    def stop(self):
+        """백엔드 종료"""
+        self.is_running = False
+        if self.http:
+            self.http.close()
+        self._stop_browser()
 
     def update_cookies(self, cookies: Dict):
         """쿠키 갱신 (세션 재로그인 시)"""
         self.cookies = cookies
-        self._create_context()
-        self.org_id = None
+        if self.http:
+            self.http.update_cookies(cookies)
+        if self.context:
+            self._create_context()
+        self._invalidate_org()
 
     # 기존 컨텍스트 매니저 호환 유지
     def __enter__(self):
@@ -97,82 +314,137 @@ class ClaudeUsageScraperPlaywright:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.stop()
 
+    def _get(self, url: str) -> FetchResponse:
+        """현재 백엔드로 GET (챌린지 감지 시 브라우저 폴백)"""
+        if self.backend == "playwright":
+            self._check_browser()
+            self._start_browser()
+            return PlaywrightFetchBackend(self.page).get(url, self.request_timeout)
+
+        response = self.http.get(url, self.request_timeout)
+        self._sync_cookies(self.http.cookies)
+        if not response.is_challenge:
+            self._clearance_fresh = False
+            return response
+
+        if self._clearance_fresh:
+            # 방금 받은 clearance로도 차단됨 → HTTP 클라이언트 자체가 거부되는 상황
+            logger.warning("HTTP 백엔드가 계속 차단됨 - 브라우저 모드로 유지")
+            self.backend = "playwright"
+            self._start_browser()
+            return PlaywrightFetchBackend(self.page).get(url, self.request_timeout)
+
+        logger.info("Cloudflare 챌린지 감지 - 브라우저로 clearance 획득")
+        return self._get_via_browser(url)
+
+    def _get_via_browser(self, url: str) -> FetchResponse:
+        """브라우저로 요청 후 새 clearance 쿠키를 HTTP 백엔드에 넘기고 브라우저 종료"""
+        self._start_browser()
+        backend = PlaywrightFetchBackend(self.page)
+        response = backend.get(url, self.request_timeout)
+        if response.is_challenge:
+            # 실제 페이지 탐색으로 챌린지 통과
+            self.page.goto(self.base_url, wait_until="domcontentloaded",
+                           timeout=BROWSER_TIMEOUT * 1000)
+            response = backend.get(url, self.request_timeout)
+
+        if not response.is_challenge:
+            browser_cookies = {c['name']: c['value'] for c in self.context.cookies()}
+            self.http.update_cookies({**self.cookies, **browser_cookies})
+            self._sync_cookies(self.http.cookies)
+            self._clearance_fresh = True
+            self._stop_browser()
+        return response
+
+    def _sync_cookies(self, cookies: Dict):
+        """백엔드에서 갱신된 쿠키를 보관 + 저장 콜백"""
+        if cookies == self.cookies:
+            return
+        self.cookies = dict(cookies)
+        if self.on_cookies_updated:
+            self.on_cookies_updated(self.cookies)
+
+    def _record_response(self, response: FetchResponse, endpoint: str, started: float):
+        """마지막 응답 상태 보관 (재시도 정책) + 지연 / 상태 지표"""
+        self._record_status(response)
+        metrics.observe_request(endpoint, response.status, started)
+
+    def _record_status(self, response: FetchResponse):
+        self.last_status = response.status
+        self.retry_after = response.retry_after
+
     def fetch_usage_data(self) -> Optional[UsageData]:
         """사용량 데이터 조회 (브라우저 재사용)"""
+        self.last_status = None
+        self.retry_after = None
         try:
             # 조직 ID 캐시 활용
             if not self.org_id:
-                print("조직 정보 조회 중...")
-                response = self.page.request.get("https://claude.ai/api/organizations")
+                logger.info("조직 정보 조회 중...")
+                started = time.perf_counter()
+                response = self._get(f"{self.base_url}/api/organizations")
+                self._record_response(response, "organizations", started)
                 if response.status != 200:
-                    print(f"조직 정보 조회 실패: {response.status}")
+                    logger.warning("조직 정보 조회 실패: %s", response.status)
                     return None
                 orgs = response.json()
                 if not orgs:
-                    print("조직 정보가 없습니다")
+                    logger.warning("조직 정보가 없습니다")
                     return None
                 self.org_id = orgs[0].get('uuid')
-                print(f"✓ 조직 ID: {self.org_id}")
+                self._org_from_cache = False
+                logger.info("✓ 조직 ID: %s", self.org_id)
+                if self.cache:
+                    self.cache.save_org(self.org_id, orgs[0].get('name', ''))
 
             # 사용량 조회
-            usage_response = self.page.request.get(
-                f"https://claude.ai/api/organizations/{self.org_id}/usage"
+            started = time.perf_counter()
+            usage_response = self._get(
+                f"{self.base_url}/api/organizations/{self.org_id}/usage"
             )
+            self._record_response(usage_response, "usage", started)
 
             if usage_response.status == 200:
                 usage_json = usage_response.json()
-                print(f"✓ 사용량 데이터 조회 성공")
+                logger.debug("✓ 사용량 데이터 조회 성공")
                 return self._parse_usage_data(usage_json)
             else:
-                print(f"사용량 API 응답 실패: {usage_response.status}")
-                # 403/401이면 컨텍스트 재생성 시도
+                logger.warning("사용량 API 응답 실패: %s", usage_response.status)
+                # 디스크 캐시의 조직 ID가 더 이상 유효하지 않으면 조직 조회부터 다시
+                if self._org_from_cache and usage_response.status in (401, 403, 404):
+                    logger.info("캐시된 조직 ID 무효 - 조직 정보 재조회")
+                    self._invalidate_org()
+                    return self.fetch_usage_data()
+                # 403/401이면 다음 조회에서 조직부터 다시 (재시도 간격은 호출 측 정책이 결정)
                 if usage_response.status in (401, 403):
-                    print("세션 만료 가능성 - 컨텍스트 재생성")
-                    self._create_context()
-                    self.org_id = None
+                    logger.warning("세션 만료 가능성 - 조직 정보 재조회 예정")
+                    self._invalidate_org()
                 return None
 
         except Exception as e:
-            print(f"사용량 조회 실패: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("사용량 조회 실패: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
 
-    def _parse_usage_data(self, data: Dict) -> UsageData:
-        """API 응답 데이터 파싱"""
-        from dateutil import parser as date_parser
-
-        usage = UsageData()
-
-        # 현재 세션 (5시간 한도)
-        if 'five_hour' in data and data['five_hour']:
-            five_hour = data['five_hour']
-            usage.current_session_usage = int(five_hour.get('utilization', 0))
-            usage.current_session_limit = 100
-
-            reset_str = five_hour.get('resets_at')
-            if reset_str:
-                usage.current_session_reset = date_parser.parse(reset_str)
-
-        # 주간 한도 - 모든 모델
-        if 'seven_day' in data and data['seven_day']:
-            seven_day = data['seven_day']
-            usage.weekly_all_usage = int(seven_day.get('utilization', 0))
-            usage.weekly_all_limit = 100
-
-            reset_str = seven_day.get('resets_at')
-            if reset_str:
-                usage.weekly_all_reset = date_parser.parse(reset_str)
-
-        # 주간 한도 - Sonnet만
-        if 'seven_day_sonnet' in data and data['seven_day_sonnet']:
-            sonnet = data['seven_day_sonnet']
-            usage.weekly_sonnet_usage = int(sonnet.get('utilization', 0))
-            usage.weekly_sonnet_limit = 100
+    def _invalidate_org(self):
+        """조직 ID 캐시 무효화 (메모리 + 디스크)"""
+        self.org_id = None
+        self._org_from_cache = False
+        if self.cache:
+            self.cache.invalidate_org()
 
-            reset_str = sonnet.get('resets_at')
-            if reset_str:
-                usage.weekly_sonnet_reset = date_parser.parse(reset_str)
+    def _parse_usage_data(self, data: Dict) -> UsageData:
+        """API 응답 데이터 파싱 (utilization 이 있는 모든 필드를 구간으로)"""
+        buckets = {key: EMPTY_BUCKET for key in BUCKET_KEYS}
+        for field, value in data.items():
+            if not isinstance(value, dict) or 'utilization' not in value:
+                continue
+            reset_str = value.get('resets_at')
+            buckets[bucket_name(field)] = Bucket(
+                float(value['utilization'] or 0),
+                parse_timestamp(reset_str) if reset_str else None
+            )
 
-        usage.last_updated = datetime.now()
+        usage = UsageData(buckets, datetime.now())
+        if self.usage_metrics:
+            metrics.observe_usage(usage.buckets)
         return usage
@@ -0,0 +1,38 @@
+"""AdaptiveScheduler - 변화 없는 조회가 오래 이어져도 간격이 최대값에서 멈추는지"""
+import unittest
+from datetime import datetime
+
+from scraper.scheduler import MAX_INTERVAL, AdaptiveScheduler
+from scraper.usage_playwright import Bucket, UsageData
+
+
+def flat_usage() -> UsageData:
+    return UsageData({'current_session': Bucket(12.0, None), 'weekly_all': Bucket(40.0, None)},
+                     last_updated=datetime.now())
+
+
+class FlatPollsTest(unittest.TestCase):
+
+    def test_thousands_of_flat_polls_stay_at_max_interval(self):
+        scheduler = AdaptiveScheduler(base_interval=60)
+        now = 1_700_000_000.0
+        for _ in range(5000):
+            scheduler.record(flat_usage(), now)
+            delay = scheduler.next_delay(now)
+            self.assertLessEqual(delay, MAX_INTERVAL)
+            now += delay
+        self.assertEqual(scheduler.next_delay(now), MAX_INTERVAL)
+
+    def test_change_resets_stretch(self):
+        scheduler = AdaptiveScheduler(base_interval=60)
+        now = 1_700_000_000.0
+        for _ in range(100):
+            scheduler.record(flat_usage(), now)
+            now += 60
+        changed = UsageData({'current_session': Bucket(13.0, None), 'weekly_all': Bucket(40.0, None)})
+        scheduler.record(changed, now)
+        self.assertLess(scheduler.next_delay(now), MAX_INTERVAL)
+
+
+if __name__ == "__main__":
+    unittest.main()